@@ -0,0 +1,553 @@
+// <auto-generated>
+// This file was generated by tools/shader-preprocessor.py from the shaders in glshaders.
+// Do not edit it by hand.
+// </auto-generated>
+
+namespace Glib;
+
+/// <summary>
+/// The preprocessed shader sources of the gl330 target, by their load name.
+/// </summary>
+public enum ShaderSource
+{
+    BevelFrag,
+    BitmapRenderPreviewFrag,
+    EffectMatrixFrag,
+    GridFrag,
+    GridVert,
+    ImguiFrag,
+    ImguiVert,
+    InvertFrag,
+    LevelLightFrag,
+    LightmapStretchFrag,
+    OutlineMarqueeFrag,
+    PaletteFrag,
+    PropFadeFrag,
+    RenderPreviewFrag,
+    SoftpropFrag,
+    TileFrag,
+    UvRepeatFrag,
+}
+
+public static partial class ShaderCatalog
+{
+    /// <summary>
+    /// The target language the sources were preprocessed for.
+    /// </summary>
+    public const string Target = "gl330";
+
+    // load names, sorted ordinally
+    private static readonly string[] _names = [
+        "bevel.frag",
+        "bitmap_render_preview.frag",
+        "effect_matrix.frag",
+        "grid.frag",
+        "grid.vert",
+        "imgui.frag",
+        "imgui.vert",
+        "invert.frag",
+        "level_light.frag",
+        "lightmap_stretch.frag",
+        "outline_marquee.frag",
+        "palette.frag",
+        "prop_fade.frag",
+        "render_preview.frag",
+        "softprop.frag",
+        "tile.frag",
+        "uv_repeat.frag",
+    ];
+
+    // the first 8 bytes of the SHA-256 hash of each source, big-endian
+    private static ReadOnlySpan<ulong> SourceHashes => [
+        0x9DCAF2EBC0939CDDUL,
+        0xBB543D56C79C2BACUL,
+        0x1591A3F58A4F6493UL,
+        0x83858CBD64792ED1UL,
+        0x38F6CCD730BB4231UL,
+        0x61D5A89824288B8AUL,
+        0xC973B8305990D884UL,
+        0xD2B69EEAD9D1B4F9UL,
+        0xEA8906E750B2DCB4UL,
+        0x07F88BD6122B307AUL,
+        0x7119F4099A025407UL,
+        0x775B91043AC6170AUL,
+        0x995CA72FAABF83EFUL,
+        0xC3D829773B569C30UL,
+        0x9B5E1A82D4F3506AUL,
+        0x5460054EBE037823UL,
+        0x9BAAA4AFE1D2467CUL,
+    ];
+
+    // the chunks of source i are SourceChunks[SourceChunkStarts[i]..SourceChunkStarts[i + 1]]
+    private static ReadOnlySpan<int> SourceChunkStarts => [
+        0, 6, 9, 12, 15, 18, 21, 24, 27, 30, 36, 39, 45, 48, 51, 57,
+        60, 63,
+    ];
+
+    private static ReadOnlySpan<int> SourceChunks => [
+        0, 1, 2, 3, 4, 5, 0, 1, 6, 0, 1, 7, 0, 1, 8, 0,
+        1, 9, 0, 1, 10, 0, 1, 11, 0, 1, 12, 0, 1, 13, 0, 1,
+        2, 14, 4, 15, 0, 1, 16, 0, 1, 2, 3, 4, 17, 0, 1, 18,
+        0, 1, 19, 0, 1, 2, 3, 4, 20, 0, 1, 21, 0, 1, 22,
+    ];
+
+    // offset and length in ChunkData of each chunk
+    private static ReadOnlySpan<int> ChunkRanges => [
+        0, 18, 18, 10, 28, 10, 38, 744,
+        782, 10, 792, 1758, 2550, 324, 2874, 294,
+        3168, 153, 3321, 208, 3529, 201, 3730, 242,
+        3972, 256, 4228, 264, 4492, 1256, 5748, 464,
+        6212, 358, 6570, 777, 7347, 717, 8064, 437,
+        8501, 2133, 10634, 1142, 11776, 240,
+    ];
+
+    private static ReadOnlySpan<byte> ChunkData =>
+        "#version 330 core\n"u8 +
+        "#line 1 0\n"u8 +
+        "#line 1 1\n"u8 +
+        "#ifndef PALETTE_INC\n"u8 +
+        "#define PALETTE_INC\n"u8 +
+        "\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "uniform sampler2D u_paletteTex;\n"u8 +
+        "\n"u8 +
+        "vec3 getLitColor(float index)\n"u8 +
+        "{\n"u8 +
+        "    return texture(u_paletteTex, vec2((index+0.5) / 30.0, 0.5 / 3.0)).rgb;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "vec3 getNeutralColor(float index)\n"u8 +
+        "{\n"u8 +
+        "    return texture(u_paletteTex, vec2((index+0.5) / 30.0, (1.0+0.5) / 3.0)).rgb;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "vec3 getShadeColor(float index)\n"u8 +
+        "{\n"u8 +
+        "    return texture(u_paletteTex, vec2((index+0.5) / 30.0, (2.0+0.5) / 3.0)).rgb;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "bool isTransparent(vec2 coords)\n"u8 +
+        "{\n"u8 +
+        "    bool inBounds = abs(coords.x - 0.5f) <= 0.5f && abs(coords.y - 0.5f) <= 0.5f;\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, coords);\n"u8 +
+        "    return length(texelColor.rgb - vec3(1.0, 1.0, 1.0)) < 0.05 || texelColor.a == 0.0 || !inBounds;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "#endif // PALETTE_INC\n"u8 +
+        "#line 2 0\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform vec4 v4_textureSize;\n"u8 +
+        "uniform vec4 v4_propRotation;\n"u8 +
+        "uniform vec4 v4_lightDirection;\n"u8 +
+        "uniform vec4 v4_bevelData;\n"u8 +
+        "\n"u8 +
+        "#define u_textureSize v4_textureSize.xy\n"u8 +
+        "#define propRotation v4_propRotation\n"u8 +
+        "#define lightDirection v4_lightDirection.xyz\n"u8 +
+        "#define bevelSize v4_bevelData.x\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    if (isTransparent(v_texcoord0)) discard;\n"u8 +
+        "\n"u8 +
+        "    float bevelDst = bevelSize + 1.0;\n"u8 +
+        "    vec2 bevelDir = vec2(0.0, 0.0);\n"u8 +
+        "\n"u8 +
+        "    vec4 finalColor = vec4(vec3(0.0, 0.0, 0.0), bevelSize / 4.0);\n"u8 +
+        "\n"u8 +
+        "    float newDist;\n"u8 +
+        "    bool trans;\n"u8 +
+        "    bool replace;\n"u8 +
+        "    int dx, dy;\n"u8 +
+        "    int bevelSizeI = int(bevelSize);\n"u8 +
+        "    for (int i = 0; i < 4 * bevelSizeI * bevelSizeI; i++)\n"u8 +
+        "    {\n"u8 +
+        "        dy = i / (bevelSizeI * 2) - bevelSizeI;\n"u8 +
+        "        dx = i % (bevelSizeI * 2) - bevelSizeI;\n"u8 +
+        "\n"u8 +
+        "        newDist = length(vec2(dx, dy));\n"u8 +
+        "        trans = isTransparent(v_texcoord0 + vec2(dx, dy) / u_textureSize);\n"u8 +
+        "        replace = trans && newDist < bevelDst;\n"u8 +
+        "\n"u8 +
+        "        if (replace)\n"u8 +
+        "        {\n"u8 +
+        "            bevelDst = newDist;\n"u8 +
+        "            bevelDir = normalize(vec2(dx, dy));\n"u8 +
+        "        }\n"u8 +
+        "    }\n"u8 +
+        "\n"u8 +
+        "    vec2 lightDir = normalize(lightDirection.xy);\n"u8 +
+        "    vec2 globalBevelDir = normalize(propRotation.xy * bevelDir.x + propRotation.zw * bevelDir.y);\n"u8 +
+        "\n"u8 +
+        "    bool isLight = bevelDst <= bevelSize && dot(lightDir, globalBevelDir) > 0.5;\n"u8 +
+        "    bool isShade = bevelDst <= bevelSize && dot(lightDir, globalBevelDir) <= 0.0;\n"u8 +
+        "    bool isNormal = !isLight && !isShade;\n"u8 +
+        "\n"u8 +
+        "    float colIndex = floor(v_color0.r * 29.0);\n"u8 +
+        "    vec3 shadedCol = float(isLight) * getLitColor(colIndex) + float(isShade) * getShadeColor(colIndex) + float(isNormal) * getNeutralColor(colIndex);\n"u8 +
+        "\n"u8 +
+        "    finalColor = vec4(shadedCol, v_color0.a) * u_color;\n"u8 +
+        "    fragColor = finalColor;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    bool isBlack = texelColor.r == 0.0;\n"u8 +
+        "\n"u8 +
+        "    fragColor = vec4(\n"u8 +
+        "        vec3(1.0, 0.0, 0.0),\n"u8 +
+        "        1.0 - float(isBlack)\n"u8 +
+        "    ) * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    fragColor = mix(vec4(1.0, 0.0, 1.0, 1.0), vec4(0.0, 1.0, 0.0, 1.0), texelColor.r) * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    fragColor = texture(u_texture0, vec2(0.0, 0.0)) * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec3 a_position;\n"u8 +
+        "\n"u8 +
+        "uniform mat4 u_mvp;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 pos = u_mvp * vec4(a_position, 1.0);\n"u8 +
+        "    //pos.xy = (round(pos.xy * u_viewRect.zw) + vec2(0.5, 0.5)) / u_viewRect.zw;\n"u8 +
+        "    gl_Position = pos;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    fragColor = texture(u_texture0, v_texcoord0) * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 a_pos;\n"u8 +
+        "in vec4 a_color0;\n"u8 +
+        "in vec2 a_texcoord0;\n"u8 +
+        "\n"u8 +
+        "out vec2 v_texcoord0;\n"u8 +
+        "out vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_mvp;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    gl_Position = u_mvp * vec4(a_pos.xy, 0.0, 1.0);\n"u8 +
+        "    v_texcoord0 = a_texcoord0;\n"u8 +
+        "    v_color0 = a_color0;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "\n"u8 +
+        "void main() {\n"u8 +
+        "    vec4 texel = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    fragColor = vec4(vec3(1.0) - texel.rgb, texel.a) * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    fragColor = vec4(1.0, 1.0, 1.0, 1.0 - texelColor.r) * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "#ifndef INVBILINEAR_INC\n"u8 +
+        "#define INVBILINEAR_INC\n"u8 +
+        "\n"u8 +
+        "// https://www.shadertoy.com/view/lsBSDm\n"u8 +
+        "// given a point p and a quad defined by four points {a,b,c,d}, return the bilinear\n"u8 +
+        "// coordinates of p in the quad. Will not be in the range [0..1]^2 if the point is\n"u8 +
+        "// outside the quad.\n"u8 +
+        "float cross2d( in vec2 a, in vec2 b ) { return a.x*b.y - a.y*b.x; }\n"u8 +
+        "vec2 inv_bilinear( in vec2 p, in vec2 a, in vec2 b, in vec2 c, in vec2 d )\n"u8 +
+        "{\n"u8 +
+        "    vec2 res = vec2(-1.0);\n"u8 +
+        "\n"u8 +
+        "    vec2 e = b-a;\n"u8 +
+        "    vec2 f = d-a;\n"u8 +
+        "    vec2 g = a-b+c-d;\n"u8 +
+        "    vec2 h = p-a;\n"u8 +
+        "\n"u8 +
+        "    float k2 = cross2d( g, f );\n"u8 +
+        "    float k1 = cross2d( e, f ) + cross2d( h, g );\n"u8 +
+        "    float k0 = cross2d( h, e );\n"u8 +
+        "\n"u8 +
+        "    // if edges are parallel, this is a linear equation\n"u8 +
+        "    if( abs(k2)<0.001 )\n"u8 +
+        "    {\n"u8 +
+        "        res = vec2( (h.x*k1+f.x*k0)/(e.x*k1-g.x*k0), -k0/k1 );\n"u8 +
+        "    }\n"u8 +
+        "    // otherwise, it's a quadratic\n"u8 +
+        "\telse\n"u8 +
+        "    {\n"u8 +
+        "        float w = k1*k1 - 4.0*k0*k2;\n"u8 +
+        "        if( w<0.0 ) return vec2(-1.0);\n"u8 +
+        "        w = sqrt( w );\n"u8 +
+        "\n"u8 +
+        "        float ik2 = 0.5/k2;\n"u8 +
+        "        float v = (-k1 - w)*ik2;\n"u8 +
+        "        float u = (h.x - f.x*v)/(e.x + g.x*v);\n"u8 +
+        "\n"u8 +
+        "        if( u<0.0 || u>1.0 || v<0.0 || v>1.0 )\n"u8 +
+        "        {\n"u8 +
+        "           v = (-k1 + w)*ik2;\n"u8 +
+        "           u = (h.x - f.x*v)/(e.x + g.x*v);\n"u8 +
+        "        }\n"u8 +
+        "        res = vec2( u, v );\n"u8 +
+        "    }\n"u8 +
+        "\n"u8 +
+        "    return res;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "#endif\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_vert_ab;\n"u8 +
+        "uniform vec4 u_vert_cd;\n"u8 +
+        "\n"u8 +
+        "void main() {\n"u8 +
+        "    vec2 uv = inv_bilinear(v_texcoord0, u_vert_ab.xy, u_vert_ab.zw, u_vert_cd.xy, u_vert_cd.zw);\n"u8 +
+        "\n"u8 +
+        "    vec4 col = vec4(1.0, 1.0, 1.0, 1.0);\n"u8 +
+        "    if (max( abs(uv.x - 0.5), abs(uv.y - 0.5) ) < 0.5) {\n"u8 +
+        "        col = texture(u_texture0, uv);\n"u8 +
+        "    }\n"u8 +
+        "\n"u8 +
+        "    fragColor = col * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "uniform float time;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 col = texture(u_texture0, v_texcoord0) * u_color * v_color0;\n"u8 +
+        "    bool marquee = mod(gl_FragCoord.x + gl_FragCoord.y + time * 50.0, 10.0) < 5.0;\n"u8 +
+        "    fragColor = vec4(col.rgb, col.a * float(marquee));\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    if (isTransparent(v_texcoord0)) discard;\n"u8 +
+        "\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    bool isLight = length(texelColor.rgb - vec3(0.0, 0.0, 1.0)) < 0.3;\n"u8 +
+        "    bool isShade = length(texelColor.rgb - vec3(1.0, 0.0, 0.0)) < 0.3;\n"u8 +
+        "    bool isNormal = length(texelColor.rgb - vec3(0.0, 1.0, 0.0)) < 0.3;\n"u8 +
+        "    bool isShaded = isLight || isShade || isNormal;\n"u8 +
+        "\n"u8 +
+        "    float colIndex = floor(v_color0.r * 29.0);\n"u8 +
+        "    vec3 shadedCol = float(isLight) * getLitColor(colIndex) + float(isShade) * getShadeColor(colIndex) + float(isNormal) * getNeutralColor(colIndex);\n"u8 +
+        "\n"u8 +
+        "    fragColor = vec4(shadedCol * float(isShaded) + texelColor.rgb * float(!isShaded), v_color0.a) * u_color;\n"u8 +
+        "}\n"u8 +
+        "// the shader used for prop rendering in the editor.\n"u8 +
+        "// white pixels are transparent\n"u8 +
+        "// the R color component controls transparency and the G color component controls white blend\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    bool inBounds = abs(v_texcoord0.x - 0.5f) <= 0.5f && abs(v_texcoord0.y - 0.5f) <= 0.5f;\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    bool isTransparent = length(texelColor.rgb - vec3(1.0, 1.0, 1.0)) < 0.05 || texelColor.a == 0.0 || !inBounds;\n"u8 +
+        "    if (isTransparent) discard;\n"u8 +
+        "\n"u8 +
+        "    vec3 color = mix(texelColor.rgb, vec3(1.0), v_color0.y);\n"u8 +
+        "    fragColor = vec4(color, v_color0.x) * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    bool isWhite = texelColor.r == 1.0 && texelColor.g == 1.0 && texelColor.b == 1.0;\n"u8 +
+        "    vec3 correctColor = texelColor.bgr;\n"u8 +
+        "\n"u8 +
+        "    fragColor = vec4(\n"u8 +
+        "        mix(correctColor, vec3(1.0), v_color0.r * 0.8),\n"u8 +
+        "        1.0 - float(isWhite)\n"u8 +
+        "    ) * u_color;\n"u8 +
+        "}\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 v4_textureSize;\n"u8 +
+        "uniform vec4 v4_propRotation;\n"u8 +
+        "uniform vec4 v4_lightDirection;\n"u8 +
+        "uniform vec4 v4_softPropShadeInfo;\n"u8 +
+        "\n"u8 +
+        "#undef textureSize\n"u8 +
+        "#define textureSize v4_textureSize.xy\n"u8 +
+        "#define propRotation v4_propRotation\n"u8 +
+        "#define lightDirection v4_lightDirection.xyz\n"u8 +
+        "#define contourExponent v4_softPropShadeInfo.x\n"u8 +
+        "#define highlightThreshold v4_softPropShadeInfo.y\n"u8 +
+        "#define shadowThreshold v4_softPropShadeInfo.z\n"u8 +
+        "#define propDepth v4_softPropShadeInfo.w\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    if (isTransparent(v_texcoord0)) discard;\n"u8 +
+        "    float center = texture(u_texture0, v_texcoord0).g;\n"u8 +
+        "\n"u8 +
+        "    // get x partial derivative\n"u8 +
+        "    float row[3];\n"u8 +
+        "    row[0] = texture(u_texture0, v_texcoord0 - vec2(1.0, 0.0) / textureSize).g;\n"u8 +
+        "    row[1] = center;\n"u8 +
+        "    row[2] = texture(u_texture0, v_texcoord0 + vec2(1.0, 0.0) / textureSize).g;\n"u8 +
+        "    float slopeX = (row[2] - row[0]) / (3.0 / textureSize.x);\n"u8 +
+        "\n"u8 +
+        "    // get y partial derivative\n"u8 +
+        "    row[0] = texture(u_texture0, v_texcoord0 - vec2(0.0, 1.0) / textureSize).g;\n"u8 +
+        "    row[1] = center;\n"u8 +
+        "    row[2] = texture(u_texture0, v_texcoord0 + vec2(0.0, 1.0) / textureSize).g;\n"u8 +
+        "    float slopeY = (row[2] - row[0]) / (3.0 / textureSize.y);\n"u8 +
+        "\n"u8 +
+        "    // calculate curve normal\n"u8 +
+        "    vec3 normal = cross( normalize(vec3(propRotation.xy, slopeX)), normalize(vec3(propRotation.zw, slopeY)) );\n"u8 +
+        "    normal = normalize(normal);\n"u8 +
+        "\n"u8 +
+        "    // shadeValue is used to determine if this pixel is a shade, highlight, or neutral\n"u8 +
+        "    vec3 lightDir = normalize(lightDirection);\n"u8 +
+        "    float shadeValue =  max(0.0, dot(lightDir, normal));\n"u8 +
+        "\n"u8 +
+        "    float depth = (pow(1.0 - center, contourExponent) * propDepth) / 29.0 + v_color0.r;\n"u8 +
+        "\n"u8 +
+        "    bool isNormal = shadeValue > shadowThreshold && shadeValue < highlightThreshold;\n"u8 +
+        "    bool isLight = shadeValue >= highlightThreshold;\n"u8 +
+        "    bool isShade = shadeValue <= shadowThreshold;\n"u8 +
+        "\n"u8 +
+        "    float colIndex = floor(clamp(depth, 0.0, 1.0) * 29.0);\n"u8 +
+        "    vec3 shadedCol = float(isLight) * getLitColor(colIndex) + float(isShade) * getShadeColor(colIndex) + float(isNormal) * getNeutralColor(colIndex);\n"u8 +
+        "\n"u8 +
+        "    fragColor = vec4(shadedCol, v_color0.a) * u_color;\n"u8 +
+        "}\n"u8 +
+        "// shader used for tile rendering in the editor.\n"u8 +
+        "// white pixels\n"u8 +
+        "\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    bool inBounds = abs(v_texcoord0.x - 0.5f) <= 0.5f && abs(v_texcoord0.y - 0.5f) <= 0.5f;\n"u8 +
+        "    vec4 texelColor = texture(u_texture0, v_texcoord0);\n"u8 +
+        "    bool isTransparent = length(texelColor.rgb - vec3(1.0, 1.0, 1.0)) < 0.05 || texelColor.a == 0.0 || !inBounds;\n"u8 +
+        "    if (isTransparent) discard;\n"u8 +
+        "\n"u8 +
+        "    fragColor = v_color0 * u_color;\n"u8 +
+        "\n"u8 +
+        "    bool isLight = length(texelColor.rgb - vec3(0.0, 0.0, 1.0)) < 0.3;\n"u8 +
+        "    bool isShade = length(texelColor.rgb - vec3(1.0, 0.0, 0.0)) < 0.3;\n"u8 +
+        "    bool isNormal = length(texelColor.rgb - vec3(0.0, 1.0, 0.0)) < 0.3;\n"u8 +
+        "    bool isShaded = isLight || isShade || isNormal;\n"u8 +
+        "\n"u8 +
+        "    float light = float(isLight) * 1.0 + float(isShade) * 0.4 + float(isNormal) * 0.8;\n"u8 +
+        "    vec3 shadedCol = v_color0.rgb * light;\n"u8 +
+        "    //vec3 finalColor = shadedCol * float(isShaded) + texelColor.rgb * (1.0 - float(isShaded));\n"u8 +
+        "    vec3 finalColor = isShaded ? shadedCol : texelColor.rgb;\n"u8 +
+        "    fragColor = vec4(finalColor, 1.0) * v_color0 * u_color;\n"u8 +
+        "}\n"u8 +
+        "in vec2 v_texcoord0;\n"u8 +
+        "in vec4 v_color0;\n"u8 +
+        "\n"u8 +
+        "uniform vec4 u_color;\n"u8 +
+        "uniform sampler2D u_texture0;\n"u8 +
+        "\n"u8 +
+        "out vec4 fragColor;\n"u8 +
+        "\n"u8 +
+        "void main()\n"u8 +
+        "{\n"u8 +
+        "    vec2 uv = v_texcoord0 - floor(v_texcoord0);\n"u8 +
+        "    fragColor = texture(u_texture0, uv) * v_color0 * u_color;\n"u8 +
+        "}\n"u8;
+}
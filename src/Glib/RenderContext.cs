@@ -481,14 +481,11 @@ public sealed class RenderContext : IDisposable
 
         var shader = Shader ?? defaultShader;
 
-        if (shader.HasUniform(Shader.TextureUniform))
-            shader.SetUniform(Shader.TextureUniform, texture);
+        shader.SetUniform(BuiltinUniform.Texture, texture);
         
-        if (shader.HasUniform(Shader.ColorUniform))
-            shader.SetUniform(Shader.ColorUniform, DrawColor);
+        shader.SetUniform(BuiltinUniform.Color, DrawColor);
         
-        if (shader.HasUniform(Shader.MatrixUniform))
-            shader.SetUniform(Shader.MatrixUniform, TransformMatrix * _curMvp);
+        shader.SetUniform(BuiltinUniform.Matrix, TransformMatrix * _curMvp);
 
         try
         {
@@ -561,14 +558,11 @@ public sealed class RenderContext : IDisposable
 
             var shader = rctx.Shader ?? rctx.defaultShader;
 
-            if (shader.HasUniform(Shader.TextureUniform))
-                shader.SetUniform(Shader.TextureUniform, texture);
+            shader.SetUniform(BuiltinUniform.Texture, texture);
             
-            if (shader.HasUniform(Shader.ColorUniform))
-                shader.SetUniform(Shader.ColorUniform, rctx.DrawColor);
+            shader.SetUniform(BuiltinUniform.Color, rctx.DrawColor);
             
-            if (shader.HasUniform(Shader.MatrixUniform))
-                shader.SetUniform(Shader.MatrixUniform, rctx.TransformMatrix * rctx._curMvp);
+            shader.SetUniform(BuiltinUniform.Matrix, rctx.TransformMatrix * rctx._curMvp);
             
             try
             {
@@ -782,14 +776,11 @@ public sealed class RenderContext : IDisposable
         SetupState();
         var shader = Shader ?? defaultShader;
 
-        if (shader.HasUniform(Shader.TextureUniform))
-            shader.SetUniform(Shader.TextureUniform, _drawBatch.Texture ?? WhiteTexture);
+        shader.SetUniform(BuiltinUniform.Texture, _drawBatch.Texture ?? WhiteTexture);
 
-        if (shader.HasUniform(Shader.ColorUniform))
-            shader.SetUniform(Shader.ColorUniform, Color.White);
+        shader.SetUniform(BuiltinUniform.Color, Color.White);
         
-        if (shader.HasUniform(Shader.MatrixUniform))
-            shader.SetUniform(Shader.MatrixUniform, _curMvp);
+        shader.SetUniform(BuiltinUniform.Matrix, _curMvp);
         
         shader.ActivateTextures(WhiteTexture);
     }
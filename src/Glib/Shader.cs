@@ -17,6 +17,19 @@ public class ShaderCompilationException : Exception
     public ShaderCompilationException(string message, System.Exception inner) : base(message, inner) { }
 }
 
+/// <summary>
+/// The uniforms RenderContext sets before every draw. They are resolved by
+/// the names in <see cref="Shader.TextureUniform"/>, <see cref="Shader.ColorUniform"/>
+/// and <see cref="Shader.MatrixUniform"/>, so that Glib does not depend on
+/// which uniforms the shaders of the application declare.
+/// </summary>
+internal enum BuiltinUniform
+{
+    Texture,
+    Color,
+    Matrix
+}
+
 public class Shader : Resource
 {
 #if GLES
@@ -79,6 +92,15 @@ public class Shader : Resource
     internal static bool _debug = false;
 
     private readonly Dictionary<string, (uint loc, UniformType type)> _uniformLocs = [];
+    // a uniform resolved when the program is linked. TextureUnit is the
+    // index into _boundTextures of a sampler, or -1 for other types.
+    private readonly record struct UniformSlot(uint Loc, UniformType Type, int TextureUnit)
+    {
+        public (uint loc, UniformType type) Handle => (Loc, Type);
+    }
+
+    private readonly UniformSlot?[] _uniformSlots = new UniformSlot?[ShaderReflection.UniformSlotCount];
+    private readonly UniformSlot?[] _builtinSlots = new UniformSlot?[(int)BuiltinUniform.Matrix + 1];
     private List<string> _textureUnits = [];
     private Texture[] _boundTextures;
 
@@ -145,14 +167,35 @@ public class Shader : Resource
             var uName = Encoding.UTF8.GetString(nameArr[..(int)len]);
             _uniformLocs[uName] = (uniformLoc, type);
 
+            int textureUnit = -1;
             switch (type)
             {
                 case UniformType.Sampler1D:
                 case UniformType.Sampler2D:
                 case UniformType.Sampler3D:
+                    textureUnit = _textureUnits.Count;
                     _textureUnits.Add(uName);
                     break;
             }
+
+            // arrays are reported by the name of their first element
+            var slotName = uName.EndsWith("[0]") ? uName[..^3] : uName;
+            var uniformSlot = new UniformSlot(uniformLoc, type, textureUnit);
+            if (ShaderReflection.TryGetUniformSlot(slotName, out var slot))
+                _uniformSlots[(int)slot] = uniformSlot;
+
+            switch (slotName)
+            {
+                case TextureUniform:
+                    _builtinSlots[(int)BuiltinUniform.Texture] = uniformSlot;
+                    break;
+                case ColorUniform:
+                    _builtinSlots[(int)BuiltinUniform.Color] = uniformSlot;
+                    break;
+                case MatrixUniform:
+                    _builtinSlots[(int)BuiltinUniform.Matrix] = uniformSlot;
+                    break;
+            }
         }
 
         _boundTextures = new Texture[_textureUnits.Count];
@@ -220,10 +263,13 @@ public class Shader : Resource
     public static Shader Load(string? vsName, string? fsName)
     {
         var gl = RenderContext.Gl;
-        var assembly = typeof(Shader).Assembly;
 
+        // the default shaders are compiled from strings, and the others
+        // from the shader catalog
         string? vsSource = null;
         string? fsSource = null;
+        ShaderSource? vsCatalogSource = null;
+        ShaderSource? fsCatalogSource = null;
         uint vsh, fsh;
 
         vsName ??= "DEFAULT_VERT";
@@ -238,12 +284,13 @@ public class Shader : Resource
             {
                 vsSource = DefaultVertexSource;
             }
+            else if (ShaderCatalog.TryFind(vsName, out var vsFound))
+            {
+                vsCatalogSource = vsFound;
+            }
             else
             {
-                using var vsStream = assembly.GetManifestResourceStream("Glib.shaders." + vsName)
-                    ?? throw new ArgumentException($"Shader '{vsName}' does not exist", nameof(vsName));
-                using var vsStreamReader = new StreamReader(vsStream);
-                vsSource = vsStreamReader.ReadToEnd();
+                throw new ArgumentException($"Shader '{vsName}' does not exist", nameof(vsName));
             }
         }
 
@@ -256,21 +303,24 @@ public class Shader : Resource
             {
                 fsSource = DefaultFragmentSource;
             }
+            else if (ShaderCatalog.TryFind(fsName, out var fsFound))
+            {
+                fsCatalogSource = fsFound;
+            }
             else
             {
-                using var fsStream = assembly.GetManifestResourceStream("Glib.shaders." + fsName)
-                    ?? throw new ArgumentException($"Shader '{fsName}' does not exist", nameof(fsName));
-                using var fsStreamReader = new StreamReader(fsStream);
-                fsSource = fsStreamReader.ReadToEnd();
+                throw new ArgumentException($"Shader '{fsName}' does not exist", nameof(fsName));
             }
         }
         
         // compile vertex shader if not in cache
         if (vsh == 0)
         {
-            if (vsSource is null) throw new UnreachableException();
             vsh = gl.CreateShader(ShaderType.VertexShader);
-            gl.ShaderSource(vsh, vsSource);
+            if (vsCatalogSource is ShaderSource vsCatalog)
+                ShaderCatalog.SetShaderSource(gl, vsh, vsCatalog);
+            else
+                gl.ShaderSource(vsh, vsSource ?? throw new UnreachableException());
             gl.CompileShader(vsh);
             if (gl.GetShader(vsh, GLEnum.CompileStatus) == 0)
             {
@@ -287,9 +337,11 @@ public class Shader : Resource
         // compile fragment shader if not cache
         if (fsh == 0)
         {
-            if (fsSource is null) throw new UnreachableException();
             fsh = gl.CreateShader(ShaderType.FragmentShader);
-            gl.ShaderSource(fsh, fsSource);
+            if (fsCatalogSource is ShaderSource fsCatalog)
+                ShaderCatalog.SetShaderSource(gl, fsh, fsCatalog);
+            else
+                gl.ShaderSource(fsh, fsSource ?? throw new UnreachableException());
             gl.CompileShader(fsh);
             if (gl.GetShader(fsh, GLEnum.CompileStatus) == 0)
             {
@@ -320,6 +372,14 @@ public class Shader : Resource
         return _uniformLocs.ContainsKey(uName);
     }
 
+    /// <summary>
+    /// Check if the shader has an active uniform in the given slot.
+    /// </summary>
+    public bool HasUniform(ShaderUniform slot)
+    {
+        return _uniformSlots[(int)slot] is not null;
+    }
+
     private (uint loc, UniformType type) GetUniformHandle(string uName)
     {
         if (!_uniformLocs.TryGetValue(uName, out var v))
@@ -330,7 +390,12 @@ public class Shader : Resource
 
     private uint GetUniformHandle(string uName, string inputType, UniformType expectedType)
     {
-        var (handle, type) = GetUniformHandle(uName);
+        return CheckUniformType(GetUniformHandle(uName), inputType, expectedType);
+    }
+
+    private static uint CheckUniformType((uint loc, UniformType type) uniform, string inputType, UniformType expectedType)
+    {
+        var (handle, type) = uniform;
 
         if (type != expectedType)
             throw new ArgumentException($"{type} is incompatible with the uniform type {inputType}");
@@ -343,9 +408,18 @@ public class Shader : Resource
     /// </summary>
     public void SetUniform(string uName, float value)
     {
-        var gl = RenderContext.Gl;
-        gl.Uniform1((int)GetUniformHandle(uName, "float", UniformType.Float), value);
-        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+        SetUniform(GetUniformHandle(uName), value);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, float value)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, value);
     }
 
     /// <summary>
@@ -353,9 +427,18 @@ public class Shader : Resource
     /// </summary>
     public void SetUniform(string uName, Vector2 value)
     {
-        var gl = RenderContext.Gl;
-        gl.Uniform2((int)GetUniformHandle(uName, "Vector2", UniformType.FloatVec2), value);
-        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+        SetUniform(GetUniformHandle(uName), value);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Vector2 value)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, value);
     }
 
     /// <summary>
@@ -364,9 +447,19 @@ public class Shader : Resource
     /// </summary>
     public void SetUniform(string uName, Vector3 value)
     {
-        var gl = RenderContext.Gl;
-        gl.Uniform3((int)GetUniformHandle(uName, "Vector3", UniformType.FloatVec3), value);
-        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+        SetUniform(GetUniformHandle(uName), value);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// Submits vec4(value.X, value.Y, value.Z, 0.0)
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Vector3 value)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, value);
     }
 
     /// <summary>
@@ -374,9 +467,18 @@ public class Shader : Resource
     /// </summary>
     public void SetUniform(string uName, Vector4 value)
     {
-        var gl = RenderContext.Gl;
-        gl.Uniform4((int)GetUniformHandle(uName, "Vector4", UniformType.FloatVec4), value);
-        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+        SetUniform(GetUniformHandle(uName), value);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Vector4 value)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, value);
     }
 
     /// <summary>
@@ -384,18 +486,116 @@ public class Shader : Resource
     /// </summary>
     public void SetUniform(string uName, Color value)
     {
-        var gl = RenderContext.Gl;
-        gl.Uniform4((int)GetUniformHandle(uName, "Vector4", UniformType.FloatVec4), new Vector4(value.R, value.G, value.B, value.A));
-        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+        SetUniform(GetUniformHandle(uName), value);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Color value)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, value);
     }
 
     /// <summary>
     /// Set the value of the shader's uniform.
     /// </summary>
     public void SetUniform(string uName, Matrix4x4 matrix)
+    {
+        SetUniform(GetUniformHandle(uName), matrix);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Matrix4x4 matrix)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, matrix);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform.
+    /// </summary>
+    public void SetUniform(string uName, Matrix2x2 matrix)
+    {
+        SetUniform(GetUniformHandle(uName), matrix);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Matrix2x2 matrix)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, matrix);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform.
+    /// </summary>
+    public void SetUniform(string uName, Matrix3x3 matrix)
+    {
+        SetUniform(GetUniformHandle(uName), matrix);
+    }
+
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. Does nothing if
+    /// the shader has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Matrix3x3 matrix)
+    {
+        var uniform = _uniformSlots[(int)slot];
+        if (uniform is not null)
+            SetUniform(uniform.Value.Handle, matrix);
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, float value)
+    {
+        var gl = RenderContext.Gl;
+        gl.Uniform1((int)CheckUniformType(uniform, "float", UniformType.Float), value);
+        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, Vector2 value)
+    {
+        var gl = RenderContext.Gl;
+        gl.Uniform2((int)CheckUniformType(uniform, "Vector2", UniformType.FloatVec2), value);
+        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, Vector3 value)
+    {
+        var gl = RenderContext.Gl;
+        gl.Uniform3((int)CheckUniformType(uniform, "Vector3", UniformType.FloatVec3), value);
+        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, Vector4 value)
+    {
+        var gl = RenderContext.Gl;
+        gl.Uniform4((int)CheckUniformType(uniform, "Vector4", UniformType.FloatVec4), value);
+        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, Color value)
+    {
+        var gl = RenderContext.Gl;
+        gl.Uniform4((int)CheckUniformType(uniform, "Vector4", UniformType.FloatVec4), new Vector4(value.R, value.G, value.B, value.A));
+        GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
+    }
+
+    private static void SetUniform((uint loc, UniformType type) uniform, Matrix4x4 matrix)
     {
         var gl = RenderContext.Gl;
-        var handle = (int)GetUniformHandle(uName, "Matrix4x4", UniformType.FloatMat4);
+        var handle = (int)CheckUniformType(uniform, "Matrix4x4", UniformType.FloatMat4);
 
         Span<float> flat =
         [
@@ -421,13 +621,10 @@ public class Shader : Resource
         GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
     }
 
-    /// <summary>
-    /// Set the value of the shader's uniform.
-    /// </summary>
-    public void SetUniform(string uName, Matrix2x2 matrix)
+    private static void SetUniform((uint loc, UniformType type) uniform, Matrix2x2 matrix)
     {
         var gl = RenderContext.Gl;
-        var (handle, type) = GetUniformHandle(uName);
+        var (handle, type) = uniform;
 
         if (type == UniformType.FloatMat3)
         {
@@ -469,13 +666,10 @@ public class Shader : Resource
         GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
     }
     
-    /// <summary>
-    /// Set the value of the shader's uniform.
-    /// </summary>
-    public void SetUniform(string uName, Matrix3x3 matrix)
+    private static void SetUniform((uint loc, UniformType type) uniform, Matrix3x3 matrix)
     {
         var gl = RenderContext.Gl;
-        var (handle, type) = GetUniformHandle(uName);
+        var (handle, type) = uniform;
 
         if (type == UniformType.FloatMat3)
         {
@@ -538,6 +732,48 @@ public class Shader : Resource
         GlUtil.CheckError(RenderContext.Gl, "Could not set uniform");
     }
 
+    /// <summary>
+    /// Set the value of the shader's uniform by its slot. This is only valid
+    /// for the shader if it is currently active. Does nothing if the shader
+    /// has no active uniform in that slot.
+    /// </summary>
+    public void SetUniform(ShaderUniform slot, Texture texture)
+    {
+        SetTexture(_uniformSlots[(int)slot], texture);
+    }
+
+    /// <summary>
+    /// Set one of the uniforms RenderContext sets before every draw. Does
+    /// nothing if the shader does not use it.
+    /// </summary>
+    internal void SetUniform(BuiltinUniform uniform, Texture texture)
+    {
+        SetTexture(_builtinSlots[(int)uniform], texture);
+    }
+
+    internal void SetUniform(BuiltinUniform uniform, Color value)
+    {
+        var slot = _builtinSlots[(int)uniform];
+        if (slot is not null)
+            SetUniform(slot.Value.Handle, value);
+    }
+
+    internal void SetUniform(BuiltinUniform uniform, Matrix4x4 matrix)
+    {
+        var slot = _builtinSlots[(int)uniform];
+        if (slot is not null)
+            SetUniform(slot.Value.Handle, matrix);
+    }
+
+    private void SetTexture(UniformSlot? uniform, Texture texture)
+    {
+        if (uniform is null) return;
+
+        CheckUniformType(uniform.Value.Handle, "Texture", UniformType.Sampler2D); // just need the type check
+        Debug.Assert(uniform.Value.TextureUnit >= 0);
+        _boundTextures[uniform.Value.TextureUnit] = texture;
+    }
+
     internal uint ActivateTextures(Texture placeholderTexture)
     {
         var gl = RenderContext.Gl;
@@ -0,0 +1,89 @@
+#if GLES
+using Silk.NET.OpenGLES;
+#else
+using Silk.NET.OpenGL;
+#endif
+
+namespace Glib;
+
+/// <summary>
+/// The preprocessed sources of the shaders in glshaders, compiled into the
+/// assembly as UTF-8 data. The sources and the <see cref="ShaderSource"/>
+/// members are generated by tools/shader-preprocessor.py into the
+/// ShaderCatalog.gen.cs file of the build directory of each target. A source
+/// is stored as a list of chunks, so that code shared by several sources,
+/// such as included files, is only stored once.
+/// </summary>
+public static partial class ShaderCatalog
+{
+    /// <summary>
+    /// The number of sources in the catalog.
+    /// </summary>
+    public static int Count => _names.Length;
+
+    /// <summary>
+    /// Find a source by the name it is loaded by, e.g. "prop_fade.frag".
+    /// </summary>
+    /// <returns>True if the source exists, false if not.</returns>
+    public static bool TryFind(string name, out ShaderSource source)
+    {
+        int index = Array.BinarySearch(_names, name, StringComparer.Ordinal);
+        source = (ShaderSource)Math.Max(index, 0);
+        return index >= 0;
+    }
+
+    /// <summary>
+    /// Get the name a source is loaded by.
+    /// </summary>
+    public static string GetName(ShaderSource source) => _names[(int)source];
+
+    /// <summary>
+    /// Get a 64-bit hash of the code of a source, which only changes if the
+    /// code does. It is the first 8 bytes of the SHA-256 hash of the code.
+    /// </summary>
+    public static ulong GetHash(ShaderSource source) => SourceHashes[(int)source];
+
+    /// <summary>
+    /// Get the number of chunks a source is made of.
+    /// </summary>
+    public static int GetChunkCount(ShaderSource source)
+        => SourceChunkStarts[(int)source + 1] - SourceChunkStarts[(int)source];
+
+    /// <summary>
+    /// Get a chunk of the code of a source. The code of the source is the
+    /// concatenation of all of its chunks.
+    /// </summary>
+    public static ReadOnlySpan<byte> GetChunk(ShaderSource source, int index)
+    {
+        if ((uint)index >= (uint)GetChunkCount(source))
+            throw new ArgumentOutOfRangeException(nameof(index));
+
+        int chunk = SourceChunks[SourceChunkStarts[(int)source] + index];
+        return ChunkData.Slice(ChunkRanges[chunk * 2], ChunkRanges[chunk * 2 + 1]);
+    }
+
+    /// <summary>
+    /// Set the source of a GL shader object to the chunks of a source,
+    /// without copying or decoding them.
+    /// </summary>
+    internal static unsafe void SetShaderSource(GL gl, uint shader, ShaderSource source)
+    {
+        int start = SourceChunkStarts[(int)source];
+        int count = SourceChunkStarts[(int)source + 1] - start;
+
+        var strings = stackalloc byte*[count];
+        var lengths = stackalloc int[count];
+
+        fixed (byte* data = ChunkData)
+        {
+            for (int i = 0; i < count; i++)
+            {
+                int chunk = SourceChunks[start + i];
+                strings[i] = data + ChunkRanges[chunk * 2];
+                lengths[i] = ChunkRanges[chunk * 2 + 1];
+            }
+
+            gl.ShaderSource(shader, (uint)count, strings, lengths);
+        }
+    }
+}
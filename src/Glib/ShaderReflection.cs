@@ -0,0 +1,75 @@
+namespace Glib;
+
+/// <summary>
+/// An input or output variable declared by a shader.
+/// </summary>
+/// <param name="Name">The name of the variable.</param>
+/// <param name="Type">The GLSL type of the variable.</param>
+/// <param name="ArraySize">The element count if the variable is an array, or 0 otherwise.</param>
+public readonly record struct ShaderVariable(string Name, string Type, int ArraySize = 0);
+
+/// <summary>
+/// A uniform declared by a shader.
+/// </summary>
+/// <param name="Slot">The slot of the uniform.</param>
+/// <param name="Type">The GLSL type of the uniform.</param>
+/// <param name="ArraySize">The element count if the uniform is an array, or 0 otherwise.</param>
+public readonly record struct ShaderUniformInfo(ShaderUniform Slot, string Type, int ArraySize = 0)
+{
+    /// <summary>
+    /// The name of the uniform.
+    /// </summary>
+    public string Name => ShaderReflection.GetUniformName(Slot);
+}
+
+/// <summary>
+/// The uniforms, inputs and outputs declared by a shader in glshaders.
+/// </summary>
+public class ShaderDescriptor
+{
+    /// <summary>
+    /// The name the shader is loaded by, e.g. "prop_fade.frag".
+    /// </summary>
+    public readonly string Name;
+
+    public readonly ShaderUniformInfo[] Uniforms;
+    public readonly ShaderVariable[] Inputs;
+    public readonly ShaderVariable[] Outputs;
+
+    public ShaderDescriptor(string name, ShaderUniformInfo[] uniforms, ShaderVariable[] inputs, ShaderVariable[] outputs)
+    {
+        Name = name;
+        Uniforms = uniforms;
+        Inputs = inputs;
+        Outputs = outputs;
+    }
+}
+
+/// <summary>
+/// Reflection data of the shaders in glshaders. The descriptors and the
+/// <see cref="ShaderUniform"/> slots are generated by tools/shader-preprocessor.py
+/// into ShaderReflection.gen.cs.
+/// </summary>
+public static partial class ShaderReflection
+{
+    private static readonly string[] _uniformNames = Enum.GetNames<ShaderUniform>();
+    private static readonly Dictionary<string, ShaderUniform> _uniformSlots =
+        Enum.GetValues<ShaderUniform>().ToDictionary(GetUniformName);
+
+    /// <summary>
+    /// The number of uniform slots.
+    /// </summary>
+    public static int UniformSlotCount => _uniformNames.Length;
+
+    /// <summary>
+    /// Get the name of the uniform in a slot.
+    /// </summary>
+    public static string GetUniformName(ShaderUniform slot) => _uniformNames[(int)slot];
+
+    /// <summary>
+    /// Get the slot of a uniform by its name.
+    /// </summary>
+    /// <returns>True if any shader declares a uniform of that name, false if not.</returns>
+    public static bool TryGetUniformSlot(string name, out ShaderUniform slot)
+        => _uniformSlots.TryGetValue(name, out slot);
+}
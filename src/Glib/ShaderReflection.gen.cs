@@ -0,0 +1,366 @@
+// <auto-generated>
+// This file was generated by tools/shader-preprocessor.py from the shaders in glshaders.
+// Do not edit it by hand.
+// </auto-generated>
+
+namespace Glib;
+
+/// <summary>
+/// Slots of the uniforms declared by the shaders in glshaders. Setting
+/// a uniform through its slot does not need to look it up by name.
+/// </summary>
+public enum ShaderUniform
+{
+    time,
+    u_color,
+    u_mvp,
+    u_paletteTex,
+    u_texture0,
+    u_vert_ab,
+    u_vert_cd,
+    v4_bevelData,
+    v4_lightDirection,
+    v4_propRotation,
+    v4_softPropShadeInfo,
+    v4_textureSize,
+}
+
+public static partial class ShaderReflection
+{
+    /// <summary>
+    /// The uniforms, inputs and outputs of bevel.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor BevelFrag = new(
+        "bevel.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_paletteTex, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.v4_textureSize, "vec4"),
+            new(ShaderUniform.v4_propRotation, "vec4"),
+            new(ShaderUniform.v4_lightDirection, "vec4"),
+            new(ShaderUniform.v4_bevelData, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of bitmap_render_preview.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor BitmapRenderPreviewFrag = new(
+        "bitmap_render_preview.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of effect_matrix.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor EffectMatrixFrag = new(
+        "effect_matrix.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of grid.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor GridFrag = new(
+        "grid.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of grid.vert.
+    /// </summary>
+    public static readonly ShaderDescriptor GridVert = new(
+        "grid.vert",
+        uniforms: [
+            new(ShaderUniform.u_mvp, "mat4"),
+        ],
+        inputs: [
+            new("a_position", "vec3"),
+        ],
+        outputs: []
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of imgui.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor ImguiFrag = new(
+        "imgui.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of imgui.vert.
+    /// </summary>
+    public static readonly ShaderDescriptor ImguiVert = new(
+        "imgui.vert",
+        uniforms: [
+            new(ShaderUniform.u_mvp, "vec4"),
+        ],
+        inputs: [
+            new("a_pos", "vec2"),
+            new("a_color0", "vec4"),
+            new("a_texcoord0", "vec2"),
+        ],
+        outputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of invert.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor InvertFrag = new(
+        "invert.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of level_light.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor LevelLightFrag = new(
+        "level_light.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of lightmap_stretch.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor LightmapStretchFrag = new(
+        "lightmap_stretch.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_vert_ab, "vec4"),
+            new(ShaderUniform.u_vert_cd, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of outline_marquee.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor OutlineMarqueeFrag = new(
+        "outline_marquee.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.time, "float"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of palette.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor PaletteFrag = new(
+        "palette.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_paletteTex, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of prop_fade.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor PropFadeFrag = new(
+        "prop_fade.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of render_preview.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor RenderPreviewFrag = new(
+        "render_preview.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of softprop.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor SoftpropFrag = new(
+        "softprop.frag",
+        uniforms: [
+            new(ShaderUniform.u_texture0, "sampler2D"),
+            new(ShaderUniform.u_paletteTex, "sampler2D"),
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.v4_textureSize, "vec4"),
+            new(ShaderUniform.v4_propRotation, "vec4"),
+            new(ShaderUniform.v4_lightDirection, "vec4"),
+            new(ShaderUniform.v4_softPropShadeInfo, "vec4"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of tile.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor TileFrag = new(
+        "tile.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The uniforms, inputs and outputs of uv_repeat.frag.
+    /// </summary>
+    public static readonly ShaderDescriptor UvRepeatFrag = new(
+        "uv_repeat.frag",
+        uniforms: [
+            new(ShaderUniform.u_color, "vec4"),
+            new(ShaderUniform.u_texture0, "sampler2D"),
+        ],
+        inputs: [
+            new("v_texcoord0", "vec2"),
+            new("v_color0", "vec4"),
+        ],
+        outputs: [
+            new("fragColor", "vec4"),
+        ]
+    );
+
+    /// <summary>
+    /// The descriptors of every shader in glshaders.
+    /// </summary>
+    public static readonly ShaderDescriptor[] Shaders = [
+        BevelFrag,
+        BitmapRenderPreviewFrag,
+        EffectMatrixFrag,
+        GridFrag,
+        GridVert,
+        ImguiFrag,
+        ImguiVert,
+        InvertFrag,
+        LevelLightFrag,
+        LightmapStretchFrag,
+        OutlineMarqueeFrag,
+        PaletteFrag,
+        PropFadeFrag,
+        RenderPreviewFrag,
+        SoftpropFrag,
+        TileFrag,
+        UvRepeatFrag,
+    ];
+}
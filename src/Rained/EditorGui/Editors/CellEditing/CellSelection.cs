@@ -440,7 +440,7 @@ class CellSelection
         // draw
         Raylib.BeginShaderMode(Shaders.OutlineMarqueeShader);
 
-        Shaders.OutlineMarqueeShader.GlibShader.SetUniform("time", (float)Raylib.GetTime());
+        Shaders.OutlineMarqueeShader.GlibShader.SetUniform(Glib.ShaderUniform.time, (float)Raylib.GetTime());
         RainEd.Instance.NeedScreenRefresh();
 
         // draw selection outline
@@ -134,6 +134,7 @@ static class LuaInterface
         RainedModule.RemoveAllCommands(luaState.State);
         LuaCallback.RemoveAllCallbacks();
         TilesModule.RemoveAllAutotiles();
+        ImGuiModule.LogStats();
         luaState.Dispose();
         luaState = null!;
     }
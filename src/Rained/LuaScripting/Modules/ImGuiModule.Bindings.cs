@@ -0,0 +1,353 @@
+using System.Diagnostics;
+using System.Numerics;
+using System.Runtime.InteropServices;
+using KeraLua;
+namespace Rained.LuaScripting.Modules;
+
+// support code of the bindings generated by tools/lua-imgui-gen.py. it only
+// depends on KeraLua, so that tools/lua-imgui-bench can compile it along with
+// the generated bindings against a stub instead of cimgui. the generated code
+// expects GetNativeFunc to be defined by the other half of the class.
+static partial class ImGuiModule
+{
+    // keralua doesn't expose a way to get the pointer to a lua string
+    [LibraryImport("lua54")]
+    private static unsafe partial byte* luaL_checklstring(nint luaState, int arg, out nuint len);
+
+    // lua strings are NUL-terminated and stay alive while they are on the
+    // stack, which they are for the duration of a function call. so they can
+    // be passed to imgui directly instead of being copied.
+    private static unsafe byte* CheckStr(Lua lua, int idx)
+    {
+        return luaL_checklstring(lua.Handle, idx, out _);
+    }
+
+    private static unsafe byte* OptStr(Lua lua, int idx)
+    {
+        if (lua.IsNoneOrNil(idx))
+            return null;
+        
+        return CheckStr(lua, idx);
+    }
+
+    /// <param name="defaultIdx">The index of the default string, usually an upvalue, which
+    /// keeps it alive for as long as the function exists.</param>
+    private static unsafe byte* OptStr(Lua lua, int idx, int defaultIdx)
+    {
+        if (lua.IsNoneOrNil(idx))
+            return CheckStr(lua, defaultIdx);
+        
+        return CheckStr(lua, idx);
+    }
+
+    private static Vector2 ReadVec2(Lua lua, int idx1, int idx2, Vector2 defaultVal)
+    {
+        return new Vector2(
+            (float)lua.OptNumber(idx1, defaultVal.X),
+            (float)lua.OptNumber(idx2, defaultVal.Y)
+        );
+    }
+
+    private static Vector2 ReadVec2(Lua lua, int idx1, int idx2)
+    {
+        return new Vector2(
+            (float)lua.CheckNumber(idx1),
+            (float)lua.CheckNumber(idx2)
+        );
+    }
+
+    private static void PushVec2(Lua lua, Vector2 v)
+    {
+        lua.PushNumber(v.X);
+        lua.PushNumber(v.Y);
+    }
+
+    private static Vector4 ReadVec4(Lua lua, int idx1, int idx2, int idx3, int idx4, Vector4 defaultVal)
+    {
+        return new Vector4(
+            (float)lua.OptNumber(idx1, defaultVal.X),
+            (float)lua.OptNumber(idx2, defaultVal.Y),
+            (float)lua.OptNumber(idx3, defaultVal.Z),
+            (float)lua.OptNumber(idx4, defaultVal.W)
+        );
+    }
+
+    private static Vector4 ReadVec4(Lua lua, int idx1, int idx2, int idx3, int idx4)
+    {
+        return new Vector4(
+            (float)lua.CheckNumber(idx1),
+            (float)lua.CheckNumber(idx2),
+            (float)lua.CheckNumber(idx3),
+            (float)lua.CheckNumber(idx4)
+        );
+    }
+
+    private static void PushVec4(Lua lua, Vector4 v)
+    {
+        lua.PushNumber(v.X);
+        lua.PushNumber(v.Y);
+        lua.PushNumber(v.Z);
+        lua.PushNumber(v.W);
+    }
+
+    // draw lists are given to lua as a full userdata holding the pointer,
+    // so that only pointers that came from imgui are passed back to it. a
+    // draw list is only valid until the end of the frame it was gotten in, so
+    // the userdata also holds the frame count, and is rejected afterwards.
+    private const string DrawListMetatable = "imgui.DrawList";
+
+    private struct DrawListHandle
+    {
+        public unsafe void* DrawList;
+        public int Frame;
+    }
+
+    private static unsafe delegate* unmanaged[Cdecl]<int> _getFrameCount = null;
+
+    private static unsafe int GetFrameCount()
+    {
+        if (_getFrameCount == null)
+            _getFrameCount = (delegate* unmanaged[Cdecl]<int>)GetNativeFunc("igGetFrameCount");
+        
+        return _getFrameCount();
+    }
+
+    private static unsafe void* CheckDrawList(Lua lua, int idx)
+    {
+        var handle = (DrawListHandle*)lua.CheckUserData(idx, DrawListMetatable);
+        if (handle->Frame != GetFrameCount())
+            lua.ArgumentError(idx, "draw list is from an earlier frame");
+
+        return handle->DrawList;
+    }
+
+    private static unsafe void* OptDrawList(Lua lua, int idx)
+    {
+        return lua.IsNoneOrNil(idx) ? null : CheckDrawList(lua, idx);
+    }
+
+    private static unsafe void PushDrawList(Lua lua, void* drawList)
+    {
+        if (drawList is null)
+        {
+            lua.PushNil();
+            return;
+        }
+
+        var handle = (DrawListHandle*)lua.NewUserData(sizeof(DrawListHandle));
+        lua.SetMetaTable(DrawListMetatable);
+        handle->DrawList = drawList;
+        handle->Frame = GetFrameCount();
+    }
+
+    private static long RawGetInteger(Lua lua, int idx, long n)
+    {
+        lua.RawGetInteger(idx, n);
+        var v = lua.ToInteger(-1);
+        lua.Pop(1);
+        return v;
+    }
+
+    // buffer of the points passed to imgui, which is grown as needed and
+    // never freed. imgui doesn't keep the pointer after the call.
+    private static unsafe Vector2* _points = null;
+    private static int _pointsCapacity = 0;
+
+    /// <summary>
+    /// Read a flat array of x, y coordinates into the point buffer.
+    /// </summary>
+    /// <returns>The point buffer, which stays valid until the next call.</returns>
+    private static unsafe Vector2* ReadPoints(Lua lua, int idx, out int count)
+    {
+        lua.CheckType(idx, LuaType.Table);
+        count = (int)(lua.RawLen(idx) / 2);
+
+        if (count > _pointsCapacity)
+        {
+            _pointsCapacity = Math.Max(count, _pointsCapacity * 2);
+            _points = (Vector2*)NativeMemory.Realloc(_points, (nuint)(_pointsCapacity * sizeof(Vector2)));
+        }
+
+        for (int i = 0; i < count; i++)
+        {
+            lua.RawGetInteger(idx, 2 * i + 1);
+            lua.RawGetInteger(idx, 2 * i + 2);
+            _points[i] = new Vector2((float)lua.ToNumber(-2), (float)lua.ToNumber(-1));
+            lua.Pop(2);
+        }
+
+        return _points;
+    }
+
+    /// <summary>
+    /// Install the generated function of the given name, or the enum group of the
+    /// given constant, into the module table.
+    /// </summary>
+    /// <returns>True if the name was found, false if not.</returns>
+    private static bool InstallGenerated(Lua lua, int tableIdx, string name)
+    {
+        int index = Array.BinarySearch(_generatedFuncNames, name, StringComparer.Ordinal);
+        if (index >= 0)
+        {
+            PushGeneratedFunc(lua, index);
+            lua.SetField(tableIdx, name);
+            return true;
+        }
+
+        index = FindGeneratedEnum(name);
+        if (index >= 0)
+        {
+            // the enum type of the constant is the last one starting at or before it
+            int group = Array.BinarySearch(_generatedEnumGroupStarts, index);
+            if (group < 0) group = ~group - 1;
+
+            for (int i = _generatedEnumGroupStarts[group]; i < _generatedEnumGroupStarts[group + 1]; i++)
+            {
+                lua.PushInteger(_generatedEnumValues[i]);
+                lua.SetField(tableIdx, _generatedEnumNames[i]);
+            }
+
+            return true;
+        }
+
+        return false;
+    }
+
+    // the enum constants are grouped by their enum type, and are only sorted
+    // by name through _generatedEnumOrder
+    private static int FindGeneratedEnum(string name)
+    {
+        int lo = 0;
+        int hi = _generatedEnumOrder.Length - 1;
+        while (lo <= hi)
+        {
+            int mid = lo + (hi - lo) / 2;
+            int index = _generatedEnumOrder[mid];
+            int cmp = string.CompareOrdinal(_generatedEnumNames[index], name);
+
+            if (cmp == 0) return index;
+            if (cmp < 0) lo = mid + 1;
+            else hi = mid - 1;
+        }
+
+        return -1;
+    }
+
+    private struct BindingStats
+    {
+        public long Calls;
+        public long Ticks;
+        public long AllocatedBytes;
+    }
+
+    // only recorded if the bindings were generated with lua-imgui-gen.py --instrument
+    private static BindingStats[]? _bindingStats = null;
+
+    // implemented by the generated code if the bindings are instrumented, by
+    // calling InstallStatsFunctions. otherwise, calls to it are removed, so
+    // that scripts don't see the stats functions at all.
+    static partial void InstallInstrumentation(Lua lua);
+
+    private static readonly KeraLua.LuaFunction _statsFunc = static (nint luaPtr) =>
+    {
+        var lua = Lua.FromIntPtr(luaPtr);
+        var hotList = GetHotList();
+        lua.CreateTable(hotList.Length, 0);
+        for (int i = 0; i < hotList.Length; i++)
+        {
+            var stats = _bindingStats![hotList[i]];
+            lua.CreateTable(0, 4);
+            lua.PushString(_generatedFuncNames[hotList[i]]);
+            lua.SetField(-2, "name");
+            lua.PushInteger(stats.Calls);
+            lua.SetField(-2, "calls");
+            lua.PushNumber((double)stats.Ticks / Stopwatch.Frequency);
+            lua.SetField(-2, "time");
+            lua.PushInteger(stats.AllocatedBytes);
+            lua.SetField(-2, "alloc");
+            lua.RawSetInteger(-2, i + 1);
+        }
+
+        return 1;
+    };
+
+    private static readonly KeraLua.LuaFunction _resetStatsFunc = static (nint luaPtr) =>
+    {
+        if (_bindingStats is not null)
+            Array.Clear(_bindingStats);
+        
+        return 0;
+    };
+
+    /// <summary>
+    /// Register imgui.__stats and imgui.__resetStats into the module table on
+    /// the top of the stack.
+    /// </summary>
+    private static void InstallStatsFunctions(Lua lua)
+    {
+        lua.PushCFunction(_statsFunc);
+        lua.SetField(-2, "__stats");
+        lua.PushCFunction(_resetStatsFunc);
+        lua.SetField(-2, "__resetStats");
+    }
+
+    private static void RecordCall(int index, long startTicks, long startAlloc)
+    {
+        _bindingStats ??= new BindingStats[_generatedFuncNames.Length];
+
+        ref var stats = ref _bindingStats[index];
+        stats.Calls++;
+        stats.Ticks += Stopwatch.GetTimestamp() - startTicks;
+        stats.AllocatedBytes += GC.GetAllocatedBytesForCurrentThread() - startAlloc;
+    }
+
+    /// <summary>
+    /// The indices of the generated functions that were called, sorted by
+    /// the time spent in them.
+    /// </summary>
+    private static int[] GetHotList()
+    {
+        if (_bindingStats is null)
+            return [];
+        
+        return Enumerable.Range(0, _bindingStats.Length)
+            .Where(i => _bindingStats[i].Calls > 0)
+            .OrderByDescending(i => _bindingStats[i].Ticks)
+            .ToArray();
+    }
+
+    private static readonly KeraLua.LuaFunction _generatedIndex = static (nint luaPtr) =>
+    {
+        var lua = Lua.FromIntPtr(luaPtr);
+        if (lua.Type(2) != LuaType.String)
+            return 0;
+
+        var name = lua.ToString(2);
+        if (!InstallGenerated(lua, 1, name))
+            return 0;
+
+        lua.PushCopy(2);
+        lua.RawGet(1);
+        return 1;
+    };
+
+    /// <summary>
+    /// Register the metatable of draw lists, and give the table on the top of
+    /// the stack a metatable that installs the generated functions and enum
+    /// constants into it on first access.
+    /// </summary>
+    private static void InitGeneratedModule(Lua lua)
+    {
+        if (lua.NewMetaTable(DrawListMetatable))
+        {
+            lua.PushString("The metatable is locked!");
+            lua.SetField(-2, "__metatable");
+        }
+        lua.Pop(1);
+
+        lua.NewTable();
+        lua.PushCFunction(_generatedIndex);
+        lua.SetField(-2, "__index");
+        lua.SetMetaTable(-2);
+    }
+}
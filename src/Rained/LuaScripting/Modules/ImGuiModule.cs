@@ -54,61 +54,37 @@ static partial class ImGuiModule
     //     {"Begin", Override_igBegin}
     // };
 
-    private static unsafe byte* GetStr(Lua lua, int idx)
+    private static nint _cimgui = 0;
+
+    // the generated bindings call cimgui through function pointers, so that
+    // functions with the same arguments can share a trampoline
+    private static nint GetNativeFunc(string name)
     {
-        var luaStr = lua.CheckBuffer(idx);
-        var sz = (nuint)luaStr.Length;
-        byte *buf = (byte*)NativeMemory.Alloc(sz + 1);
-        fixed (byte* p = luaStr)
-        {
-            Buffer.MemoryCopy(p, buf, sz+1, sz);
-        }
-        buf[sz] = 0;
-        return buf;
+        if (_cimgui == 0)
+            _cimgui = NativeLibrary.Load("cimgui", typeof(ImGuiNative).Assembly, null);
+        
+        return NativeLibrary.GetExport(_cimgui, name);
     }
 
-    private static unsafe byte* GetStr(Lua lua, int idx, byte[]? defaultValue)
+    /// <summary>
+    /// Write the ImGui functions scripts spent the most time in to the log,
+    /// if the bindings were generated with instrumentation.
+    /// </summary>
+    public static void LogStats(int count = 20)
     {
-        if (lua.IsNoneOrNil(idx))
-        {
-            if (defaultValue is null)
-                return null;
-            
-            var sz = (nuint)defaultValue.Length;
-            byte *buf = (byte*) NativeMemory.Alloc(sz);
-            fixed (byte* p = defaultValue)
-            {
-                Buffer.MemoryCopy(p, buf, sz, sz);
-            }
-            return buf;
-        }
-        else
+        if (_bindingStats is null)
+            return;
+        
+        Log.Information("ImGui binding stats (calls, time, allocated bytes):");
+        foreach (var i in GetHotList().Take(count))
         {
-            return GetStr(lua, idx);
+            var stats = _bindingStats[i];
+            Log.Information("    {Name}: {Calls}, {Time:F3} ms, {Alloc} B",
+                _generatedFuncNames[i], stats.Calls,
+                stats.Ticks * 1000.0 / Stopwatch.Frequency, stats.AllocatedBytes);
         }
     }
 
-    private static unsafe void StrFree(byte* v)
-    {
-        NativeMemory.Free((void*)v);
-    }
-
-    private static Vector2 ReadVec2(Lua lua, int idx1, int idx2, Vector2 defaultVal)
-    {
-        return new Vector2(
-            (float)lua.OptNumber(idx1, defaultVal.X),
-            (float)lua.OptNumber(idx2, defaultVal.Y)
-        );
-    }
-
-    private static Vector2 ReadVec2(Lua lua, int idx1, int idx2)
-    {
-        return new Vector2(
-            (float)lua.CheckNumber(idx1),
-            (float)lua.CheckNumber(idx2)
-        );
-    }
-
     public static unsafe int Loader(Lua lua)
     {
         lua.NewTable();
@@ -143,12 +119,16 @@ static partial class ImGuiModule
                 return 1;
             });
 
-            GeneratedFuncs(lua);
+            // imgui.__stats and imgui.__resetStats, if the bindings are instrumented
+            InstallInstrumentation(lua);
+
+            // the generated functions and enum constants are installed on first access
+            InitGeneratedModule(lua);
 
             LuaHelpers.ModuleFunction(lua, "InputText", static (nint luaPtr) =>
             {
                 var lua = Lua.FromIntPtr(luaPtr);
-                var label = GetStr(lua, 1);
+                var label = CheckStr(lua, 1);
                 var str = bufferMt.GetRef(lua, 2);
                 var flags = (ImGuiInputTextFlags)lua.OptInteger(3, 0);
 
@@ -156,8 +136,6 @@ static partial class ImGuiModule
                 fixed (byte* p = str)
                     s = ImGuiNative.igInputText(label, p, (uint)str.Length, flags, null, null);
 
-                StrFree(label);
-
                 lua.PushBoolean(s != 0);
                 return 2;
             });
@@ -165,7 +143,7 @@ static partial class ImGuiModule
             LuaHelpers.ModuleFunction(lua, "InputTextMultiline", static (nint luaPtr) =>
             {
                 var lua = Lua.FromIntPtr(luaPtr);
-                var label = GetStr(lua, 1);
+                var label = CheckStr(lua, 1);
                 var str = bufferMt.GetRef(lua, 2);
                 var size = new Vector2((float)lua.OptNumber(3, 0), (float)lua.OptNumber(4, 0));
                 var flags = (ImGuiInputTextFlags)lua.OptInteger(5, 0);
@@ -174,8 +152,6 @@ static partial class ImGuiModule
                 fixed (byte* p = str)
                     s = ImGuiNative.igInputTextMultiline(label, p, (uint)str.Length, size, flags, null, null);
 
-                StrFree(label);
-
                 lua.PushBoolean(s != 0);
                 return 2;
             });
@@ -183,8 +159,8 @@ static partial class ImGuiModule
             LuaHelpers.ModuleFunction(lua, "InputTextWithHint", static (nint luaPtr) =>
             {
                 var lua = Lua.FromIntPtr(luaPtr);
-                var label = GetStr(lua, 1);
-                var hint = GetStr(lua, 2);
+                var label = CheckStr(lua, 1);
+                var hint = CheckStr(lua, 2);
                 var str = bufferMt.GetRef(lua, 3);
                 var flags = (ImGuiInputTextFlags)lua.OptInteger(4, 0);
 
@@ -192,9 +168,6 @@ static partial class ImGuiModule
                 fixed (byte* p = str)
                     s = ImGuiNative.igInputTextWithHint(label, hint, p, (uint)str.Length, flags, null, null);
 
-                StrFree(label);
-                StrFree(hint);
-
                 lua.PushBoolean(s != 0);
                 return 2;
             });
@@ -167,7 +167,7 @@ class PaletteRenderer : IDisposable
     {
         var shader = Shaders.PaletteShader;
         Raylib.BeginShaderMode(shader);
-        shader.GlibShader.SetUniform("u_paletteTex", paletteTexture);
+        shader.GlibShader.SetUniform(Glib.ShaderUniform.u_paletteTex, paletteTexture);
     }
 
     public void Dispose()
@@ -353,7 +353,7 @@ class PropRenderer(LevelEditRender renderInfo)
                 // i don't really know how these options work...
                 float highlightThreshold = 0.666f;
                 float shadowThreshold = 0.333f;
-                rctx.Shader.SetUniform("v4_softPropShadeInfo", new Vector4(
+                rctx.Shader.SetUniform(Glib.ShaderUniform.v4_softPropShadeInfo, new Vector4(
                     softProp.ContourExponent,
                     highlightThreshold,
                     shadowThreshold,
@@ -373,30 +373,28 @@ class PropRenderer(LevelEditRender renderInfo)
         // setup shader uniforms
         if (rctx.Shader != Shaders.PropShader.GlibShader)
         {
-            if (rctx.Shader.HasUniform("u_paletteTex"))
-                rctx.Shader.SetUniform("u_paletteTex", renderInfo.Palette.Texture);
-            if (rctx.Shader.HasUniform("v4_textureSize"))
-                rctx.Shader.SetUniform("v4_textureSize", new Vector4(texWidth, texHeight, 0f, 0f));
+            rctx.Shader.SetUniform(Glib.ShaderUniform.u_paletteTex, renderInfo.Palette.Texture);
+            rctx.Shader.SetUniform(Glib.ShaderUniform.v4_textureSize, new Vector4(texWidth, texHeight, 0f, 0f));
             
-            if (rctx.Shader.HasUniform("v4_bevelData"))
+            if (rctx.Shader.HasUniform(Glib.ShaderUniform.v4_bevelData))
             {
-                rctx.Shader.SetUniform("v4_bevelData", new Vector4(prop.PropInit.Bevel, 0f, 0f, 0f));
+                rctx.Shader.SetUniform(Glib.ShaderUniform.v4_bevelData, new Vector4(prop.PropInit.Bevel, 0f, 0f, 0f));
             }
             
-            if (rctx.Shader.HasUniform("v4_lightDirection"))
+            if (rctx.Shader.HasUniform(Glib.ShaderUniform.v4_lightDirection))
             {
                 var level = RainEd.Instance.Level;
                 var correctedAngle = level.LightAngle + MathF.PI / 2f;
                 var lightDist = 1f - level.LightDistance / 10f;
                 var lightZ = lightDist * (3.0f - 0.5f) + 0.5f; // an approximation
-                rctx.Shader.SetUniform("v4_lightDirection", new Vector4(MathF.Cos(correctedAngle), MathF.Sin(correctedAngle), lightZ, 0f));
+                rctx.Shader.SetUniform(Glib.ShaderUniform.v4_lightDirection, new Vector4(MathF.Cos(correctedAngle), MathF.Sin(correctedAngle), lightZ, 0f));
             }
             
-            if (rctx.Shader.HasUniform("v4_propRotation"))
+            if (rctx.Shader.HasUniform(Glib.ShaderUniform.v4_propRotation))
             {
                 var right = Vector2.Normalize(quad[1] - quad[0]);
                 var up = Vector2.Normalize(quad[3] - quad[0]);
-                rctx.Shader.SetUniform("v4_propRotation", new Vector4(right.X, right.Y, up.X, up.Y));
+                rctx.Shader.SetUniform(Glib.ShaderUniform.v4_propRotation, new Vector4(right.X, right.Y, up.X, up.Y));
             }
 
             rctx.DrawBatch(); // force flush batch, as uniform changes aren't detected
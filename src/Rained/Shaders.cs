@@ -65,18 +65,18 @@ static class Shaders
 
     public static void LoadShaders()
     {
-        EffectsMatrixShader = RlManaged.Shader.Load(null, "effect_matrix.frag");
-        BevelTreatmentShader = RlManaged.Shader.Load(null, "bevel.frag");
-        SoftPropShader = RlManaged.Shader.Load(null, "softprop.frag");
-        PropShader = RlManaged.Shader.Load(null, "prop_fade.frag");
-        TileShader = RlManaged.Shader.Load(null, "tile.frag");
-        PaletteShader = RlManaged.Shader.Load(null, "palette.frag");
-        LevelLightShader = RlManaged.Shader.Load(null, "level_light.frag");
-        LightStretchShader = RlManaged.Shader.Load(null, "lightmap_stretch.frag");
-        GridShader = RlManaged.Shader.Load("grid.vert", "grid.frag");
-        RenderPreviewLayerShader = RlManaged.Shader.Load(null, "render_preview.frag");
-        RenderPreviewLightShader = RlManaged.Shader.Load(null, "bitmap_render_preview.frag");
-        UvRepeatShader = RlManaged.Shader.Load(null, "uv_repeat.frag");
-        OutlineMarqueeShader = RlManaged.Shader.Load(null, "outline_marquee.frag");
+        EffectsMatrixShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.EffectMatrixFrag.Name);
+        BevelTreatmentShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.BevelFrag.Name);
+        SoftPropShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.SoftpropFrag.Name);
+        PropShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.PropFadeFrag.Name);
+        TileShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.TileFrag.Name);
+        PaletteShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.PaletteFrag.Name);
+        LevelLightShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.LevelLightFrag.Name);
+        LightStretchShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.LightmapStretchFrag.Name);
+        GridShader = RlManaged.Shader.Load(Glib.ShaderReflection.GridVert.Name, Glib.ShaderReflection.GridFrag.Name);
+        RenderPreviewLayerShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.RenderPreviewFrag.Name);
+        RenderPreviewLightShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.BitmapRenderPreviewFrag.Name);
+        UvRepeatShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.UvRepeatFrag.Name);
+        OutlineMarqueeShader = RlManaged.Shader.Load(null, Glib.ShaderReflection.OutlineMarqueeFrag.Name);
     }
 }
\ No newline at end of file
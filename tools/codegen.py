@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+
+# Runs the code generators of Rained as tasks. Each generator writes a
+# depfile and a stamp file after a successful run (see tools/stamps.py), and
+# a task is only run if its stamps are out of date, so running this when
+# nothing changed only takes a few stat calls. The generators then only
+# redo the work whose inputs changed. Tasks that don't depend on each other
+# are run concurrently.
+#
+# After a complete run, a depfile and a stamp file covering every task are
+# written, so that build.cake can tell whether this needs to run at all
+# without launching Python. The first line of that stamp is the options
+# this was run with, as given on the command line.
+
+import os
+import sys
+import glob
+import shutil
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import stamps
+
+DEP_PATH = 'codegen.d'
+STAMP_PATH = 'codegen.stamp'
+
+SHADER_LANGS = ['gles300', 'gl330']
+REFLECTION_PATH = 'src/Glib/ShaderReflection.gen.cs'
+
+class Task:
+    def __init__(self, name, command, inputs, outputs, stamps, deps=(), requires=()):
+        self.name = name
+
+        # arguments given to the python interpreter
+        self.command = command
+
+        # the files the task needs. if one of them doesn't exist, the task
+        # is skipped.
+        self.inputs = inputs
+
+        # glob patterns of the outputs the build needs. if one of them
+        # matches nothing, a task that can't run is an error rather than
+        # skipped, since there is nothing to fall back to.
+        self.outputs = outputs
+
+        # (depfile, stamp file, options) of each stamp the task writes when
+        # it succeeds. the task is up to date if all of them are.
+        self.stamps = stamps
+
+        # names of the tasks that have to run before this one
+        self.deps = deps
+
+        # executables the task needs. if one of them isn't found, the task
+        # is skipped.
+        self.requires = requires
+
+# the inputs of a task that don't exist
+def missing_inputs(task):
+    return [p for p in task.inputs if not os.path.isfile(p)]
+
+# the output patterns of a task that match no file
+def missing_outputs(task):
+    return [p for p in task.outputs if not glob.glob(p)]
+
+# returns the reason a task is out of date, or None if it is up to date
+def check_task(task):
+    for dep_path, stamp_path, options in task.stamps:
+        reason = stamps.check_stamp(dep_path, stamp_path, options)
+        if reason is not None:
+            return reason
+
+    return None
+
+# write the depfile and the stamp file of a complete run, made of the
+# inputs and outputs listed by the stamps of every task
+def write_stamp(tasks, options, start_time_ns):
+    inputs = set([__file__, stamps.__file__])
+    outputs = set()
+    for task in tasks:
+        for dep_path, stamp_path, _ in task.stamps:
+            inputs.update(stamps.read_depfile(dep_path))
+            outputs.update(stamps.read_stamp_outputs(stamp_path))
+            outputs.update((dep_path, stamp_path))
+
+    stamps.write_stamp(DEP_PATH, STAMP_PATH, options, inputs, outputs, start_time_ns)
+
+def run_task(task):
+    proc = subprocess.run(
+        [sys.executable, *task.command],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+
+    return proc.returncode == 0, proc.stdout
+
+def make_tasks(args):
+    lua_imgui_args = ['tools/lua-imgui-gen.py']
+    if args.instrument:
+        lua_imgui_args.append('--instrument')
+    if args.force:
+        lua_imgui_args.append('--force')
+
+    shader_args = ['tools/shader-preprocessor.py', *SHADER_LANGS, '--reflection', REFLECTION_PATH]
+    if args.minify_shaders:
+        shader_args.append('--minify')
+
+    shader_options = stamps.format_options({ 'minify': args.minify_shaders, 'reflection': REFLECTION_PATH })
+
+    return [
+        Task(
+            'lua-imgui',
+            lua_imgui_args,
+            inputs=[
+                'tools/lua-imgui-gen.py',
+                'src/ImGui.NET/src/CodeGenerator/definitions/cimgui/definitions.json',
+                'src/ImGui.NET/src/CodeGenerator/definitions/cimgui/structs_and_enums.json'
+            ],
+            outputs=[
+                'src/Rained/LuaScripting/Modules/ImGuiModule.gen.cs',
+                'src/Rained/LuaScripting/Modules/ImGuiModule.gen.*.cs',
+                'scripts/definitions/imgui.lua',
+                'scripts/definitions/imgui/*.lua'
+            ],
+            stamps=[(
+                'src/Rained/LuaScripting/Modules/ImGuiModule.gen.d',
+                'src/Rained/LuaScripting/Modules/ImGuiModule.gen.stamp',
+                stamps.format_options({ 'instrument': args.instrument })
+            )]
+        ),
+
+        Task(
+            'shaders',
+            shader_args,
+            inputs=['tools/shader-preprocessor.py'],
+            outputs=[f'glshaders/build/{lang}/ShaderCatalog.gen.cs' for lang in SHADER_LANGS] + [REFLECTION_PATH],
+            stamps=[
+                (f'glshaders/build/{lang}/shaders.d', f'glshaders/build/{lang}/shaders.stamp', shader_options)
+                for lang in SHADER_LANGS
+            ],
+            requires=[os.environ.get('GLSL_VALIDATOR', 'glslangValidator')]
+        )
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the code generators of Rained whose inputs changed since their last run."
+    )
+
+    parser.add_argument('tasks', metavar='TASK', nargs='*', help="the tasks to run, along with the tasks they depend on. defaults to all of them.")
+    parser.add_argument('--check', action='store_true', help="only list the tasks that are out of date, without running anything. exits with 1 if there are any.")
+    parser.add_argument('--force', action='store_true', help="run the tasks even if they are up to date")
+    parser.add_argument('--list', action='store_true', help="list the tasks and exit")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="the number of tasks to run at once. defaults to the number of CPUs.")
+    parser.add_argument('--instrument', action='store_true', help="pass --instrument to lua-imgui-gen.py")
+    parser.add_argument('--minify-shaders', action='store_true', help="pass --minify to shader-preprocessor.py")
+    parser.add_argument('--strict', action='store_true', help="fail instead of skipping a task whose tools or inputs can't be found")
+    args = parser.parse_args()
+
+    # tasks are given relative to the root of the repository
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    start_time_ns = time.time_ns()
+
+    tasks = make_tasks(args)
+    tasks_by_name = { task.name: task for task in tasks }
+
+    if args.list:
+        for task in tasks:
+            print(task.name)
+        return
+
+    # add the dependencies of the given tasks, keeping the order of
+    # registration
+    selected = set()
+    pending_names = list(args.tasks or tasks_by_name)
+    while pending_names:
+        name = pending_names.pop()
+        if not name in tasks_by_name:
+            print(f"codegen.py: error: unknown task {name}")
+            sys.exit(1)
+
+        if not name in selected:
+            selected.add(name)
+            pending_names.extend(tasks_by_name[name].deps)
+
+    tasks = [task for task in tasks if task.name in selected]
+
+    # the stamp is only written for runs of every task. its first line is
+    # the flags that change the outputs, in the order they are declared,
+    # which is what build.cake passes and compares it against.
+    complete = not args.tasks
+    run_options = ' '.join(
+        flag for flag, enabled in (('--instrument', args.instrument), ('--minify-shaders', args.minify_shaders))
+        if enabled
+    )
+
+    stale = []
+    for task in tasks:
+        reason = "forced" if args.force else check_task(task)
+        if reason is not None:
+            stale.append((task, reason))
+
+    if args.check:
+        for task, reason in stale:
+            print(f"{task.name}: out of date ({reason})")
+
+        if not stale:
+            print("codegen: up to date")
+
+        sys.exit(1 if stale else 0)
+
+    if not stale:
+        if complete:
+            write_stamp(tasks, run_options, start_time_ns)
+
+        print("codegen: up to date")
+        return
+
+    success = True
+    finished = set(task.name for task in tasks) - set(task.name for task, _ in stale)
+    failed = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        remaining = list(stale)
+        while remaining:
+            # start every task whose dependencies are done
+            ready = [(task, reason) for task, reason in remaining if all(dep in finished or dep in failed for dep in task.deps)]
+            remaining = [entry for entry in remaining if entry not in ready]
+            futures = []
+
+            if not ready:
+                print(f"codegen.py: error: circular dependency between {', '.join(task.name for task, _ in remaining)}")
+                sys.exit(1)
+
+            for task, reason in ready:
+                if any(dep in failed for dep in task.deps):
+                    print(f"{task.name}: skipped (a dependency failed)")
+                    failed.add(task.name)
+                    continue
+
+                # without a previous run, the outputs that are checked in
+                # may well be up to date. after one, its stamps are left
+                # behind, and the outputs are known not to be. outputs that
+                # don't exist at all can't be used either way.
+                missing = [exe for exe in task.requires if shutil.which(exe) is None] + missing_inputs(task)
+                if missing:
+                    problem = None
+                    absent = missing_outputs(task)
+                    if any(os.path.exists(stamp_path) for _, stamp_path, _ in task.stamps):
+                        problem = f"its outputs are out of date ({reason})"
+                    elif absent:
+                        problem = f"there are no outputs to fall back to ({', '.join(absent)})"
+                    elif args.strict:
+                        problem = "--strict was given"
+
+                    if problem is not None:
+                        print(f"{task.name}: error: could not find {', '.join(missing)}, and {problem}")
+                        failed.add(task.name)
+                        success = False
+                        continue
+
+                    print(f"{task.name}: warning: skipped, could not find {', '.join(missing)}. its outputs may be out of date.")
+                    failed.add(task.name)
+                    continue
+
+                print(f"{task.name}: running ({reason})")
+                futures.append((task, pool.submit(run_task, task)))
+
+            # output is reported in registration order, so that it doesn't
+            # depend on which task finished first
+            for task, future in futures:
+                ok, output = future.result()
+                if output:
+                    print(output, end='' if output.endswith('\n') else '\n')
+
+                if not ok:
+                    print(f"{task.name}: failed")
+                    failed.add(task.name)
+                    success = False
+                    continue
+
+                finished.add(task.name)
+
+    if complete and not failed:
+        write_stamp(tasks, run_options, start_time_ns)
+    else:
+        stamps.remove_stamp(STAMP_PATH)
+
+    if not success:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
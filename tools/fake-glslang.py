@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# Stand-in for glslangValidator, for running the shader preprocessor
+# offline (e.g. in tools/shader-bench.py). It does not actually compile
+# anything, but it follows #line directives and reports an error in
+# glslang's format for every line containing FAKE_ERROR, so that error
+# mapping can still be exercised.
+#
+# The FAKE_GLSLANG_DELAY environment variable can be set to a number of
+# seconds to sleep for each file, to simulate compilation time.
+
+import os
+import re
+import sys
+import time
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("usage: fake-glslang.py [-v] FILE")
+        sys.exit(1)
+
+    if sys.argv[1] == '-v':
+        print("Glslang Version: fake")
+        sys.exit(0)
+
+    delay = float(os.environ.get('FAKE_GLSLANG_DELAY', '0'))
+    if delay > 0:
+        time.sleep(delay)
+
+    file_path = sys.argv[-1]
+    file_id = 0
+    line_num = 0
+    errors = 0
+
+    with open(file_path, 'r') as f:
+        for line in f:
+            re_res = re.match(r'\s*#\s*line\s+(\d+)(?:\s+(\d+))?', line)
+            if re_res:
+                line_num = int(re_res.group(1)) - 1
+                if re_res.group(2) is not None:
+                    file_id = int(re_res.group(2))
+                continue
+
+            line_num += 1
+            if 'FAKE_ERROR' in line:
+                print(f"ERROR: {file_id}:{line_num}: 'FAKE_ERROR' : undeclared identifier")
+                errors += 1
+
+    if errors > 0:
+        print(f"ERROR: {errors} compilation errors.  No code generated.")
+        sys.exit(2)
+
+    print(file_path)
@@ -0,0 +1,128 @@
+// Microbenchmark for the Lua bindings generated by tools/lua-imgui-gen.py.
+// The bindings are generated from the stub definitions in definitions/ and
+// call the stubs in StubBackend.cs instead of cimgui, so this runs headless.
+//
+// usage: dotnet run -c Release --project tools/lua-imgui-bench [items per run] [runs]
+// pass -p:GeneratorArgs=--instrument to measure the instrumented bindings.
+using System.Diagnostics;
+using KeraLua;
+using Rained.LuaScripting.Modules;
+
+int itemCount = args.Length > 0 ? int.Parse(args[0]) : 1_000_000;
+int runCount = args.Length > 1 ? int.Parse(args[1]) : 5;
+
+// (name, lua code run in a loop, items per iteration). the functions and enum
+// values the code uses are looked up into locals before the loop, so that it
+// only measures the calls. the results are per item, which is a call, or a
+// line segment for the draw list scenarios.
+(string name, string code, int items)[] scenarios = [
+    ("no args", "NewLine()", 1),
+    ("string", "Text(\"hello\")", 1),
+    ("string+float*", "v = SliderFloat(\"value\", v, 0.0, 1.0)", 1),
+    ("ImVec2", "Dummy(16.0, 24.0)", 1),
+    ("string+ImVec2 default", "Button(\"button\")", 1),
+    ("bool defaults", "Selectable_Bool(\"item\")", 1),
+    ("enum flags", "IsWindowFocused(ChildWindows)", 1),
+    ("float[4]", "r, g, b, a = ColorEdit4(\"color\", r, g, b, a)", 1),
+    ("AddLine", "for j = 1, 400, 4 do DrawList_AddLine(dl, coords[j], coords[j+1], coords[j+2], coords[j+3], 0xFFFFFFFF) end", 100),
+    ("AddLines", "DrawList_AddLines(dl, coords, 0xFFFFFFFF)", 100),
+    ("AddLines (colors)", "DrawList_AddLines(dl, coords, colors)", 100),
+    ("AddPolyline", "DrawList_AddPolyline(dl, coords, 0xFFFFFFFF, 0, 1.0)", 100),
+];
+
+// lua -> C# transition without any marshalling, for reference
+KeraLua.LuaFunction emptyFunc = static (nint luaPtr) => 0;
+
+using var lua = new Lua();
+
+Console.WriteLine($"{"scenario",-24}{"ns/item",10}{"B/item",10}");
+PrintResult("empty C function", MeasureCalls(lua, "Empty()", itemCount, 1, runCount));
+foreach (var (name, code, items) in scenarios)
+    PrintResult(name, MeasureCalls(lua, code, itemCount / items, items, runCount));
+
+Console.WriteLine();
+MeasureRegistration(runCount);
+
+(double nsPerItem, double bytesPerItem) MeasureCalls(Lua lua, string code, int iterations, int items, int runs)
+{
+    var chunk = $$"""
+        local imgui, Empty, n = ...
+        local NewLine, Text, SliderFloat, Dummy = imgui.NewLine, imgui.Text, imgui.SliderFloat, imgui.Dummy
+        local Button, Selectable_Bool, IsWindowFocused, ColorEdit4 = imgui.Button, imgui.Selectable_Bool, imgui.IsWindowFocused, imgui.ColorEdit4
+        local ChildWindows = imgui.FocusedFlags_ChildWindows
+        local v, r, g, b, a = 0.5, 0.1, 0.2, 0.3, 1.0
+        local DrawList_AddLine, DrawList_AddLines, DrawList_AddPolyline = imgui.DrawList_AddLine, imgui.DrawList_AddLines, imgui.DrawList_AddPolyline
+        local dl, coords, colors = imgui.GetWindowDrawList(), {}, {}
+        for j = 1, 400 do coords[j] = j end
+        for j = 1, 100 do colors[j] = 0xFF000000 + j end
+        for i = 1, n do
+            {{code}}
+        end
+        """;
+
+    double bestNs = double.MaxValue;
+    double bestBytes = double.MaxValue;
+
+    // the first run warms up the JIT and isn't counted
+    for (int run = 0; run <= runs; run++)
+    {
+        if (lua.LoadString(chunk) != LuaStatus.OK)
+            throw new Exception(lua.ToString(-1));
+
+        ImGuiModule.PushBenchModule(lua);
+        lua.PushCFunction(emptyFunc);
+        lua.PushInteger(iterations);
+
+        long startAlloc = GC.GetAllocatedBytesForCurrentThread();
+        long startTicks = Stopwatch.GetTimestamp();
+
+        if (lua.PCall(3, 0, 0) != LuaStatus.OK)
+            throw new Exception(lua.ToString(-1));
+
+        long ticks = Stopwatch.GetTimestamp() - startTicks;
+        long bytes = GC.GetAllocatedBytesForCurrentThread() - startAlloc;
+
+        if (run > 0)
+        {
+            bestNs = Math.Min(bestNs, ticks * 1e9 / Stopwatch.Frequency / ((long)iterations * items));
+            bestBytes = Math.Min(bestBytes, (double)bytes / ((long)iterations * items));
+        }
+    }
+
+    return (bestNs, bestBytes);
+}
+
+void PrintResult(string name, (double nsPerItem, double bytesPerItem) result)
+{
+    Console.WriteLine($"{name,-24}{result.nsPerItem,10:F1}{result.bytesPerItem,10:F2}");
+}
+
+// time to create the module and to install every function into it, in a
+// fresh lua state each time. the first run includes JIT compilation.
+void MeasureRegistration(int runs)
+{
+    var names = ImGuiModule.GeneratedFuncNames;
+
+    for (int run = 0; run <= runs; run++)
+    {
+        using var state = new Lua();
+
+        long startTicks = Stopwatch.GetTimestamp();
+        ImGuiModule.PushBenchModule(state);
+        long moduleTicks = Stopwatch.GetTimestamp() - startTicks;
+
+        startTicks = Stopwatch.GetTimestamp();
+        foreach (var name in names)
+        {
+            state.GetField(-1, name);
+            state.Pop(1);
+        }
+        long installTicks = Stopwatch.GetTimestamp() - startTicks;
+
+        Console.WriteLine(
+            $"registration {(run == 0 ? "(cold)" : $"(run {run})"),-10}" +
+            $"module: {moduleTicks * 1e6 / Stopwatch.Frequency,8:F1} us, " +
+            $"install {names.Length} functions: {installTicks * 1e6 / Stopwatch.Frequency,8:F1} us"
+        );
+    }
+}
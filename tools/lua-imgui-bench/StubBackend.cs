@@ -0,0 +1,82 @@
+using System.Numerics;
+using System.Runtime.CompilerServices;
+using System.Runtime.InteropServices;
+using KeraLua;
+namespace Rained.LuaScripting.Modules;
+
+// stands in for the cimgui half of ImGuiModule. the generated bindings call
+// these stubs instead of cimgui, so the benchmark doesn't need a window, a GPU
+// or an ImGui context, and only measures the cost of the bindings themselves.
+static unsafe partial class ImGuiModule
+{
+    private static nint GetNativeFunc(string name) => name switch
+    {
+        "igNewLine" => (nint)(delegate* unmanaged[Cdecl]<void>)&Stub_igNewLine,
+        "igText" => (nint)(delegate* unmanaged[Cdecl]<byte*, void>)&Stub_igText,
+        "igSliderFloat" => (nint)(delegate* unmanaged[Cdecl]<byte*, float*, float, float, byte*, int, byte>)&Stub_igSliderFloat,
+        "igDummy" => (nint)(delegate* unmanaged[Cdecl]<Vector2, void>)&Stub_igDummy,
+        "igButton" => (nint)(delegate* unmanaged[Cdecl]<byte*, Vector2, byte>)&Stub_igButton,
+        "igSelectable_Bool" => (nint)(delegate* unmanaged[Cdecl]<byte*, byte, int, Vector2, byte>)&Stub_igSelectable_Bool,
+        "igIsWindowFocused" => (nint)(delegate* unmanaged[Cdecl]<int, byte>)&Stub_igIsWindowFocused,
+        "igColorEdit4" => (nint)(delegate* unmanaged[Cdecl]<byte*, float*, int, byte>)&Stub_igColorEdit4,
+        "igGetWindowDrawList" => (nint)(delegate* unmanaged[Cdecl]<void*>)&Stub_igGetWindowDrawList,
+        "igGetFrameCount" => (nint)(delegate* unmanaged[Cdecl]<int>)&Stub_igGetFrameCount,
+        "ImDrawList_AddLine" => (nint)(delegate* unmanaged[Cdecl]<void*, Vector2, Vector2, uint, float, void>)&Stub_ImDrawList_AddLine,
+        "ImDrawList_AddPolyline" => (nint)(delegate* unmanaged[Cdecl]<void*, Vector2*, int, uint, int, float, void>)&Stub_ImDrawList_AddPolyline,
+        _ => throw new ArgumentException($"no stub for {name}", nameof(name))
+    };
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void Stub_igNewLine() {}
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void Stub_igText(byte* fmt) {}
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static byte Stub_igSliderFloat(byte* label, float* v, float vMin, float vMax, byte* format, int flags)
+    {
+        *v = Math.Clamp(*v, vMin, vMax);
+        return 0;
+    }
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void Stub_igDummy(Vector2 size) {}
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static byte Stub_igButton(byte* label, Vector2 size) => 0;
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static byte Stub_igSelectable_Bool(byte* label, byte selected, int flags, Vector2 size) => selected;
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static byte Stub_igIsWindowFocused(int flags) => (byte)(flags & 1);
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static byte Stub_igColorEdit4(byte* label, float* col, int flags) => 0;
+
+    // the draw list stubs never dereference it
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void* Stub_igGetWindowDrawList() => (void*)0x1000;
+
+    // every call happens in the same frame
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static int Stub_igGetFrameCount() => 0;
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void Stub_ImDrawList_AddLine(void* self, Vector2 p1, Vector2 p2, uint col, float thickness) {}
+
+    [UnmanagedCallersOnly(CallConvs = [typeof(CallConvCdecl)])]
+    private static void Stub_ImDrawList_AddPolyline(void* self, Vector2* points, int numPoints, uint col, int flags, float thickness) {}
+
+    public static string[] GeneratedFuncNames => _generatedFuncNames;
+
+    /// <summary>
+    /// Push a module table of the generated bindings, populated on first
+    /// access like the real imgui module.
+    /// </summary>
+    public static void PushBenchModule(Lua lua)
+    {
+        lua.NewTable();
+        InitGeneratedModule(lua);
+    }
+}
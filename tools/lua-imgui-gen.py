@@ -1,5 +1,32 @@
 #!/usr/bin/env python3
+import os
+import sys
 import json
+import glob
+import time
+import argparse
+import itertools
+
+import stamps
+
+DEFINITIONS_DIR = 'src/ImGui.NET/src/CodeGenerator/definitions/cimgui'
+
+# the outputs are split into shards, so that the C# compiler can work on
+# them in parallel, the JIT only compiles the registration code of the shard
+# a function is in, and LuaLS doesn't have to load one huge file.
+CS_OUTPUT_PATH = 'src/Rained/LuaScripting/Modules/ImGuiModule.gen.cs'
+CS_SHARD_PATH = 'src/Rained/LuaScripting/Modules/ImGuiModule.gen.{}.cs'
+CS_FUNCS_PER_SHARD = 64
+
+META_OUTPUT_PATH = 'scripts/definitions/imgui.lua'
+META_SHARD_DIR = 'scripts/definitions/imgui'
+META_FUNCS_PER_SHARD = 100
+
+# the depfile and stamp file of the last run (see tools/stamps.py), so that
+# the outputs aren't rewritten (and the Rained assembly isn't recompiled)
+# when nothing changed.
+DEP_PATH = 'src/Rained/LuaScripting/Modules/ImGuiModule.gen.d'
+STAMP_PATH = 'src/Rained/LuaScripting/Modules/ImGuiModule.gen.stamp'
 
 cs_overrides = {
     'igInputText': """---@param label string
@@ -32,31 +59,728 @@ class MetaParameter:
         self.type = type
         self.name = name
 
+class GeneratedFunc:
+    def __init__(self, name: str, native_name: str, shape: tuple, default_pushes: str):
+        self.name = name
+        self.native_name = native_name
+        self.shape = shape
+        self.default_pushes = default_pushes
+
 def is_lua_keyword(word):
     return word in ["repeat"]
 
-def str_to_utf8_buf(string: str):
-    assert string[0] == "\""
-    assert string[-1] == "\""
+# return type of the C function -> return kind of the trampoline shape
+SHAPE_RETURN_KINDS = {
+    'void': 'void',
+    'bool': 'bool', 'const bool': 'bool',
+    'int': 'int', 'const int': 'int',
+    'unsigned int': 'uint', 'ImU32': 'uint', 'ImGuiID': 'uint',
+    'float': 'float', 'const float': 'float',
+    'double': 'double',
+    'ImDrawList*': 'drawlist'
+}
+
+# type of a C argument -> arg kind of the trampoline shape. enums are passed
+# to imgui as plain ints, and so aren't listed here.
+ARG_KINDS = {
+    'float': 'float', 'const float': 'float', 'float*': 'float*',
+    'double': 'double', 'const double': 'double', 'double*': 'double*',
+    'int': 'int', 'const int': 'int', 'int*': 'int*',
+    'unsigned int': 'uint', 'const unsigned int': 'uint',
+    'ImGuiID': 'uint', 'const ImGuiID': 'uint',
+    'ImU32': 'uint', 'const ImU32': 'uint',
+    'bool': 'bool', 'const bool': 'bool', 'bool*': 'bool*',
+    'ImVec2': 'vec2', 'const ImVec2': 'vec2', 'ImVec2*': 'vec2*',
+    'ImVec4': 'vec4', 'const ImVec4': 'vec4',
+    'float[2]': 'float[2]', 'float[3]': 'float[3]', 'float[4]': 'float[4]',
+    'int[2]': 'int[2]', 'int[3]': 'int[3]', 'int[4]': 'int[4]',
+    'const char*': 'str',
+    'ImDrawList*': 'drawlist',
+    # always followed by the number of points, which it's passed along with
+    'const ImVec2*': 'points'
+}
 
-    buf = string[1:-1].encode("utf-8")
-    out = []
-    for byte in buf:
-        out.append(str(byte))
-    out.append("0")
+# scalar kind -> (C# type, lua type, read, optional read with the default in
+# upvalue {u}, nullable pointer read, push). {p} is the index of the argument
+# and {v} the value to push.
+SCALAR_KINDS = {
+    'float': (
+        'float', 'number',
+        "(float)lua.CheckNumber({p})", "(float)lua.OptNumber({p}, lua.ToNumber({u}))", "(float)lua.OptNumber({p}, 0)",
+        "lua.PushNumber((double){v});\n"
+    ),
+    'double': (
+        'double', 'number',
+        "lua.CheckNumber({p})", "lua.OptNumber({p}, lua.ToNumber({u}))", "lua.OptNumber({p}, 0)",
+        "lua.PushNumber({v});\n"
+    ),
+    'int': (
+        'int', 'integer',
+        "(int)lua.CheckInteger({p})", "(int)lua.OptInteger({p}, lua.ToInteger({u}))", "(int)lua.OptInteger({p}, 0)",
+        "lua.PushInteger({v});\n"
+    ),
+    'uint': (
+        'uint', 'integer',
+        "(uint)lua.CheckInteger({p})", "(uint)lua.OptInteger({p}, lua.ToInteger({u}))", "(uint)lua.OptInteger({p}, 0)",
+        "lua.PushInteger({v});\n"
+    ),
+    'bool': (
+        'byte', 'boolean',
+        "lua.ToBoolean({p}) ? (byte)1 : (byte)0", "(lua.IsNoneOrNil({p}) ? lua.ToBoolean({u}) : lua.ToBoolean({p})) ? (byte)1 : (byte)0", "lua.ToBoolean({p}) ? (byte)1 : (byte)0",
+        "lua.PushBoolean({v} != 0);\n"
+    ),
+    # draw lists are passed to lua as userdata with the imgui.DrawList
+    # metatable, so that scripts can't pass arbitrary pointers. they never
+    # have a default value other than NULL.
+    'drawlist': (
+        'void*', 'imgui.DrawList',
+        "CheckDrawList(lua, {p})", None, "OptDrawList(lua, {p})",
+        "PushDrawList(lua, {v});\n"
+    )
+}
 
-    return "[" + ', '.join(out) + "]"
+# vector kind -> (C# type, components). each component is a separate number
+# argument and return value.
+VECTOR_KINDS = {
+    'vec2': ('Vector2', ('X', 'Y')),
+    'vec4': ('Vector4', ('X', 'Y', 'Z', 'W'))
+}
 
-def main():
-    with open('src/ImGui.NET/src/CodeGenerator/definitions/cimgui/definitions.json') as f:
-        json_funcs = json.load(f)
+# names of the lua arguments and return values of each component of vectors
+# and arrays
+COMPONENT_SUFFIXES = ('_x', '_y', '_z', '_w')
+
+# split an arg kind into (base kind, is pointer, array length, optional).
+# optional is None, '?' for a default value or '?null' for a null pointer.
+def parse_arg_kind(kind: str):
+    optional = None
+    if kind.endswith('?null'):
+        kind, optional = kind[:-5], '?null'
+    elif kind.endswith('?'):
+        kind, optional = kind[:-1], '?'
+
+    array_len = 0
+    if kind.endswith(']'):
+        kind, array_len = kind[:-1].split('[')
+        array_len = int(array_len)
+
+    is_pointer = kind.endswith('*')
+    return kind.rstrip('*'), is_pointer, array_len, optional
+
+# the number of lua arguments an arg kind reads
+def arg_kind_components(kind: str):
+    base, _, array_len, _ = parse_arg_kind(kind)
+    if base in VECTOR_KINDS:
+        return len(VECTOR_KINDS[base][1])
+
+    return array_len or 1
+
+# arg kind -> (base kind, is pointer, array length, lua type, component count)
+# of each kind in ARG_KINDS, so that they don't have to be parsed for every
+# argument of every function.
+def describe_arg_kind(kind: str):
+    base, is_pointer, array_len, _ = parse_arg_kind(kind)
+    if base in VECTOR_KINDS or array_len:
+        lua_type = 'integer' if base == 'int' else 'number'
+    elif base == 'str':
+        lua_type = 'string'
+    elif base == 'points':
+        lua_type = 'number[]'
+    else:
+        lua_type = SCALAR_KINDS[base][1]
+
+    return base, is_pointer, array_len, lua_type, arg_kind_components(kind)
+
+ARG_KIND_INFO = { kind: describe_arg_kind(kind) for kind in set(ARG_KINDS.values()) }
+
+# functions are grouped by the shape of their arguments and return value,
+# which is a tuple of (arg kinds, return kind). each shape gets a single
+# trampoline that reads the arguments from the lua stack and calls the cimgui
+# function in upvalue 1, with default values of optional arguments in the
+# following upvalues. returns the body of the trampoline, and its upvalue count.
+#
+# arg kinds ending with @ make up the items of a batch (see
+# BATCHED_DRAW_FUNCS). the trampoline then calls the function once for each
+# item, with the vector and float arguments read from a single flat array of
+# numbers, and the uint argument (the color) read either from an integer or
+# from an array of one integer per item.
+#
+# if instrument is true, the trampoline also records the calls, time and
+# allocations of each function, identified by the index in its last upvalue,
+# which isn't included in the returned upvalue count.
+def generate_trampoline(shape, instrument=False):
+    arg_kinds, ret_kind = shape
+
+    body = ["var lua = Lua.FromIntPtr(luaPtr);\n"]
+    native_types = []
+    call_args = []
+    extra_pushes = []
+
+    param_idx = 1
+    upvalue_idx = 2
+
+    # lua argument holding the array of item numbers, the number of numbers
+    # per item, and (local name, base kind, offset) of each batched argument
+    batch_param = None
+    batch_stride = 0
+    batch_args = []
+    item_body = []
+
+    for local_idx, kind in enumerate(arg_kinds):
+        local_name = "l" + str(local_idx)
+        upvalue = f"Lua.UpValueIndex({upvalue_idx})"
+
+        if kind.endswith('@'):
+            base = kind[:-1]
+            if base == 'uint':
+                body.append(f"bool {local_name}Each = lua.IsTable({param_idx});\n")
+                body.append(f"uint {local_name} = {local_name}Each ? 0 : (uint)lua.CheckInteger({param_idx});\n")
+                item_body.append(f"if ({local_name}Each) {local_name} = (uint)RawGetInteger(lua, {param_idx}, i + 1);\n")
+                param_idx += 1
+            else:
+                if batch_param is None:
+                    batch_param = param_idx
+                    body.append(f"lua.CheckType({batch_param}, LuaType.Table);\n")
+                    param_idx += 1
+
+                batch_args.append((local_name, base, batch_stride))
+                batch_stride += arg_kind_components(base)
+
+            native_types.append(VECTOR_KINDS[base][0] if base in VECTOR_KINDS else SCALAR_KINDS[base][0])
+            call_args.append(local_name)
+            continue
+
+        base, is_pointer, array_len, optional = parse_arg_kind(kind)
+
+        if base == 'str':
+            # strings are borrowed from the lua stack, or from an upvalue for
+            # default values
+            if optional == '?null':
+                body.append(f"byte* {local_name} = OptStr(lua, {param_idx});\n")
+            elif optional == '?':
+                body.append(f"byte* {local_name} = OptStr(lua, {param_idx}, {upvalue});\n")
+                upvalue_idx += 1
+            else:
+                body.append(f"byte* {local_name} = CheckStr(lua, {param_idx});\n")
+
+            native_types.append("byte*")
+            call_args.append(local_name)
+
+        elif base == 'points':
+            # the coordinates are read from a flat array into a buffer that is
+            # reused between calls, and passed to imgui along with their count
+            body.append(f"Vector2* {local_name} = ReadPoints(lua, {param_idx}, out int {local_name}Count);\n")
+            native_types.append("Vector2*")
+            native_types.append("int")
+            call_args.append(local_name)
+            call_args.append(local_name + "Count")
+
+        elif base in VECTOR_KINDS:
+            cs_type, components = VECTOR_KINDS[base]
+            read_func = "Read" + cs_type.replace("Vector", "Vec")
+            params = ', '.join(str(param_idx + i) for i in range(len(components)))
+
+            if optional == '?':
+                upvalues = ', '.join(f"Lua.UpValueIndex({upvalue_idx + i})" for i in range(len(components)))
+                body.append(f"{cs_type} {local_name} = {read_func}(lua, {params}, {read_func}(lua, {upvalues}));\n")
+                upvalue_idx += len(components)
+            else:
+                body.append(f"{cs_type} {local_name} = {read_func}(lua, {params});\n")
+
+            if is_pointer:
+                native_types.append(cs_type + "*")
+                call_args.append("&" + local_name)
+                for c in components:
+                    extra_pushes.append(f"lua.PushNumber((double){local_name}.{c});\n")
+            else:
+                native_types.append(cs_type)
+                call_args.append(local_name)
+
+        elif array_len:
+            # arrays are passed to imgui in a stack-allocated buffer, and
+            # each element is returned after the call
+            cs_type, _, read, _, _, push = SCALAR_KINDS[base]
+            body.append(f"{cs_type}* {local_name} = stackalloc {cs_type}[{array_len}];\n")
+            for i in range(array_len):
+                body.append(f"{local_name}[{i}] = {read.format(p=param_idx + i)};\n")
+                extra_pushes.append(push.format(v=f"{local_name}[{i}]"))
+
+            native_types.append(cs_type + "*")
+            call_args.append(local_name)
+
+        else:
+            cs_type, _, read, read_opt, read_nullable, push = SCALAR_KINDS[base]
+            if optional == '?null':
+                body.append(f"{cs_type} {local_name} = {read_nullable.format(p=param_idx)};\n")
+            elif optional == '?':
+                body.append(f"{cs_type} {local_name} = {read_opt.format(p=param_idx, u=upvalue)};\n")
+                upvalue_idx += 1
+            else:
+                body.append(f"{cs_type} {local_name} = {read.format(p=param_idx)};\n")
+
+            if is_pointer:
+                native_types.append(cs_type + "*")
+                if optional == '?null':
+                    call_args.append(f"(lua.IsNoneOrNil({param_idx}) ? null : &{local_name})")
+                else:
+                    call_args.append("&" + local_name)
+                extra_pushes.append(push.format(v=local_name))
+            else:
+                native_types.append(cs_type)
+                call_args.append(local_name)
+
+        param_idx += arg_kind_components(kind)
+
+    if ret_kind == 'void':
+        native_types.append("void")
+    else:
+        native_types.append(SCALAR_KINDS[ret_kind][0])
+    body.append(f"var fn = (delegate* unmanaged[Cdecl]<{', '.join(native_types)}>)lua.ToUserData(Lua.UpValueIndex(1));\n")
+
+    return_count = 0
+    if batch_param is not None:
+        # the numbers of an item are pushed at once, and read relative to the
+        # top of the stack
+        body.append(f"long count = (long)lua.RawLen({batch_param}) / {batch_stride};\n")
+        body.append("for (long i = 0; i < count; i++)\n{\n")
+        body.append(f"    for (int j = 1; j <= {batch_stride}; j++)\n")
+        body.append(f"        lua.RawGetInteger({batch_param}, i * {batch_stride} + j);\n")
+        for local_name, base, offset in batch_args:
+            reads = [f"(float)lua.ToNumber({offset + i - batch_stride})" for i in range(arg_kind_components(base))]
+            if base in VECTOR_KINDS:
+                cs_type = VECTOR_KINDS[base][0]
+                body.append(f"    {cs_type} {local_name} = new {cs_type}({', '.join(reads)});\n")
+            else:
+                body.append(f"    float {local_name} = {reads[0]};\n")
+        body.append(f"    lua.Pop({batch_stride});\n")
+        for l in item_body:
+            body.append("    " + l)
+        body.append(f"    fn({', '.join(call_args)});\n")
+        body.append("}\n")
+    elif ret_kind == 'void':
+        body.append(f"fn({', '.join(call_args)});\n")
+    else:
+        body.append(f"var ret = fn({', '.join(call_args)});\n")
+        body.append(SCALAR_KINDS[ret_kind][5].format(v="ret"))
+        return_count += 1
+
+    for v in extra_pushes:
+        return_count += 1
+        body.append(v)
+
+    if instrument:
+        body.insert(1, "long startTicks = System.Diagnostics.Stopwatch.GetTimestamp();\n")
+        body.insert(2, "long startAlloc = GC.GetAllocatedBytesForCurrentThread();\n")
+        body.append(f"RecordCall((int)lua.ToInteger(Lua.UpValueIndex({upvalue_idx})), startTicks, startAlloc);\n")
+
+    body.append("return " + str(return_count) + ";\n")
+    return ''.join(body), upvalue_idx - 1
+
+CS_HEADER = """using System.Numerics;
+using KeraLua;
+namespace Rained.LuaScripting.Modules;
+                 
+static partial class ImGuiModule
+{
+"""
+
+# the items of an array initializer, as many on each line as fit in the
+# given width
+def format_cs_array_items(items, indent="        ", width=100):
+    lines = []
+    line = indent
+    for item in items:
+        if len(line) + len(item) + 2 > width and line != indent:
+            lines.append(line.rstrip() + "\n")
+            line = indent
+
+        line += item + ", "
+
+    if line != indent:
+        lines.append(line.rstrip() + "\n")
+
+    return ''.join(lines)
+
+# the module table is populated lazily by an __index metamethod (see
+# ImGuiModule.cs), so the functions and enum constants are emitted as tables
+# sorted by name for it to binary search, instead of being registered upfront.
+# returns a dict of output path -> contents.
+def generate_cs_sources(cs_funcs, cs_enums, instrument=False):
+    cs_funcs = sorted(cs_funcs, key=lambda f: f.name)
+
+    shapes = sorted(set(f.shape for f in cs_funcs))
+    shape_indices = { shape: i for i, shape in enumerate(shapes) }
+    trampolines = [generate_trampoline(shape, instrument) for shape in shapes]
+
+    shard_count = max(1, (len(cs_funcs) + CS_FUNCS_PER_SHARD - 1) // CS_FUNCS_PER_SHARD)
+    cs_sources = {}
+
+    cs_source = [CS_HEADER]
+    cs_source.append("    private static readonly string[] _generatedFuncNames = [\n")
+    for func in cs_funcs:
+        cs_source.append(f"        \"{func.name}\",\n")
+    cs_source.append("    ];\n\n")
+
+    # each shard registers a contiguous range of functions
+    cs_source.append("    private static void PushGeneratedFunc(Lua lua, int index)\n    {\n")
+    cs_source.append(f"        switch (index / {CS_FUNCS_PER_SHARD})\n        {{\n")
+    for shard in range(shard_count):
+        cs_source.append(f"            case {shard}:\n")
+        cs_source.append(f"                PushGeneratedFunc{shard}(lua, index);\n")
+        cs_source.append("                break;\n")
+    cs_source.append("            default:\n                throw new ArgumentOutOfRangeException(nameof(index));\n        }\n    }\n\n")
+
+    # delegates passed to lua have to be kept alive by the C# side
+    cs_source.append("    private static readonly KeraLua.LuaFunction[] _trampolines = [\n")
+    for i in range(len(shapes)):
+        cs_source.append(f"        Trampoline{i},\n")
+    cs_source.append("    ];\n\n")
+
+    # the constants of each enum type are contiguous, so that installing an
+    # enum type only has to loop over its own range. _generatedEnumOrder is the
+    # index of each constant in order of name, for the binary search.
+    enum_names = [name for group in cs_enums for name, _ in group]
+    enum_values = [value for group in cs_enums for _, value in group]
+    enum_order = sorted(range(len(enum_names)), key=lambda i: enum_names[i])
+    enum_starts = list(itertools.accumulate((len(group) for group in cs_enums), initial=0))
+    enum_value_type = 'int' if all(-2**31 <= v < 2**31 for v in enum_values) else 'long'
+
+    cs_source.append("    private static readonly string[] _generatedEnumNames = [\n")
+    cs_source.append(format_cs_array_items(f"\"{name}\"" for name in enum_names))
+    cs_source.append("    ];\n\n")
+
+    cs_source.append(f"    private static readonly {enum_value_type}[] _generatedEnumValues = [\n")
+    cs_source.append(format_cs_array_items(str(value) for value in enum_values))
+    cs_source.append("    ];\n\n")
+
+    cs_source.append("    private static readonly int[] _generatedEnumOrder = [\n")
+    cs_source.append(format_cs_array_items(str(i) for i in enum_order))
+    cs_source.append("    ];\n\n")
+
+    cs_source.append("    private static readonly int[] _generatedEnumGroupStarts = [\n")
+    cs_source.append(format_cs_array_items(str(i) for i in enum_starts))
+    cs_source.append("    ];\n")
+
+    # the stats functions are only registered when there are stats to read
+    if instrument:
+        cs_source.append("\n    static partial void InstallInstrumentation(Lua lua) => InstallStatsFunctions(lua);\n")
+    cs_source.append("}\n")
+    cs_sources[CS_OUTPUT_PATH] = ''.join(cs_source)
+
+    for shard in range(shard_count):
+        first = shard * CS_FUNCS_PER_SHARD
+        shard_funcs = cs_funcs[first:first + CS_FUNCS_PER_SHARD]
+
+        cs_source = [CS_HEADER]
+        cs_source.append(f"    private static void PushGeneratedFunc{shard}(Lua lua, int index)\n    {{\n        switch (index)\n        {{\n")
+        for i, func in enumerate(shard_funcs, first):
+            shape_idx = shape_indices[func.shape]
+            cs_source.append(f"            case {i}:\n")
+            cs_source.append(f"                lua.PushLightUserData(GetNativeFunc(\"{func.native_name}\"));\n")
+            for l in func.default_pushes.splitlines():
+                cs_source.append("                ")
+                cs_source.append(l)
+                cs_source.append("\n")
+            upvalue_count = trampolines[shape_idx][1]
+            if instrument:
+                cs_source.append(f"                lua.PushInteger({i});\n")
+                upvalue_count += 1
+            cs_source.append(f"                lua.PushCClosure(_trampolines[{shape_idx}], {upvalue_count});\n")
+            cs_source.append("                break;\n")
+        cs_source.append("            default:\n                throw new ArgumentOutOfRangeException(nameof(index));\n        }\n    }\n")
+
+        # the trampolines are spread evenly over the shards
+        for i, (shape, (body, _)) in enumerate(zip(shapes, trampolines)):
+            if i % shard_count != shard:
+                continue
+
+            arg_kinds, ret_kind = shape
+            cs_source.append(f"\n    // ({', '.join(arg_kinds)}) -> {ret_kind}\n")
+            cs_source.append(f"    private static unsafe int Trampoline{i}(nint luaPtr)\n    {{\n")
+            for l in body.splitlines():
+                cs_source.append("        ")
+                cs_source.append(l)
+                cs_source.append("\n")
+            cs_source.append("    }\n")
+
+        cs_source.append("}\n")
+        cs_sources[CS_SHARD_PATH.format(shard)] = ''.join(cs_source)
+
+    return cs_sources
+
+META_SHARD_HEADER = """---@meta
+---@class imgui
+local imgui = {}
+
+"""
+
+# the definitions of the functions are split into shards in the order of
+# definitions.json, which keeps related functions together. returns a dict
+# of output path -> contents.
+def generate_meta_sources(meta_header, meta_funcs, meta_enums):
+    meta_sources = {
+        META_OUTPUT_PATH: meta_header + "return imgui\n"
+    }
+
+    for shard, first in enumerate(range(0, len(meta_funcs), META_FUNCS_PER_SHARD)):
+        shard_funcs = meta_funcs[first:first + META_FUNCS_PER_SHARD]
+        meta_sources[os.path.join(META_SHARD_DIR, f"functions_{shard}.lua")] = META_SHARD_HEADER + ''.join(shard_funcs)
+
+    meta_sources[os.path.join(META_SHARD_DIR, "enums.lua")] = META_SHARD_HEADER + ''.join(meta_enums)
+    return meta_sources
+
+# ImDrawList functions that get a batched form, and the name of it. the
+# arguments before the color are read for each item from a flat array of
+# numbers, so that a script can draw many primitives with a single call.
+# imgui has no functions drawing more than one primitive, so the batched form
+# still calls the function once for each item, but those calls don't go
+# through lua.
+BATCHED_DRAW_FUNCS = {
+    'ImDrawList_AddLine': 'DrawList_AddLines',
+    'ImDrawList_AddRect': 'DrawList_AddRects',
+    'ImDrawList_AddRectFilled': 'DrawList_AddRectsFilled',
+    'ImDrawList_AddQuad': 'DrawList_AddQuads',
+    'ImDrawList_AddQuadFilled': 'DrawList_AddQuadsFilled',
+    'ImDrawList_AddTriangle': 'DrawList_AddTriangles',
+    'ImDrawList_AddTriangleFilled': 'DrawList_AddTrianglesFilled',
+    'ImDrawList_AddCircle': 'DrawList_AddCircles',
+    'ImDrawList_AddCircleFilled': 'DrawList_AddCirclesFilled',
+    'ImDrawList_AddNgon': 'DrawList_AddNgons',
+    'ImDrawList_AddNgonFilled': 'DrawList_AddNgonsFilled',
+}
 
-    with open('src/ImGui.NET/src/CodeGenerator/definitions/cimgui/structs_and_enums.json') as f:
-        json_defs = json.load(f)
+# methods of ImDrawList that get a binding. only the drawing primitives are
+# exposed: the others either return memory nobody would free (CloneOutput),
+# or crash imgui when their calls aren't balanced (Prim*, Channels*, and the
+# clip rect and texture stacks).
+DRAW_LIST_FUNCS = {
+    'ImDrawList_AddLine',
+    'ImDrawList_AddRect',
+    'ImDrawList_AddRectFilled',
+    'ImDrawList_AddRectFilledMultiColor',
+    'ImDrawList_AddQuad',
+    'ImDrawList_AddQuadFilled',
+    'ImDrawList_AddTriangle',
+    'ImDrawList_AddTriangleFilled',
+    'ImDrawList_AddCircle',
+    'ImDrawList_AddCircleFilled',
+    'ImDrawList_AddNgon',
+    'ImDrawList_AddNgonFilled',
+    'ImDrawList_AddEllipse',
+    'ImDrawList_AddEllipseFilled',
+    'ImDrawList_AddText_Vec2',
+    'ImDrawList_AddPolyline',
+    'ImDrawList_AddConvexPolyFilled',
+    'ImDrawList_AddBezierCubic',
+    'ImDrawList_AddBezierQuadratic',
+}
+
+# whether an overload of definitions.json gets a binding. besides the ImGui
+# functions, the drawing methods of ImDrawList are generated as DrawList_*
+# functions taking the draw list as their first argument.
+def is_generated_func(ovr_def):
+    func_name = ovr_def['ov_cimguiname']
+    if 'imgui_internal' in ovr_def['location']:
+        return False
+
+    if func_name[:2] == 'ig':
+        return True
+
+    return func_name in DRAW_LIST_FUNCS
+
+def format_meta_func(name, meta_params, meta_returns, description=None):
+    for p in meta_params:
+        if is_lua_keyword(p.name):
+            p.name = p.name + "_"
+
+    meta_source = []
+    if description:
+        meta_source.append(f"---{description}\n")
+
+    for p in meta_params:
+        meta_source.append(f"---@param {p.name} {p.type}\n")
+
+    if meta_returns:
+        meta_return_strs = []
+        for ret in meta_returns:
+            if is_lua_keyword(ret.name):
+                ret.name = ret.name + "_"
+
+            if ret.name:
+                meta_return_strs.append(f"{ret.type} {ret.name}")
+            else:
+                meta_return_strs.append(ret.type)
+        meta_source.append(f"---@return {', '.join(meta_return_strs)}\n")
+
+    meta_source.append(f"function imgui.{name}({', '.join(p.name for p in meta_params)}) end\n\n")
+    return ''.join(meta_source)
+
+# the batched form of a function with the given arg kinds, and the lua
+# parameters of each argument. returns (GeneratedFunc, definition), or None if
+# the arguments can't be batched.
+def generate_batched_func(func, batched_name, arg_params):
+    arg_kinds, ret_kind = func.shape
+    if ret_kind != 'void' or arg_kinds[0] != 'drawlist' or 'uint' not in arg_kinds:
+        return None
+
+    # the draw list, the batched arguments, the color, and the arguments
+    # shared by every item
+    color_idx = arg_kinds.index('uint')
+    item_kinds = arg_kinds[1:color_idx]
+    if not item_kinds or any(kind != 'float' and kind != 'vec2' for kind in item_kinds):
+        return None
+
+    batched_kinds = (arg_kinds[0],) + tuple(kind + '@' for kind in item_kinds) + ('uint@',) + arg_kinds[color_idx + 1:]
+    cs_func = GeneratedFunc(batched_name, func.native_name, (batched_kinds, ret_kind), func.default_pushes)
+
+    item_names = [p.name for params in arg_params[1:color_idx] for p in params]
+    meta_params = list(arg_params[0])
+    meta_params.append(MetaParameter('number[]', 'coords'))
+    meta_params.append(MetaParameter('integer|integer[]', arg_params[color_idx][0].name))
+    meta_params.extend(p for params in arg_params[color_idx + 1:] for p in params)
+
+    description = (
+        f"Batched form of {func.name}. `coords` holds {', '.join(item_names)} of each item, and "
+        f"`{arg_params[color_idx][0].name}` is either the color of every item or an array of the color of each."
+    )
+    return cs_func, format_meta_func(batched_name, meta_params, [], description)
+
+# generate a single overload. returns (GeneratedFuncs, definitions, messages),
+# which are empty if the overload isn't supported. an overload can have more
+# than one GeneratedFunc if it has a batched form.
+def generate_func(ovr_def, type_kinds):
+    func_name = ovr_def['ov_cimguiname']
+    out_func_name = func_name[2:]
+    messages = []
+
+    if func_name in cs_overrides:
+        return [], [cs_overrides[func_name] + '\n'], messages
+
+    success = True
+    arg_kinds = []
+    default_pushes = []
+    meta_returns = []
+    defaults = ovr_def['defaults']
+
+    # the lua parameters of each argument
+    arg_params = []
+
+    args = ovr_def['argsT']
+    arg_idx = 0
+    while arg_idx < len(args):
+        arg = args[arg_idx]
+        arg_idx += 1
+        arg_name = arg['name']
+        arg_type = arg['type']
+
+        if arg_type == '...':
+            continue
+
+        default_value: str = None
+        if arg_name in defaults:
+            default_value = defaults[arg_name]
+
+            if default_value == "NULL":
+                default_value = "null"
+            else:
+                default_value = default_value.replace("FLT_MIN", "float.MinValue")
+                default_value = default_value.replace("FLT_MAX", "float.MaxValue")
+
+        kind = type_kinds.get(arg_type)
+        if kind is None:
+            messages.append(out_func_name + ": " + "unsupported arg type: " + arg_type + " (skipped)")
+            success = False
+            continue
+
+        base, is_pointer, array_len, lua_type, component_count = ARG_KIND_INFO[kind]
+
+        # the count of points is taken from the length of the array
+        if base == 'points':
+            if arg_idx == len(args) or args[arg_idx]['type'] != 'int' or default_value:
+                messages.append(out_func_name + ": " + "points without a count: " + arg_name + " (skipped)")
+                success = False
+                continue
+
+            arg_idx += 1
+
+        if base in VECTOR_KINDS or array_len:
+            lua_names = [arg_name + suffix for suffix in COMPONENT_SUFFIXES[:component_count]]
+        else:
+            lua_names = [arg_name]
+
+        # default values are passed to the trampoline as upvalues, so that
+        # functions only differing in their defaults share a trampoline.
+        if default_value == "null" and (is_pointer or base == 'str' or base == 'drawlist'):
+            kind += '?null'
+        elif default_value and array_len:
+            messages.append(out_func_name + ": " + "default value of array arg " + arg_name + " (skipped)")
+            success = False
+            continue
+        elif default_value:
+            kind += '?'
+            if base in VECTOR_KINDS:
+                cs_type = VECTOR_KINDS[base][0]
+                default_value = default_value.replace('ImVec', 'new Vector')
+                default_pushes.append(f"Push{cs_type.replace('Vector', 'Vec')}(lua, {default_value});\n")
+            elif base == 'str':
+                # C and C# share the escape sequences used in the definitions
+                default_pushes.append(f"lua.PushString({default_value});\n")
+            elif lua_type == 'number':
+                default_pushes.append(f"lua.PushNumber({default_value});\n")
+            elif lua_type == 'integer':
+                default_pushes.append(f"lua.PushInteger({default_value});\n")
+            else:
+                default_pushes.append(f"lua.PushBoolean({default_value});\n")
+
+        arg_kinds.append(kind)
+        param_type = lua_type + "?" if default_value else lua_type
+        arg_params.append([MetaParameter(param_type, name) for name in lua_names])
+
+        # pointers and arrays are written to by imgui, and returned after the call
+        if is_pointer or array_len:
+            for name in lua_names:
+                meta_returns.append(MetaParameter(lua_type, name))
+
+    ret_kind = SHAPE_RETURN_KINDS.get(ovr_def['ret'])
+    if ret_kind is None:
+        messages.append("unsupported return type: " + ovr_def['ret'] + " (ignored)")
+        success = False
+    elif ret_kind == 'bool' or ret_kind == 'int' or ret_kind == 'uint':
+        meta_returns.insert(0, MetaParameter(SCALAR_KINDS[ret_kind][1], 's'))
+    elif ret_kind == 'float' or ret_kind == 'double':
+        meta_returns.insert(0, MetaParameter('number', 'num'))
+    elif ret_kind == 'drawlist':
+        meta_returns.insert(0, MetaParameter(SCALAR_KINDS[ret_kind][1], 'draw_list'))
+
+    if not success:
+        return [], [], messages
+
+    cs_func = GeneratedFunc(out_func_name, func_name, (tuple(arg_kinds), ret_kind), ''.join(default_pushes))
+    meta_params = [p for params in arg_params for p in params]
+    cs_funcs = [cs_func]
+    meta_sources = [format_meta_func(out_func_name, meta_params, meta_returns)]
+
+    if func_name in BATCHED_DRAW_FUNCS:
+        batched = generate_batched_func(cs_func, BATCHED_DRAW_FUNCS[func_name], arg_params)
+        if batched is None:
+            messages.append(out_func_name + ": " + "arguments can't be batched (batched form skipped)")
+        else:
+            cs_funcs.append(batched[0])
+            meta_sources.append(batched[1])
+
+    return cs_funcs, meta_sources, messages
+
+# generate the outputs from the contents of definitions.json and
+# structs_and_enums.json. returns a dict of output path -> contents.
+def generate(definitions_data: bytes, structs_and_enums_data: bytes, instrument=False):
+    json_funcs = json.loads(definitions_data)
+    json_defs = json.loads(structs_and_enums_data)
 
     enums_json = json_defs['enums']
 
-    meta_source = ["""---@meta\nlocal imgui = {}
+    meta_header = """---@meta
+---@class imgui
+local imgui = {}
 
 ---@class imgui.Buffer
 ---@field capacity integer The maximum capacity of the buffer
@@ -74,292 +798,152 @@ function Buffer:set(str) end
 ---@return imgui.Buffer buffer
 function imgui.newBuffer(capacity) end
 
-"""]
+---A draw list, as returned by imgui.GetWindowDrawList. The functions drawing
+---into it are named DrawList_*, and take it as their first argument. It can
+---only be used during the frame it was gotten in.
+---@class imgui.DrawList
 
-    cs_source = ["""using System.Numerics;
-using ImGuiNET;
-using KeraLua;
-namespace Rained.LuaScripting.Modules;
-                 
-static partial class ImGuiModule
-{
-    private static unsafe void GeneratedFuncs(Lua lua)
-    {
-"""]
-
-    for func_def_k in json_funcs:
-        func_def = json_funcs[func_def_k]
-        for ovr_def in func_def:
-            func_name = ovr_def['ov_cimguiname']
-            if func_name[:2] == 'ig' and not ('imgui_internal' in ovr_def['location']):
-                out_func_name = func_name[2:]
-                success = True
-
-                if func_name in cs_overrides:
-                    meta_source.append(cs_overrides[func_name])
-                    meta_source.append('\n')
-                else:
-                    func_def = []
-                    func_def.append("var lua = Lua.FromIntPtr(luaPtr);\n")
-
-                    local_idx = 0
-                    param_idx = 1
-                    str_bufs = []
-                    func_parameters = []
-                    extra_pushes = []
-                    meta_params = []
-                    meta_returns = []
-
-                    for arg in ovr_def['argsT']:
-                        arg_name = arg['name']
-
-                        default_value: str = None
-                        if arg['name'] in ovr_def['defaults']:
-                            default_value = ovr_def['defaults'][arg['name']]
-                            
-                            if default_value == "NULL":
-                                default_value = "null"
-                            else:
-                                default_value = default_value.replace("FLT_MIN", "float.MinValue")
-                                default_value = default_value.replace("FLT_MAX", "float.MaxValue")
-
-                        local_name = "l"+str(local_idx)
-                        
-                        if arg['type'] == 'float' or arg['type'] == 'const float':
-                            func_parameters.append(local_name)
-                            func_def.append(f"float {local_name} = ")
-
-                            if default_value:
-                                func_def.append("(float)lua.OptNumber(" + str(param_idx) + ", " + default_value + ");\n")
-                                meta_params.append(MetaParameter("number?", arg_name))
-                            else:
-                                func_def.append(f"(float)lua.CheckNumber({param_idx});\n")
-                                meta_params.append(MetaParameter("number", arg_name))
-                            
-                            param_idx = param_idx + 1
-
-                        elif arg['type'] == 'float*':
-                            func_parameters.append("&" + local_name)
-                            func_def.append(f"float {local_name} = ")
-
-                            if default_value:
-                                func_def.append("(float)lua.OptNumber(" + str(param_idx) + ", " + default_value + ");\n")
-                                meta_params.append(MetaParameter("number?", arg_name))
-                            else:
-                                func_def.append(f"(float)lua.CheckNumber({param_idx});\n")
-                                meta_params.append(MetaParameter("number", arg_name))
-
-                            extra_pushes.append(f"lua.PushNumber((double)l{local_idx});\n")
-                            meta_returns.append(MetaParameter("number", arg_name))
-
-                            param_idx = param_idx + 1
-
-                        elif (
-                            arg['type'] == 'int' or arg['type'] == 'const int'
-                            or (arg['type'] + '_') in enums_json
-                        ):
-                            if (arg['type'] + '_') in enums_json:
-                                func_parameters.append("("+arg['type']+")"+local_name)
-                            else:
-                                func_parameters.append(local_name)
-                            func_def.append(f"int {local_name} = ")
-
-                            if default_value:
-                                func_def.append("(int)lua.OptInteger(" + str(param_idx) + ", " + default_value + ");\n")
-                                meta_params.append(MetaParameter("integer?", arg_name))
-                            else:
-                                func_def.append(f"(int)lua.CheckInteger({param_idx});\n")
-                                meta_params.append(MetaParameter("integer", arg_name))
-
-                            param_idx = param_idx + 1
-
-                        elif (
-                            arg['type'] == 'unsigned int' or arg['type'] == 'const unsigned int'
-                            or arg['type'] == 'ImGuiID' or arg['type'] == 'const ImGuiID'
-                        ):
-                            func_parameters.append(local_name)
-                            func_def.append(f"uint {local_name} = ")
-
-                            if default_value:
-                                func_def.append("(uint)lua.OptInteger(" + str(param_idx) + ", " + default_value + ");\n")
-                                meta_params.append(MetaParameter("integer?", arg_name))
-                            else:
-                                func_def.append(f"(uint)lua.CheckInteger({param_idx});\n")
-                                meta_params.append(MetaParameter("integer", arg_name))
-
-                            param_idx = param_idx + 1
-
-                        elif arg['type'] == 'bool' or arg['type'] == 'const bool':
-                            func_parameters.append(local_name)
-                            func_def.append(f"byte {local_name} = ")
-
-                            if default_value:
-                                # func_def.append(f"(float)lua.OptNumber(" + str(param_idx) + ", " + default_value + ");\n")
-                                func_def.append(f"(lua.IsNoneOrNil({param_idx}) ? {default_value} : lua.ToBoolean({param_idx})) ? (byte)1 : (byte)0;\n")
-                                meta_params.append(MetaParameter("boolean?", arg_name))
-                            else:
-                                func_def.append(f"lua.ToBoolean({param_idx}) ? (byte)1 : (byte)0;\n")
-                                meta_params.append(MetaParameter("boolean", arg_name))
-                            
-                            param_idx = param_idx + 1
-
-                        elif arg['type'] == 'bool*':
-                            func_def.append(f"byte {local_name} = ")
-
-                            if default_value:
-                                assert default_value == "null"
-                                func_parameters.append(f"(lua.IsNoneOrNil({param_idx}) ? null : &{local_name})")
-                                meta_params.append(MetaParameter("boolean?", arg_name))
-                            else:
-                                func_parameters.append(f"&{local_name}")
-                                meta_params.append(MetaParameter("boolean", arg_name))
-                            
-                            extra_pushes.append(f"lua.PushBoolean({local_name} != 0);\n")
-                            meta_returns.append(MetaParameter("boolean", arg_name))
-                            
-                            func_def.append(f"lua.ToBoolean({param_idx}) ? (byte)1 : (byte)0;\n")
-                            
-                            param_idx = param_idx + 1
-
-                        elif arg['type'] == 'const ImVec2' or arg['type'] == 'ImVec2' or arg['type'] == "ImVec2*":
-                            if arg['type'] == "ImVec2*":
-                                func_parameters.append("&"+local_name)
-                                extra_pushes.append(f"lua.PushNumber((double){local_name}.X);\n")
-                                extra_pushes.append(f"lua.PushNumber((double){local_name}.Y);\n")
-                                meta_returns.append(MetaParameter("number", arg_name + "_x"))
-                                meta_returns.append(MetaParameter("number", arg_name + "_y"))
-                            else:
-                                func_parameters.append(local_name)
-                            
-                            func_def.append(f"Vector2 {local_name} = ReadVec2(lua, {param_idx}, {param_idx+1}")
-                            if default_value:
-                                func_def.append(", " + default_value.replace('ImVec2', 'new Vector2'))
-                                meta_params.append(MetaParameter("number?", arg_name + "_x"))
-                                meta_params.append(MetaParameter("number?", arg_name + "_y"))
-                            else:
-                                meta_params.append(MetaParameter("number", arg_name + "_x"))
-                                meta_params.append(MetaParameter("number", arg_name + "_y"))
-                            
-                            func_def.append(");\n")
-
-                            param_idx = param_idx + 2
-
-                        elif arg['type'] == 'const char*':
-                            func_parameters.append(local_name)
-                            str_bufs.append(local_name)
-                            func_def.append(f"byte* {local_name} = ")
-
-                            if default_value:
-                                subst = ("null" if default_value == "null" else str_to_utf8_buf(default_value))
-                                func_def.append(f"GetStr(lua, {param_idx}, {subst});\n")
-                                meta_params.append(MetaParameter("string?", arg_name))
-                            else:
-                                func_def.append(f"GetStr(lua, {param_idx});\n")
-                                meta_params.append(MetaParameter("string", arg_name))
-                            
-                            param_idx = param_idx + 1
-
-                        elif arg['type'] == '...':
-                            continue
-
-                        else:
-                            print(out_func_name + ": " + "unsupported arg type: " + arg['type'] + " (skipped)")
-                            success = False
-
-                        local_idx = local_idx + 1
-
-                    return_count = 0
-                    does_return = ovr_def['ret'] != 'void'
-                    if does_return:
-                        func_def.append("var ret = ")
-                        return_count = return_count + 1
-                    
-                    func_def.append(f"ImGuiNative.{func_name}({(', '.join(func_parameters))});\n")
-
-                    if does_return:
-                        if ovr_def['ret'] == 'bool' or ovr_def['ret'] == 'const bool':
-                            meta_returns.insert(0, MetaParameter('boolean', 's'))
-                            func_def.append("lua.PushBoolean(ret != 0);\n")
-
-                        elif ovr_def['ret'] == 'int' or ovr_def['ret'] == 'const int':
-                            meta_returns.insert(0, MetaParameter('integer', 's'))
-                            func_def.append("lua.PushInteger(ret);\n")
-
-                        elif ovr_def['ret'] == 'float' or ovr_def['ret'] == 'const float':
-                            meta_returns.insert(0, MetaParameter('number', 'num'))
-                            func_def.append("lua.PushNumber((double)ret);\n")
-
-                        else:
-                            print("unsupported return type: " + ovr_def['ret'] + " (ignored)")
-                            success = False
-
-                    for v in extra_pushes:
-                        return_count = return_count + 1
-                        func_def.append(v)
-
-                    for buf in str_bufs:
-                        func_def.append(f"StrFree({buf});\n")
-
-                    func_def.append("return " + str(return_count) + ";\n")
-
-                    if success:
-                        cs_source.append("        LuaHelpers.ModuleFunction(lua, \"")
-                        cs_source.append(out_func_name)
-                        cs_source.append("\", static (nint luaPtr) =>\n        {\n")
-
-                        for l in ''.join(func_def).splitlines():
-                            cs_source.append("            ")
-                            cs_source.append(l)
-                            cs_source.append("\n")
-                            
-                        cs_source.append("        });\n")
-
-                        for p in meta_params:
-                            if is_lua_keyword(p.name):
-                                p.name = p.name + "_"
-                            
-                            meta_source.append(f"---@param {(p.name)} {(p.type)}\n")
-
-                        if meta_returns:
-                            meta_source.append("---@return ")
-                            meta_return_strs = []
-                            for ret in meta_returns:
-                                if is_lua_keyword(ret.name):
-                                    ret.name = ret.name + "_"
-
-                                if ret.name:
-                                    meta_return_strs.append(f"{(ret.type)} {(ret.name)}")
-                                else:
-                                    meta_return_strs.append(ret.type)
-                            meta_source.append(', '.join(meta_return_strs))
-                            meta_source.append("\n")
-
-                        meta_source.append(f"function imgui.{out_func_name}(")
-                        meta_source.append(', '.join([v.name for v in meta_params]))
-                        meta_source.append(") end\n\n")
+"""
+
+    if instrument:
+        meta_header += """---@class imgui.BindingStats
+---@field name string The name of the function
+---@field calls integer The number of calls
+---@field time number The total time spent in the function, in seconds
+---@field alloc integer The total bytes allocated by the function
 
+---Get the call statistics of each ImGui function that was called, sorted by
+---the time spent in it. Only available if the bindings were generated with
+---`lua-imgui-gen.py --instrument`.
+---@return imgui.BindingStats[] stats
+function imgui.__stats() end
+
+---Reset the call statistics of all ImGui functions.
+function imgui.__resetStats() end
+
+"""
 
+    # C type -> arg kind. enums are passed to imgui as plain ints.
+    type_kinds = dict(ARG_KINDS)
     for enum_type in enums_json:
-        enum_json = enums_json[enum_type]
+        if enum_type.endswith('_'):
+            type_kinds[enum_type[:-1]] = 'int'
+
+    ovr_defs = [
+        ovr_def
+        for func_def in json_funcs.values()
+        for ovr_def in func_def
+        if is_generated_func(ovr_def)
+    ]
+
+    results = [generate_func(ovr_def, type_kinds) for ovr_def in ovr_defs]
+
+    # definitions of each function and enum constant
+    meta_funcs = []
+    meta_enums = []
+
+    # GeneratedFunc of each generated function
+    cs_funcs = []
+
+    for func_cs_funcs, func_meta_funcs, messages in results:
+        for message in messages:
+            print(message)
+
+        cs_funcs.extend(func_cs_funcs)
+        meta_funcs.extend(func_meta_funcs)
+
+    # (name, value) of the constants of each enum type. an enum type is
+    # installed as a whole when any of its constants is accessed.
+    cs_enums = []
+
+    for enum_json in enums_json.values():
+        enum_group = []
         for enum_data in enum_json:
             out_name = enum_data['name']
             if out_name[:5] == 'ImGui':
                 out_name = out_name[5:]
-            
-            cs_source.append(f"        lua.PushInteger({(enum_data['calc_value'])});\n")
-            cs_source.append(f"        lua.SetField(-2, \"{(out_name)}\");\n")
-            meta_source.append(f"imgui.{out_name} = {(enum_data['calc_value'])}\n")
 
-    cs_source.append("    }\n")
-    cs_source.append("}\n")
+            enum_group.append((out_name, enum_data['calc_value']))
+            meta_enums.append(f"imgui.{out_name} = {enum_data['calc_value']}\n")
+
+        if enum_group:
+            cs_enums.append(enum_group)
 
-    meta_source.append("\nreturn imgui\n")
+    outputs = generate_cs_sources(cs_funcs, cs_enums, instrument)
+    outputs.update(generate_meta_sources(meta_header, meta_funcs, meta_enums))
+    return outputs
 
-    with open('src/Rained/LuaScripting/Modules/ImGuiModule.gen.cs', 'w') as f:
-        f.write(''.join(cs_source))
+# write a file only if its contents differ, so that its mtime is left alone
+def write_if_changed(file_path, text):
+    data = text.encode('utf-8')
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if os.path.exists(file_path):
+        with open(file_path, 'rb') as f:
+            if f.read() == data:
+                return False
 
-    with open('scripts/definitions/imgui.lua', 'w') as f:
-        f.write(''.join(meta_source))
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate the Lua bindings of ImGui and their definitions from the cimgui definitions."
+    )
+
+    parser.add_argument('--check', action='store_true', help="only check whether the outputs are up to date, without writing anything. exits with 1 if they aren't.")
+    parser.add_argument('--force', action='store_true', help="regenerate the outputs even if they are up to date")
+    parser.add_argument('--instrument', action='store_true', help="make each binding count its calls, time and allocations, which scripts can read with imgui.__stats()")
+    parser.add_argument('--definitions', metavar='DIR', default=DEFINITIONS_DIR, help="the directory containing definitions.json and structs_and_enums.json. defaults to the one of the ImGui.NET submodule.")
+    parser.add_argument('--output-root', metavar='DIR', default='.', help="write the outputs and the stamp relative to the given directory instead of the current one")
+    args = parser.parse_args()
+
+    start_time_ns = time.time_ns()
+    definitions_path = os.path.join(args.definitions, 'definitions.json')
+    structs_and_enums_path = os.path.join(args.definitions, 'structs_and_enums.json')
+
+    dep_path = os.path.join(args.output_root, DEP_PATH)
+    stamp_path = os.path.join(args.output_root, STAMP_PATH)
+    options = stamps.format_options({ 'instrument': args.instrument })
+    stale_reason = stamps.check_stamp(dep_path, stamp_path, options)
+
+    if args.check:
+        if stale_reason is None:
+            print("lua-imgui-gen: up to date")
+            sys.exit(0)
+
+        print(f"lua-imgui-gen: out of date ({stale_reason})")
+        sys.exit(1)
+
+    if stale_reason is None and not args.force:
+        print("lua-imgui-gen: up to date")
+        return
+
+    with open(definitions_path, 'rb') as f:
+        definitions_data = f.read()
+
+    with open(structs_and_enums_path, 'rb') as f:
+        structs_and_enums_data = f.read()
+
+    outputs = generate(definitions_data, structs_and_enums_data, args.instrument)
+    outputs = { os.path.normpath(os.path.join(args.output_root, out_path)): text for out_path, text in outputs.items() }
+    for out_path, text in outputs.items():
+        if write_if_changed(out_path, text):
+            print(f"wrote {out_path}")
+
+    # remove shards left over from a run that produced more of them
+    stale_shards = (
+        glob.glob(os.path.join(args.output_root, CS_SHARD_PATH.format('*')))
+        + glob.glob(os.path.join(args.output_root, META_SHARD_DIR, '*.lua'))
+    )
+    for shard_path in stale_shards:
+        if os.path.normpath(shard_path) not in outputs:
+            os.remove(shard_path)
+            print(f"removed {shard_path}")
+
+    inputs = [__file__, definitions_path, structs_and_enums_path]
+    stamps.write_stamp(dep_path, stamp_path, options, inputs, outputs, start_time_ns)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+# Benchmark for the shader preprocessor.
+# Generates a synthetic shader tree with many sources, deep and diamond
+# include chains and a large shared header, then runs
+# tools/shader-preprocessor.py on it in a few scenarios (cold build, no-op
+# build, touched header, edited headers) using tools/fake-glslang.py as the
+# validator. Results are compared against a tracked baseline so that scaling
+# regressions show up before they reach real builds.
+#
+# Runs entirely offline. Only tested on Linux, since the fake validator is
+# launched directly as an executable script.
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PREPROCESSOR = os.path.join(TOOLS_DIR, 'shader-preprocessor.py')
+FAKE_VALIDATOR = os.path.join(TOOLS_DIR, 'fake-glslang.py')
+DEFAULT_BASELINE = os.path.join(TOOLS_DIR, 'shader-bench-baseline.json')
+
+# number of separate include chains. each source includes one of them, so
+# editing the end of a chain only affects a fraction of the sources.
+CHAIN_GROUPS = 8
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+# generate the synthetic shader tree in root/glshaders
+def generate_tree(root, num_sources, depth, header_lines):
+    shader_dir = os.path.join(root, 'glshaders')
+
+    # diamond: common_a and common_b both include base
+    write_file(os.path.join(shader_dir, 'base.glsl'),
+        "#pragma once\n"
+        "// shared by both sides of the diamond\n"
+        "float base_scale(float v) { return v * 0.5; }\n"
+    )
+
+    for side in ('a', 'b'):
+        write_file(os.path.join(shader_dir, f'common_{side}.glsl'),
+            f"#ifndef COMMON_{side.upper()}_INC\n"
+            f"#define COMMON_{side.upper()}_INC\n"
+            "#include \"base.glsl\"\n"
+            f"float common_{side}(float v) {{ return base_scale(v) + 1.0; }}\n"
+            "#endif\n"
+        )
+
+    # large header, mostly made of functions that sources never call
+    big = ["#ifndef BIG_INC", "#define BIG_INC"]
+    func_idx = 0
+    while len(big) < header_lines:
+        big.append(f"// helper {func_idx}")
+        big.append(f"vec4 big_helper{func_idx}(vec4 color, float amount)")
+        big.append("{")
+        big.append(f"    float k = amount * {func_idx}.0 + 0.25;")
+        big.append("    return color * k;")
+        big.append("}")
+        func_idx += 1
+    big.append("#endif")
+    write_file(os.path.join(shader_dir, 'big.glsl'), '\n'.join(big) + '\n')
+
+    # deep include chains
+    for group in range(CHAIN_GROUPS):
+        for level in range(depth):
+            lines = [f"#ifndef CHAIN_{group}_{level}_INC", f"#define CHAIN_{group}_{level}_INC"]
+            if level + 1 < depth:
+                lines.append(f"#include \"chain/g{group}_{level + 1}.glsl\"")
+                inner = f"chain_{group}_{level + 1}(v)"
+            else:
+                inner = "v"
+
+            lines.append(f"float chain_{group}_{level}(float v) {{ return {inner} + {level}.0; }}")
+            lines.append("#endif")
+            write_file(os.path.join(shader_dir, 'chain', f'g{group}_{level}.glsl'), '\n'.join(lines) + '\n')
+
+    # sources
+    for i in range(num_sources):
+        group = i % CHAIN_GROUPS
+        write_file(os.path.join(shader_dir, f's{i:04}.frag.glsl'),
+            "#include \"common_a.glsl\"\n"
+            "#include \"common_b.glsl\"\n"
+            "#include \"big.glsl\"\n"
+            f"#include \"chain/g{group}_0.glsl\"\n"
+            "\n"
+            "in vec2 v_texcoord0;\n"
+            "in vec4 v_color0;\n"
+            "out vec4 fragColor;\n"
+            "uniform vec4 u_color;\n"
+            "\n"
+            "void main() {\n"
+            f"    float v = common_a(v_texcoord0.x) + common_b(v_texcoord0.y) + chain_{group}_0({i}.0);\n"
+            "    fragColor = big_helper0(v_color0, v) * u_color;\n"
+            "}\n"
+        )
+
+def append_line(path, line):
+    with open(path, 'a') as f:
+        f.write(line + '\n')
+
+# run the preprocessor once. returns the wall time as seen from here,
+# and the report written by --timings.
+def run_preprocessor(root, jobs, extra_args):
+    timings_path = os.path.join(root, 'timings.json')
+    env = dict(os.environ, GLSL_VALIDATOR=FAKE_VALIDATOR)
+    env.pop('SHADER_VALIDATION_CACHE', None)
+    cmd = [sys.executable, PREPROCESSOR, 'gl330', 'gles300', '-j', str(jobs), '--timings', timings_path] + extra_args
+
+    start_time = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - start_time
+
+    if proc.returncode != 0:
+        print(proc.stdout.decode('utf-8'))
+        raise RuntimeError(f"shader-preprocessor.py returned {proc.returncode}")
+
+    with open(timings_path, 'r') as f:
+        report = json.load(f)
+
+    return wall, report
+
+# run each scenario the given number of times, keeping the fastest run
+def run_scenarios(root, depth, jobs, runs, extra_args):
+    shader_dir = os.path.join(root, 'glshaders')
+    build_dir = os.path.join(shader_dir, 'build')
+
+    # each scenario is (name, setup function). the setup function prepares
+    # the tree before the timed run.
+    def cold():
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    def noop():
+        pass
+
+    def touch_header():
+        os.utime(os.path.join(shader_dir, 'big.glsl'))
+
+    def edit_leaf():
+        append_line(os.path.join(shader_dir, 'chain', f'g0_{depth - 1}.glsl'), "// edit")
+
+    def edit_shared():
+        append_line(os.path.join(shader_dir, 'base.glsl'), "// edit")
+
+    scenarios = [
+        ('cold', cold),
+        ('noop', noop),
+        ('touch_header', touch_header),
+        ('edit_leaf', edit_leaf),
+        ('edit_shared', edit_shared),
+    ]
+
+    results = {}
+    for name, setup in scenarios:
+        best = None
+        for _ in range(runs):
+            setup()
+            wall, report = run_preprocessor(root, jobs, extra_args)
+            if best is None or wall < best['wall']:
+                best = {
+                    'wall': round(wall, 4),
+                    'phases': { phase: round(t, 4) for phase, t in report['phases'].items() },
+                    'counters': report['counters']
+                }
+
+        results[name] = best
+
+    return results
+
+def print_results(results, baseline):
+    print(f"{'scenario':<14}{'wall (s)':>10}{'baseline':>10}{'include':>10}{'io':>10}{'emit':>10}{'spawn':>10}{'wait':>10}{'validated':>11}{'written':>9}")
+    for name, result in results.items():
+        phases = result['phases']
+        counters = result['counters']
+        base = baseline.get(name)
+        base_wall = f"{base['wall']:.3f}" if base else '-'
+        print(
+            f"{name:<14}{result['wall']:>10.3f}{base_wall:>10}"
+            f"{phases['include']:>10.3f}{phases['io']:>10.3f}{phases['emit']:>10.3f}"
+            f"{phases['validator_spawn']:>10.3f}{phases['validator_wait']:>10.3f}"
+            f"{counters['validations']:>11}{counters['writes']:>9}"
+        )
+
+# compare results with the baseline. counters have to match exactly,
+# while wall times may be up to tolerance times slower.
+def check_regressions(results, baseline, tolerance):
+    problems = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        for counter, value in base['counters'].items():
+            if result['counters'].get(counter) != value:
+                problems.append(f"{name}: {counter} is {result['counters'].get(counter)}, baseline is {value}")
+
+        if result['wall'] > base['wall'] * tolerance:
+            problems.append(f"{name}: took {result['wall']:.3f}s, baseline is {base['wall']:.3f}s")
+
+    return problems
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Benchmark tools/shader-preprocessor.py on a generated shader tree, using a fake validator."
+    )
+
+    parser.add_argument('--sources', type=int, default=200, help="the number of shader sources to generate. defaults to 200.")
+    parser.add_argument('--depth', type=int, default=12, help="the depth of the generated include chains. defaults to 12.")
+    parser.add_argument('--header-lines', type=int, default=4000, help="the number of lines in the large shared header. defaults to 4000.")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="the job count passed to the preprocessor. defaults to the number of CPUs.")
+    parser.add_argument('--runs', type=int, default=3, help="the number of runs of each scenario. the fastest one is kept. defaults to 3.")
+    parser.add_argument('--minify', action='store_true', help="pass --minify to the preprocessor")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="the baseline file to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="write the results to the baseline file instead of comparing against it")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="how many times slower than the baseline a scenario may be before it is reported. defaults to 1.5.")
+    parser.add_argument('--keep', metavar='DIR', help="generate the tree in the given directory and keep it, instead of using a temporary one")
+    args = parser.parse_args()
+
+    config = {
+        'sources': args.sources,
+        'depth': args.depth,
+        'header_lines': args.header_lines,
+        'minify': args.minify
+    }
+
+    extra_args = ['--minify'] if args.minify else []
+
+    if args.keep:
+        root = os.path.abspath(args.keep)
+        shutil.rmtree(os.path.join(root, 'glshaders'), ignore_errors=True)
+        os.makedirs(root, exist_ok=True)
+    else:
+        root = tempfile.mkdtemp(prefix='shader-bench-')
+
+    try:
+        generate_tree(root, args.sources, args.depth, args.header_lines)
+        results = run_scenarios(root, args.depth, args.jobs, args.runs, extra_args)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline_data = json.load(f)
+
+        # results are only comparable with a baseline for the same tree
+        if baseline_data['config'] == config:
+            baseline = baseline_data['scenarios']
+        else:
+            print("note: baseline was recorded with a different configuration, not comparing")
+
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({ 'config': config, 'scenarios': results }, f, indent=2)
+            f.write('\n')
+
+        print(f"wrote baseline to {args.baseline}")
+        sys.exit(0)
+
+    problems = check_regressions(results, baseline, args.tolerance)
+    if problems:
+        print()
+        for problem in problems:
+            print("REGRESSION: " + problem)
+        sys.exit(1)
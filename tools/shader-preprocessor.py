@@ -11,16 +11,350 @@ import sys
 import re
 import subprocess
 import argparse
+import json
+import hashlib
+import time
+import itertools
+import threading
 from os import path
+from concurrent.futures import ThreadPoolExecutor
+
+import stamps
 
 SHADER_DIR = 'glshaders'
 shader_dir = os.path.join(os.curdir, SHADER_DIR)
 
 GLSL_VALIDATOR = os.environ.get('GLSL_VALIDATOR', 'glslangValidator')
 
-class ProcessData:
+# prefix prepended to the preprocessed output for each target language
+SHADER_PREFIXES = {
+    'gl330': '#version 330 core\n',
+    'gles300': '#version 300 es\nprecision mediump float;\n',
+}
+
+# wall time spent in each phase of the build, both in total and per
+# source file, for the --timings option. phases are exclusive, i.e. time
+# spent reading files while resolving includes only counts as file I/O.
+# times of work done in the validator pool are summed across threads.
+TIMING_PHASES = ['include', 'io', 'emit', 'validator_spawn', 'validator_wait', 'diagnostics']
+
+class PhaseTimer:
+    def __init__(self, timings, phase, file):
+        self.timings = timings
+        self.phase = phase
+        self.file = file
+    
+    def __enter__(self):
+        stack = self.timings.stack()
+        if self.file is None and stack:
+            self.file = stack[-1].file
+        
+        stack.append(self)
+        self.child_time = 0.0
+        self.start_time = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start_time
+        stack = self.timings.stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_time += elapsed
+        
+        self.timings.add(self.phase, self.file, elapsed - self.child_time)
+
+class NullTimer:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        pass
+
+class Timings:
     def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start_time = time.perf_counter()
+        self.phases = { phase: 0.0 for phase in TIMING_PHASES }
+        self.files = {}
+        self.counters = { 'reads': 0, 'writes': 0, 'preprocessed': 0, 'validations': 0, 'validation_cache_hits': 0 }
+        self.null_timer = NullTimer()
+    
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+    
+    # measure the time spent in a phase, attributed to the given source
+    # file or the one of the enclosing measurement
+    def measure(self, phase, file=None):
+        if not self.enabled:
+            return self.null_timer
+        return PhaseTimer(self, phase, file)
+    
+    def add(self, phase, file, elapsed):
+        with self.lock:
+            self.phases[phase] += elapsed
+            if file is not None:
+                file_phases = self.files.setdefault(file, { phase: 0.0 for phase in TIMING_PHASES })
+                file_phases[phase] += elapsed
+    
+    def count(self, counter, n=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[counter] += n
+    
+    def report(self):
+        files = {}
+        for file, file_phases in sorted(self.files.items()):
+            files[file] = dict(file_phases, total=sum(file_phases.values()))
+
+        return {
+            'wall': time.perf_counter() - self.start_time,
+            'phases': self.phases,
+            'counters': self.counters,
+            'files': files
+        }
+
+timings = Timings()
+
+# bump this whenever the format of the preprocessor output changes,
+# so that build manifests written by older versions are discarded.
+MANIFEST_VERSION = 3
+
+class ProcessData:
+    def __init__(self, source_cache):
+        self.source_cache = source_cache
+
+        # list of absolute paths indexed by file id, and the reverse mapping
         self.processed = []
+        self.file_ids = {}
+
+        # file id of the file that first included each file, indexed by file id
+        self.includers = []
+
+        # content hash of every file read while processing, keyed
+        # by absolute path
+        self.dependencies = {}
+
+        # variants declared with #pragma variant. maps each macro name to
+        # its list of values, or None if the macro is only defined or not
+        self.variants = {}
+
+# content hashes of files on disk. a file is only re-read and hashed if
+# its size or modification time differ from the ones its hash was
+# recorded with, so checking an unchanged tree only costs a stat per file.
+class HashCache:
+    def __init__(self):
+        self.entries = {}
+        self.changed = set()
+    
+    # load stat records from a build manifest
+    def load(self, records):
+        for rel_path, (size, mtime_ns, digest) in records.items():
+            abs_path = os.path.abspath(os.path.join(shader_dir, rel_path))
+            self.entries.setdefault(abs_path, (size, mtime_ns, digest))
+    
+    # get stat records of the given files, for storing in a build manifest
+    def records(self, abs_paths):
+        out = {}
+        for abs_path in abs_paths:
+            if abs_path in self.entries:
+                out[os.path.relpath(abs_path, start=shader_dir)] = list(self.entries[abs_path])
+        
+        return out
+
+    # get the hash of a file, or None if it does not exist
+    def get(self, abs_path):
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        
+        entry = self.entries.get(abs_path)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        
+        with timings.measure('io'):
+            timings.count('reads')
+            with open(abs_path, 'rb') as f:
+                data = f.read()
+        
+        return self.record(abs_path, st, data)
+    
+    # record the contents of a file that has just been read or written
+    def record(self, abs_path, st, data):
+        digest = hashlib.sha256(data).hexdigest()
+        entry = (st.st_size, st.st_mtime_ns, digest)
+
+        if self.entries.get(abs_path) != entry:
+            self.entries[abs_path] = entry
+            self.changed.add(abs_path)
+        
+        return digest
+
+# record of the sources that were last built for a target language. for
+# each source, it stores the content hash of each file it included and
+# the hash of its last successfully validated output. it also stores the
+# hash of the outputs the C# catalog was last generated from, along with
+# the hash of the catalog itself.
+class BuildManifest:
+    def __init__(self, shaderlang, options):
+        self.shaderlang = shaderlang
+        self.options = options
+        self.build_dir = os.path.join(shader_dir, 'build', shaderlang)
+        self.path = os.path.join(self.build_dir, 'manifest.json')
+        self.catalog_path = os.path.join(self.build_dir, CATALOG_FILE_NAME)
+        self.dep_path = os.path.join(self.build_dir, 'shaders.d')
+        self.stamp_path = os.path.join(self.build_dir, 'shaders.stamp')
+        self.sources = {}
+        self.catalog = None
+        self.dirty = False
+    
+    def load(self, hashes):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        # discard manifests written by a different version
+        if data.get('version') != MANIFEST_VERSION:
+            self.dirty = True
+            return
+        
+        hashes.load(data['files'])
+        self.sources = data['sources']
+        self.catalog = data.get('catalog')
+
+        # if the manifest was written for a different prefix or set of
+        # options, nothing in it counts as validated. the names of the
+        # outputs are still kept so that stale ones can be deleted.
+        if data.get('prefix') != SHADER_PREFIXES[self.shaderlang] or data.get('options') != self.options:
+            for entry in self.sources.values():
+                entry['outputs'] = { out_name: None for out_name in entry['outputs'] }
+            self.dirty = True
+    
+    def save(self, hashes):
+        files = set()
+        for src_name, entry in self.sources.items():
+            for out_name in entry['outputs']:
+                files.add(os.path.abspath(os.path.join(self.build_dir, out_name)))
+            for dep in entry['deps']:
+                files.add(os.path.abspath(os.path.join(shader_dir, dep)))
+        
+        if self.catalog is not None:
+            files.add(os.path.abspath(self.catalog_path))
+        
+        # don't touch the manifest if nothing about it changed
+        if not self.dirty and files.isdisjoint(hashes.changed):
+            return
+        
+        data = {
+            'version': MANIFEST_VERSION,
+            'prefix': SHADER_PREFIXES[self.shaderlang],
+            'options': self.options,
+            'files': hashes.records(sorted(files)),
+            'sources': self.sources,
+            'catalog': self.catalog
+        }
+
+        with timings.measure('io'):
+            timings.count('writes')
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.dirty = False
+    
+    # check if a source file's outputs were validated, and neither they
+    # nor any of the files it included have changed since.
+    def is_up_to_date(self, src_name, hashes):
+        entry = self.sources.get(src_name)
+        if entry is None:
+            return False
+        
+        for dep, digest in entry['deps'].items():
+            if hashes.get(os.path.abspath(os.path.join(shader_dir, dep))) != digest:
+                return False
+        
+        for out_name, digest in entry['outputs'].items():
+            if hashes.get(os.path.abspath(os.path.join(self.build_dir, out_name))) != digest:
+                return False
+        
+        return True
+    
+    # get the hashes of the last validated outputs of a source file,
+    # keyed by output file name
+    def validated_outputs(self, src_name):
+        entry = self.sources.get(src_name)
+        return entry['outputs'] if entry else {}
+
+    def update(self, src_name, deps, outputs, reflection):
+        entry = { 'deps': deps, 'outputs': outputs, 'reflection': reflection }
+        if self.sources.get(src_name) != entry:
+            self.sources[src_name] = entry
+            self.dirty = True
+    
+    def remove(self, src_name):
+        if self.sources.pop(src_name, None) is not None:
+            self.dirty = True
+    
+    # forget about sources that no longer exist
+    def prune(self, sources):
+        for src_name in list(self.sources):
+            if not src_name in sources:
+                self.remove(src_name)
+    
+    # hash of the names and hashes of every output, which the catalog is
+    # generated from
+    def catalog_key(self):
+        outputs = { src_name: entry['outputs'] for src_name, entry in self.sources.items() }
+        return hashlib.sha256(json.dumps(outputs, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    # check if the catalog was generated from the outputs with the given
+    # key, and hasn't changed since
+    def is_catalog_up_to_date(self, key, hashes):
+        return (
+            self.catalog is not None and self.catalog['key'] == key and
+            hashes.get(os.path.abspath(self.catalog_path)) == self.catalog['hash']
+        )
+    
+    def update_catalog(self, key, digest):
+        catalog = { 'key': key, 'hash': digest }
+        if self.catalog != catalog:
+            self.catalog = catalog
+            self.dirty = True
+
+    # write the depfile and stamp file of the target after a successful
+    # build (see tools/stamps.py), so that build scripts can tell whether
+    # the preprocessor needs to run at all without launching it. the inputs
+    # are this script, the shader directory (whose mtime changes when
+    # sources are added or removed) and every file that was read.
+    # extra_options and extra_outputs are for build options and outputs
+    # that are not specific to the target.
+    def write_stamp(self, start_time_ns, extra_options={}, extra_outputs=()):
+        inputs = set([path.abspath(__file__), path.abspath(shader_dir)])
+        outputs = set([path.abspath(self.path)])
+        outputs.update(path.abspath(p) for p in extra_outputs)
+        for entry in self.sources.values():
+            for dep in entry['deps']:
+                inputs.add(path.abspath(path.join(shader_dir, dep)))
+            
+            for out_name in entry['outputs']:
+                out_file_path = path.abspath(path.join(self.build_dir, out_name))
+                outputs.add(out_file_path)
+                if path.exists(out_file_path + '.map'):
+                    outputs.add(out_file_path + '.map')
+        
+        options = stamps.format_options(dict(self.options, **extra_options))
+        with timings.measure('io'):
+            written = stamps.write_stamp(self.dep_path, self.stamp_path, options, inputs, outputs, start_time_ns)
+            timings.count('writes', written)
+    
+    def remove_stamp(self):
+        stamps.remove_stamp(self.stamp_path)
 
 class ValidationException(Exception):
     def __init__(self, source, line, data, message):
@@ -31,178 +365,1800 @@ class CompilationException(Exception):
         super().__init__(f"{(len(errors))} compilation errors.  No code generated.")
         self.errors = errors
 
+# the parsed structure of a file. lines is a list of either strings of
+# consecutive plain lines, or (include_path, line_num) tuples for each
+# #include directive.
+class ParsedFile:
+    def __init__(self, digest, lines, once, variants):
+        self.digest = digest
+        self.lines = lines
+
+        # list of (name, values) for each #pragma variant directive
+        self.variants = variants
+
+        # if True, the file only needs to be included once per source,
+        # either because of #pragma once or because its contents are
+        # wrapped in an include guard.
+        self.once = once
+
+# cache of parsed files, shared across all sources and targets in a run.
+# a file is only re-read and re-parsed if its size or modification time
+# have changed since it was last parsed.
+class SourceCache:
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.files = {}
+    
+    def get(self, abs_path):
+        st = os.stat(abs_path)
+        cached = self.files.get(abs_path)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        
+        with timings.measure('io'):
+            timings.count('reads')
+            with open(abs_path, 'rb') as f:
+                data = f.read()
+        
+        digest = self.hashes.record(abs_path, st, data)
+        parsed = parse_file(os.path.relpath(abs_path, start=shader_dir), data.decode('utf-8'), digest)
+        self.files[abs_path] = (st.st_size, st.st_mtime_ns, parsed)
+        return parsed
+
+# check if the given lines are entirely wrapped in an include guard, i.e.
+#   #ifndef NAME
+#   #define NAME
+#   ...
+#   #endif
+# with nothing but blank lines or line comments outside of it.
+def has_include_guard(lines):
+    directives = []
+    for i, line in enumerate(lines):
+        stripped_line = line.strip()
+        if stripped_line == '' or stripped_line[0:2] == '//':
+            continue
+        
+        directives.append((i, stripped_line))
+    
+    if len(directives) < 3:
+        return False
+    
+    first = directives[0][1].split()
+    second = directives[1][1].split()
+    if len(first) != 2 or first[0] != '#ifndef' or second[0:2] != ['#define', first[1]]:
+        return False
+    
+    # the #endif matching the #ifndef must be the last directive
+    depth = 0
+    for idx, (i, stripped_line) in enumerate(directives):
+        word = stripped_line.split()[0]
+        if word in ('#if', '#ifdef', '#ifndef'):
+            depth += 1
+        elif word == '#endif':
+            depth -= 1
+            if depth == 0:
+                return idx == len(directives) - 1
+    
+    return False
+
+# matches a #pragma variant directive, i.e. either
+#   #pragma variant NAME
+#   #pragma variant NAME(0, 1, ...)
+VARIANT_PRAGMA_RE = re.compile(r'#\s*pragma\s+variant\s+([A-Za-z_]\w*)\s*(?:\((.*)\))?\s*$')
+
+# parse a file into its plain lines and #include directives
+def parse_file(in_file_path, text, digest):
+    lines = [line.rstrip() for line in io.StringIO(text)]
+    once = has_include_guard(lines)
+
+    items = []
+    chunk = []
+    variants = []
+
+    for line_num, line in enumerate(lines, start=1):
+        stripped_line = line.lstrip()
+
+        # #pragma once directive. an empty line is emitted in its place
+        # so that line numbers stay the same
+        if stripped_line.split() == ['#pragma', 'once']:
+            once = True
+            chunk.append('')
+        
+        # #pragma variant directive. also replaced with an empty line
+        elif stripped_line.split()[0:2] == ['#pragma', 'variant']:
+            re_res = VARIANT_PRAGMA_RE.match(stripped_line)
+            if re_res is None:
+                raise CompilationException([
+                    ValidationException(in_file_path, line_num, stripped_line, "expected a macro name and an optional list of values")
+                ])
+
+            values = None
+            if re_res.group(2) is not None:
+                values = [v.strip() for v in re_res.group(2).split(',')]
+                for v in values:
+                    if not v.isdigit():
+                        raise CompilationException([
+                            ValidationException(in_file_path, line_num, v, "variant values must be non-negative integers")
+                        ])
+            
+            variants.append((re_res.group(1), values))
+            chunk.append('')
+
+        # #include directive
+        elif stripped_line[0:9] == '#include ':
+            include_path = stripped_line[9:].lstrip()
+
+            first_char = include_path[0]
+            last_char = include_path[-1]
+
+            # check containing symbols
+            if first_char != '"' and first_char != '<':
+                raise CompilationException([
+                    ValidationException(in_file_path, line_num, first_char, "expected '<' or '\"'"),
+                    ValidationException(in_file_path, line_num+1, "", "compilation terminated")
+                ])
+            
+            if first_char == '"' and last_char != '"':
+                raise CompilationException([
+                    ValidationException(in_file_path, line_num, "", "expected '\"', got EOL"),
+                    ValidationException(in_file_path, line_num+1, "", "compilation terminated")
+                ])
+            
+            if first_char == '<' and last_char != '>':
+                raise CompilationException([
+                    ValidationException(in_file_path, line_num, "", "expected '>', got EOL"),
+                    ValidationException(in_file_path, line_num+1, "", "compilation terminated")
+                ])
+            
+            if chunk:
+                items.append('\n'.join(chunk) + '\n')
+                chunk = []
+            
+            items.append((include_path[1:-1], line_num))
+        
+        else:
+            chunk.append(line)
+    
+    if chunk:
+        items.append('\n'.join(chunk) + '\n')
+    
+    return ParsedFile(digest, items, once, variants)
+
 # recursive preprocessor function
-def process_file(in_file_path, out_file, proc_data):
+def process_file(in_file_path, out_file, proc_data, includer_id=None):
     in_abs_path = os.path.abspath(os.path.join(shader_dir, in_file_path))
     in_file_path = os.path.relpath(in_abs_path, start=shader_dir)
-    line_num = 0
 
-    with open(in_abs_path, 'r') as in_file:
-        # reset line number and file id
+    parsed = proc_data.source_cache.get(in_abs_path)
+    proc_data.dependencies[in_abs_path] = parsed.digest
+
+    # get file id. if the file was already included and is marked as
+    # include-once, its contents are dropped
+    file_id = proc_data.file_ids.get(in_abs_path)
+    if file_id is None:
         file_id = len(proc_data.processed)
-        if in_abs_path in proc_data.processed:
-            file_id = proc_data.processed.index(in_abs_path)
+        proc_data.file_ids[in_abs_path] = file_id
+        proc_data.processed.append(in_abs_path)
+        proc_data.includers.append(includer_id)
+    elif parsed.once:
+        return
+    
+    for name, values in parsed.variants:
+        proc_data.variants.setdefault(name, values)
+    
+    out_file.write("#line 1 " + str(file_id) + "\n")
+
+    for item in parsed.lines:
+        if isinstance(item, str):
+            out_file.write(item)
+            continue
+
+        # include file into source
+        include_path, line_num = item
+        try:
+            process_file(include_path, out_file, proc_data, file_id)
+        except OSError:
+            raise CompilationException([
+                ValidationException(in_file_path, line_num, include_path, "could not open file"),
+                ValidationException(in_file_path, line_num+1, "", "compilation terminated")
+            ])
+        
+        out_file.write(f"#line {line_num + 1} {file_id}\n")
+
+# glsl keywords and reserved words, which identifiers are never renamed to
+GLSL_KEYWORDS = frozenset('''
+    attribute const uniform varying layout centroid flat smooth noperspective
+    patch sample break continue do for while switch case default if else
+    subroutine in out inout true false invariant precise discard return
+    lowp mediump highp precision struct void float double int uint bool
+    asm class union enum typedef template this resource goto inline noinline
+    public static extern external interface long short half fixed unsigned
+    superp input output filter sizeof cast namespace using common partition
+    active buffer shared coherent volatile restrict readonly writeonly
+'''.split())
+
+# built-in types, used to recognize declarations of local variables
+GLSL_TYPES = frozenset('''
+    void bool int uint float double
+    vec2 vec3 vec4 dvec2 dvec3 dvec4 bvec2 bvec3 bvec4 ivec2 ivec3 ivec4 uvec2 uvec3 uvec4
+    mat2 mat3 mat4 mat2x2 mat2x3 mat2x4 mat3x2 mat3x3 mat3x4 mat4x2 mat4x3 mat4x4
+    sampler1D sampler2D sampler3D samplerCube sampler2DShadow samplerCubeShadow
+    sampler2DArray sampler2DArrayShadow isampler2D isampler3D isamplerCube isampler2DArray
+    usampler2D usampler3D usamplerCube usampler2DArray sampler2DRect samplerBuffer
+'''.split())
+
+# qualifiers which may appear between declarators in a parameter list
+GLSL_QUALIFIERS = frozenset('const in out inout lowp mediump highp precise flat'.split())
+
+GLSL_TOKEN_RE = re.compile(r'''
+      (?P<ws>\s+)
+    | (?P<num>0[xX][0-9a-fA-F]+[uU]?|(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?(?:lf|LF|[fFuU])?)
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<op><<=|>>=|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||\^\^|[-+*/%&|^]=|.)
+''', re.X)
+
+IDENT_RE = re.compile(r'[A-Za-z_]\w*')
+
+# pairs of characters that can't be placed next to each other without
+# changing how the code is tokenized
+GLSL_OP_PAIRS = frozenset('++ -- << >> <= >= == != && || ^^ += -= *= /= %= &= |= ^= // /*'.split())
+
+class MinifyException(Exception):
+    pass
+
+class Token:
+    def __init__(self, kind, text, line_idx):
+        self.kind = kind
+        self.text = text
+        self.orig_text = text
+        self.line_idx = line_idx
+        self.removed = False
+
+# remove comments from a line. in_block is True if the line starts
+# inside of a block comment. returns the stripped line and whether
+# the next line starts inside of a block comment.
+def strip_comments(line, in_block):
+    out = []
+    i = 0
+
+    while i < len(line):
+        if in_block:
+            end = line.find('*/', i)
+            if end < 0:
+                break
+
+            out.append(' ')
+            i = end + 2
+            in_block = False
         else:
-            proc_data.processed.append(in_abs_path)
+            line_comment = line.find('//', i)
+            block_comment = line.find('/*', i)
+
+            if block_comment >= 0 and (line_comment < 0 or block_comment < line_comment):
+                out.append(line[i:block_comment])
+                i = block_comment + 2
+                in_block = True
+            elif line_comment >= 0:
+                out.append(line[i:line_comment])
+                break
+            else:
+                out.append(line[i:])
+                break
+    
+    return ''.join(out), in_block
+
+def tokenize_glsl(text, line_idx):
+    tokens = []
+    for m in GLSL_TOKEN_RE.finditer(text):
+        if m.lastgroup != 'ws':
+            tokens.append(Token(m.lastgroup, m.group(), line_idx))
+    
+    return tokens
+
+# check if a space is needed when placing token b right after token a
+def needs_space(a, b):
+    if (a[-1].isalnum() or a[-1] == '_') and (b[0].isalnum() or b[0] == '_'):
+        return True
+    
+    if a[0].isdigit() and b[0] == '.':
+        return True
+    
+    if a[-1] == '.' and b[0].isdigit():
+        return True
+    
+    return (a[-1] + b[0]) in GLSL_OP_PAIRS
+
+# split the flat token stream into top-level items: function definitions,
+# prototypes, other declarations and preprocessor directives.
+def parse_glsl_items(flat):
+    items = []
+    i = 0
+    n = len(flat)
+
+    while i < n:
+        if flat[i].kind == 'directive':
+            items.append({ 'kind': 'directive', 'start': i, 'end': i + 1 })
+            i += 1
+            continue
         
-        out_file.write("#line 1 " + str(file_id) + "\n")
+        start = i
+        depth = 0
+        first_paren = None
+        body_start = None
+        has_directive = False
 
-        for line in in_file:
-            line_num += 1
-            line = line.rstrip()
-
-            # #include directive
-            stripped_line = line.lstrip()
-            if stripped_line[0:9] == '#include ':
-                include_path = stripped_line[9:].lstrip()
-
-                first_char = include_path[0]
-                last_char = include_path[-1]
-
-                # check containing symbols
-                if first_char != '"' and first_char != '<':
-                    raise CompilationException([
-                        ValidationException(in_file_path, line_num, first_char, "expected '<' or '\"'"),
-                        ValidationException(in_file_path, line_num+1, "", "compilation terminated")
-                    ])
+        while True:
+            if i >= n:
+                raise MinifyException("unexpected end of source")
+            
+            tok = flat[i]
+            text = tok.text
+            i += 1
+
+            if tok.kind == 'directive':
+                has_directive = True
+            elif text in ('(', '[', '{'):
+                if text == '(' and depth == 0 and first_paren is None:
+                    first_paren = i - 1
+                if text == '{' and depth == 0:
+                    body_start = i - 1
+                depth += 1
+            elif text in (')', ']', '}'):
+                depth -= 1
+                if depth < 0:
+                    raise MinifyException("unbalanced brackets")
+                
+                # a function definition ends at its closing brace
+                if (
+                    text == '}' and depth == 0 and first_paren is not None
+                    and body_start > start and flat[body_start - 1].text == ')'
+                ):
+                    break
+            elif text == ';' and depth == 0:
+                break
+        
+        item = { 'kind': 'decl', 'start': start, 'end': i, 'has_directive': has_directive }
+        if first_paren is not None and first_paren > start and flat[first_paren - 1].kind == 'ident':
+            if body_start is not None and flat[body_start - 1].text == ')':
+                item['kind'] = 'func'
+                item['body_start'] = body_start
+            elif flat[i - 2].text == ')' and not any(t.text == '=' for t in flat[start:i]):
+                item['kind'] = 'proto'
+            
+            if item['kind'] != 'decl':
+                item['name'] = flat[first_paren - 1].text
+                item['params_start'] = first_paren
+        
+        items.append(item)
+    
+    return items
+
+# drop functions that can't be reached from main
+def strip_dead_functions(flat, items):
+    roots = {'main'}
+    refs = {}
+
+    for item in items:
+        idents = {t.text for t in flat[item['start']:item['end']] if t.kind == 'ident'}
+        if item['kind'] == 'directive':
+            idents = set(IDENT_RE.findall(flat[item['start']].text))
+
+        # functions with preprocessor directives inside of them are always kept
+        if item['kind'] == 'func' and not item['has_directive']:
+            refs.setdefault(item['name'], set()).update(idents)
+        elif item['kind'] != 'proto':
+            roots.update(idents)
+    
+    reachable = set()
+    queue = [name for name in roots if name in refs]
+    while queue:
+        name = queue.pop()
+        if name in reachable:
+            continue
+
+        reachable.add(name)
+        queue.extend(ref for ref in refs[name] if ref in refs and not ref in reachable)
+
+    for item in items:
+        if item['kind'] in ('func', 'proto') and not item['has_directive']:
+            if item['name'] in refs and not item['name'] in reachable:
+                item['removed'] = True
+                for tok in flat[item['start']:item['end']]:
+                    tok.removed = True
+
+# generate short identifier names, skipping the ones given
+def short_names(taken):
+    alphabet = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    length = 1
+    while True:
+        for combo in itertools.product(alphabet, repeat=length):
+            name = ''.join(combo)
+            if not name in taken and not name in GLSL_KEYWORDS:
+                yield name
+        length += 1
+
+# rename function parameters and local variables to shorter names
+def rename_locals(flat, items):
+    global_names = set()
+    taken = set()
+    struct_names = set()
+
+    for item in items:
+        toks = flat[item['start']:item['end']]
+        if item['kind'] == 'directive':
+            directive_idents = IDENT_RE.findall(toks[0].text)
+            global_names.update(directive_idents)
+            taken.update(directive_idents)
+            continue
+
+        for j, tok in enumerate(toks):
+            if tok.kind != 'ident':
+                continue
+
+            if j == 0 or toks[j - 1].text != '.':
+                taken.add(tok.text)
+            
+            if j > 0 and toks[j - 1].text == 'struct':
+                struct_names.add(tok.text)
+        
+        if item['kind'] == 'func':
+            global_names.add(item['name'])
+        else:
+            global_names.update(tok.text for tok in toks if tok.kind == 'ident')
+    
+    types = GLSL_TYPES | struct_names
+
+    for item in items:
+        if item['kind'] != 'func' or item.get('removed') or item['has_directive']:
+            continue
+
+        start = item['params_start']
+        end = item['end']
+        if any(flat[j].text == 'struct' for j in range(start, end)):
+            continue
+
+        # find declarations of local variables and parameters
+        declared = {}
+        for j in range(start + 1, end - 1):
+            tok = flat[j]
+            if tok.kind != 'ident' or not tok.text in types or flat[j - 1].text == '.':
+                continue
+
+            k = j + 1
+            name_tok = flat[k]
+            if (
+                name_tok.kind != 'ident' or name_tok.text in types or name_tok.text in GLSL_KEYWORDS
+                or flat[k + 1].text == '('
+            ):
+                continue
+
+            declared.setdefault(name_tok.text, k)
+
+            # other declarators in the same statement
+            depth = 0
+            m = k + 1
+            while m < end - 2:
+                text = flat[m].text
+                if text in ('(', '[', '{'):
+                    depth += 1
+                elif text in (')', ']', '}'):
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif text == ';' and depth == 0:
+                    break
+                elif text == ',' and depth == 0:
+                    next_tok = flat[m + 1]
+                    if (
+                        next_tok.kind == 'ident' and not next_tok.text in types
+                        and not next_tok.text in GLSL_QUALIFIERS and not next_tok.text in GLSL_KEYWORDS
+                        and flat[m + 2].text in ('=', ',', ';', '[', ')')
+                    ):
+                        declared.setdefault(next_tok.text, m + 1)
+                m += 1
+        
+        # don't rename globals, or names that are used before they are
+        # declared (i.e. a local that shadows something)
+        first_use = {}
+        for j in range(start, end):
+            tok = flat[j]
+            if tok.kind == 'ident' and flat[j - 1].text != '.':
+                first_use.setdefault(tok.text, j)
+        
+        renames = {}
+        names = short_names(taken)
+        for name, decl_idx in sorted(declared.items(), key=lambda v: v[1]):
+            if name in global_names or name[0:3] == 'gl_' or first_use[name] < decl_idx:
+                continue
+
+            new_name = next(names)
+            if len(new_name) < len(name):
+                renames[name] = new_name
+        
+        for j in range(start, end):
+            tok = flat[j]
+            if tok.kind == 'ident' and tok.text in renames and flat[j - 1].text != '.':
+                tok.text = renames[tok.text]
+
+# minify preprocessed code. comments, blank lines and unneeded whitespace
+# are removed, functions unreachable from main are dropped and local
+# identifiers are shortened. #line directives are replaced by a line map,
+# which lists the (file id, line number) each line of the output came from.
+def minify_source(code):
+    lines = []
+    file_id = 0
+    line_num = 1
+    in_block = False
+
+    for line in code.splitlines():
+        stripped_line, next_in_block = strip_comments(line, in_block)
+        stripped_line = stripped_line.strip()
+
+        if not in_block and stripped_line[0:1] == '#':
+            words = stripped_line[1:].split()
+
+            if words[0:1] == ['line'] and len(words) >= 2:
+                line_num = int(words[1])
+                if len(words) >= 3:
+                    file_id = int(words[2])
                 
-                if first_char == '"' and last_char != '"':
-                    raise CompilationException([
-                        ValidationException(in_file_path, line_num, "", "expected '\"', got EOL"),
-                        ValidationException(in_file_path, line_num+1, "", "compilation terminated")
-                    ])
+                in_block = next_in_block
+                continue
+            
+            lines.append((file_id, line_num, '#' + ' '.join(words)))
+        else:
+            lines.append((file_id, line_num, stripped_line))
+        
+        in_block = next_in_block
+        line_num += 1
+    
+    # tokenize every line. directives are kept as a single token
+    flat = []
+    line_tokens = []
+    for idx, (_, _, text) in enumerate(lines):
+        if text[0:1] == '#':
+            toks = [Token('directive', text, idx)]
+        else:
+            toks = tokenize_glsl(text, idx)
+        
+        line_tokens.append(toks)
+        flat.extend(toks)
+    
+    try:
+        items = parse_glsl_items(flat)
+        strip_dead_functions(flat, items)
+        rename_locals(flat, items)
+    except (MinifyException, IndexError):
+        # could not make sense of the source, so only strip
+        # comments and whitespace
+        for tok in flat:
+            tok.text = tok.orig_text
+            tok.removed = False
+    
+    out_lines = []
+    line_map = []
+    for (file_id, line_num, _), toks in zip(lines, line_tokens):
+        out = []
+        prev = None
+        for tok in toks:
+            if tok.removed:
+                continue
+
+            if prev is not None and needs_space(prev, tok.text):
+                out.append(' ')
+            out.append(tok.text)
+            prev = tok.text
+        
+        if out:
+            out_lines.append(''.join(out))
+            line_map.append((file_id, line_num))
+    
+    return ''.join(line + '\n' for line in out_lines), line_map
+
+# preprocess a source file into a string buffer. the returned code
+# has no #version/precision prefix, since that is applied per-target
+# at emit time.
+def preprocess_source(src_name, source_cache):
+    proc_data = ProcessData(source_cache)
+    out_file = io.StringIO()
+
+    with timings.measure('include', src_name):
+        timings.count('preprocessed')
+        process_file(src_name, out_file, proc_data)
+    
+    return out_file.getvalue(), proc_data
+
+class NonStaticConditionException(Exception):
+    pass
+
+VARIANT_EXPR_TOKEN_RE = re.compile(r'\s*(\d+|[A-Za-z_]\w*|&&|\|\||==|!=|<=|>=|<<|>>|[()!~<>+\-*/%&|^])')
+
+# evaluate the expression of an #if or #elif directive if it only depends
+# on variant macros. raises NonStaticConditionException if it doesn't.
+def eval_variant_condition(expr, defines, variant_names):
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = VARIANT_EXPR_TOKEN_RE.match(expr, pos)
+        if m is None:
+            raise NonStaticConditionException()
+        
+        tokens.append(m.group(1))
+        pos = m.end()
+    
+    idx = 0
+
+    def peek():
+        return tokens[idx] if idx < len(tokens) else None
+    
+    def take():
+        nonlocal idx
+        if idx >= len(tokens):
+            raise NonStaticConditionException()
+        
+        idx += 1
+        return tokens[idx - 1]
+
+    def macro_value(name):
+        if not name in variant_names:
+            raise NonStaticConditionException()
+        
+        return int(defines.get(name, 0))
+    
+    def primary():
+        tok = take()
+        if tok == '(':
+            v = binary(0)
+            if take() != ')':
+                raise NonStaticConditionException()
+            return v
+        
+        if tok == 'defined':
+            name = take()
+            if name == '(':
+                name = take()
+                if take() != ')':
+                    raise NonStaticConditionException()
+            
+            if not name in variant_names:
+                raise NonStaticConditionException()
+            return 1 if name in defines else 0
+        
+        if tok.isdigit():
+            return int(tok)
+        
+        return macro_value(tok)
+
+    def unary():
+        tok = peek()
+        if tok == '!':
+            take()
+            return 0 if unary() else 1
+        if tok == '-':
+            take()
+            return -unary()
+        if tok == '+':
+            take()
+            return unary()
+        if tok == '~':
+            take()
+            return ~unary()
+        
+        return primary()
+    
+    # binary operators from lowest to highest precedence
+    levels = [
+        ('||',), ('&&',), ('|',), ('^',), ('&',), ('==', '!='), ('<', '>', '<=', '>='),
+        ('<<', '>>'), ('+', '-'), ('*', '/', '%')
+    ]
+
+    def binary(level):
+        if level == len(levels):
+            return unary()
+        
+        lhs = binary(level + 1)
+        while peek() in levels[level]:
+            op = take()
+            rhs = binary(level + 1)
+
+            if op == '||': lhs = 1 if (lhs or rhs) else 0
+            elif op == '&&': lhs = 1 if (lhs and rhs) else 0
+            elif op == '|': lhs = lhs | rhs
+            elif op == '^': lhs = lhs ^ rhs
+            elif op == '&': lhs = lhs & rhs
+            elif op == '==': lhs = int(lhs == rhs)
+            elif op == '!=': lhs = int(lhs != rhs)
+            elif op == '<': lhs = int(lhs < rhs)
+            elif op == '>': lhs = int(lhs > rhs)
+            elif op == '<=': lhs = int(lhs <= rhs)
+            elif op == '>=': lhs = int(lhs >= rhs)
+            elif op == '<<': lhs = lhs << rhs
+            elif op == '>>': lhs = lhs >> rhs
+            elif op == '+': lhs = lhs + rhs
+            elif op == '-': lhs = lhs - rhs
+            elif rhs == 0:
+                raise NonStaticConditionException()
+            elif op == '*': lhs = lhs * rhs
+            elif op == '/': lhs = int(lhs / rhs)
+            elif op == '%': lhs = lhs % rhs
+        
+        return lhs
+    
+    value = binary(0)
+    if idx != len(tokens):
+        raise NonStaticConditionException()
+    
+    return value != 0
+
+# evaluate the condition of an #if, #ifdef, #ifndef or #elif directive,
+# returning None if it depends on anything but variant macros
+def variant_condition(directive, args, defines, variant_names):
+    try:
+        if directive == 'ifdef' or directive == 'ifndef':
+            name = args.strip()
+            if not name in variant_names:
+                return None
+            
+            return (name in defines) == (directive == 'ifdef')
+        
+        return eval_variant_condition(args, defines, variant_names)
+    except NonStaticConditionException:
+        return None
+
+# produce the code of a single variant of a preprocessed source. every
+# conditional directive that only depends on variant macros is resolved
+# here, so that variants which don't differ in code have the exact same
+# output. lines that are removed are replaced with empty lines so that
+# line numbers stay the same.
+def resolve_variant(src_name, code, proc_data, defines):
+    variant_names = proc_data.variants.keys()
+    out = []
+    file_id = 0
+    line_num = 1
+
+    # stack of conditional blocks. each one is a list of
+    # [kind, active, taken], where kind is 'static' for blocks resolved
+    # here, 'dynamic' for blocks left to the compiler and 'skip' for
+    # blocks within an inactive static block.
+    stack = []
+
+    def error(message):
+        file_name = os.path.relpath(proc_data.processed[file_id], start=shader_dir)
+        return CompilationException([ValidationException(file_name, line_num, "", message)])
+
+    for line in code.splitlines():
+        stripped_line = line.lstrip()
+        active = all(frame[1] for frame in stack if frame[0] == 'static')
+
+        if stripped_line[0:1] != '#':
+            out.append(line if active else '')
+            line_num += 1
+            continue
+        
+        words = stripped_line[1:].split(None, 1)
+        directive = words[0] if words else ''
+        args = words[1] if len(words) > 1 else ''
+
+        # #line directives are always kept so that the line numbers
+        # of the code after a removed block stay correct
+        if directive == 'line':
+            line_args = args.split()
+            line_num = int(line_args[0])
+            if len(line_args) > 1:
+                file_id = int(line_args[1])
+            
+            out.append(line)
+            continue
+
+        line_num += 1
+        
+        if directive in ('if', 'ifdef', 'ifndef'):
+            if not active:
+                stack.append(['skip', False, False])
+                out.append('')
+                continue
+
+            value = variant_condition(directive, args, defines, variant_names)
+            if value is None:
+                stack.append(['dynamic', True, True])
+                out.append(line)
+            else:
+                stack.append(['static', value, value])
+                out.append('')
+        
+        elif directive in ('elif', 'else', 'endif'):
+            if not stack:
+                raise error(f"unexpected #{directive}")
+            
+            frame = stack[-1]
+            if directive == 'endif':
+                stack.pop()
+            
+            if frame[0] == 'dynamic':
+                out.append(line)
+            elif frame[0] == 'static' and directive != 'endif':
+                if directive == 'else':
+                    frame[1] = not frame[2]
+                elif frame[2]:
+                    frame[1] = False
+                else:
+                    value = variant_condition('elif', args, defines, variant_names)
+                    if value is None:
+                        raise error("#elif of a conditional on variant macros may only depend on variant macros")
+                    
+                    frame[1] = value
                 
-                if first_char == '<' and last_char != '>':
-                    raise CompilationException([
-                        ValidationException(in_file_path, line_num, "", "expected '>', got EOL"),
-                        ValidationException(in_file_path, line_num+1, "", "compilation terminated")
-                    ])
+                frame[2] = frame[2] or frame[1]
+                out.append('')
+            else:
+                out.append('')
+        
+        else:
+            out.append(line if active else '')
+    
+    # variant macros that are still used after resolving conditionals
+    # need to be defined for the compiler
+    text = ''.join(line + '\n' for line in out)
+    define_lines = []
+    for name in variant_names:
+        if name in defines and re.search(r'\b' + name + r'\b', text):
+            define_lines.append(f"#define {name} {defines[name]}\n")
+    
+    return ''.join(define_lines) + text
+
+# expand a preprocessed source into each permutation of the variants it
+# declares with #pragma variant. returns a list of (output name, code).
+# a variant's output name has a NAME_VALUE part for each valued macro,
+# and a NAME part for each on/off macro that is defined, e.g.
+# render_preview.MODE_1.LIGHT.frag.glsl
+def expand_variants(src_name, code, proc_data):
+    if not proc_data.variants:
+        return [(src_name, code)]
+    
+    axes = []
+    for name, values in proc_data.variants.items():
+        if values is None:
+            axes.append([(name, None), (name, '1')])
+        else:
+            axes.append([(name, v) for v in values])
+    
+    # split source name into its base name and .vert.glsl/.frag.glsl extension
+    stem = src_name[:-10]
+    ext = src_name[-10:]
+    
+    variants = []
+    for combo in itertools.product(*axes):
+        defines = {}
+        parts = []
+        for name, value in combo:
+            if value is None:
+                continue
+            
+            defines[name] = value
+            if proc_data.variants[name] is None:
+                parts.append(name)
+            else:
+                parts.append(f"{name}_{value}")
+        
+        out_name = stem + ''.join('.' + p for p in parts) + ext
+        variants.append((out_name, resolve_variant(src_name, code, proc_data, defines)))
+    
+    return variants
+
+# write the preprocessed output of a source file for a target language,
+# unless the file already has the exact same contents. returns True if
+# the file was written.
+def emit_source(out_file_path, data, hashes):
+    out_abs_path = os.path.abspath(out_file_path)
+    if hashes.get(out_abs_path) == hashlib.sha256(data).hexdigest():
+        return False
+
+    with timings.measure('io'):
+        timings.count('writes')
+        with open(out_file_path, 'wb') as out_file:
+            out_file.write(data)
+    
+    hashes.record(out_abs_path, os.stat(out_abs_path), data)
+    return True
+
+# declaration of a global uniform, input or output, e.g.
+# "layout(location = 0) flat in mediump vec4 a, b[2]"
+REFLECT_DECL_RE = re.compile(
+    r'^(?:layout\s*\([^)]*\)\s*)?(?:(?:flat|smooth|noperspective|centroid|invariant)\s+)*'
+    r'(uniform|in|out)\s+(?:(?:highp|mediump|lowp)\s+)?(\w+)\s+(.+)$'
+)
+REFLECT_NAME_RE = re.compile(r'^(\w+)\s*(?:\[\s*(\d+)\s*\])?$')
+REFLECT_KINDS = { 'uniform': 'uniforms', 'in': 'inputs', 'out': 'outputs' }
+REFLECT_BLOCK_RE = re.compile(r'\{[^{}]*\}')
+
+# comments and preprocessor directives, which are skipped by reflection
+REFLECT_IGNORED_RE = re.compile(r'//[^\n]*|/\*.*?\*/|^[ \t]*#[^\n]*', re.S | re.M)
+
+# extract the uniforms, inputs and outputs declared at global scope of
+# preprocessed code. returns a dict of lists of [name, type, array size]
+# in declaration order, where the array size is 0 for non-arrays.
+# declarations in conditional blocks that could not be resolved statically
+# are all included.
+def reflect_source(code, reflection=None):
+    if reflection is None:
+        reflection = { 'uniforms': [], 'inputs': [], 'outputs': [] }
+    
+    # gather the statements at global scope. function bodies, struct
+    # definitions and blocks are skipped.
+    text = REFLECT_IGNORED_RE.sub(' ', code)
+
+    # remove blocks from the inside out, ending the statement before them
+    prev_len = None
+    while prev_len != len(text):
+        prev_len = len(text)
+        text = REFLECT_BLOCK_RE.sub(';', text)
+    
+    for stmt in text.split(';'):
+        m = REFLECT_DECL_RE.match(' '.join(stmt.split()))
+        if m is None:
+            continue
+
+        kind = REFLECT_KINDS[m.group(1)]
+        known = set(decl[0] for decl in reflection[kind])
+        for declarator in m.group(3).split(','):
+            name_m = REFLECT_NAME_RE.match(declarator.strip())
+            if name_m is None or name_m.group(1) in known:
+                continue
+
+            known.add(name_m.group(1))
+            reflection[kind].append([name_m.group(1), m.group(2), int(name_m.group(2) or 0)])
+    
+    return reflection
+
+CS_KEYWORDS = set("""
+    abstract as base bool break byte case catch char checked class const continue decimal default
+    delegate do double else enum event explicit extern false finally fixed float for foreach goto
+    if implicit in int interface internal is lock long namespace new null object operator out
+    override params private protected public readonly ref return sbyte sealed short sizeof
+    stackalloc static string struct switch this throw true try typeof uint ulong unchecked unsafe
+    ushort using virtual void volatile while
+""".split())
+
+def cs_identifier(name):
+    return '@' + name if name in CS_KEYWORDS else name
+
+def cs_string(text):
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+# name of the C# member generated for a shader, e.g. PropFadeFrag for
+# prop_fade.frag
+def cs_class_name(load_name):
+    return ''.join(part[:1].upper() + part[1:] for part in re.split(r'[^A-Za-z0-9]+', load_name) if part)
+
+# generate the C# reflection table from the reflection of each source,
+# keyed by source name. every uniform name gets a slot in the
+# ShaderUniform enum, and every source gets a ShaderDescriptor named after
+# it, e.g. PropFadeFrag for prop_fade.frag.glsl.
+def generate_reflection_cs(reflections):
+    uniform_names = sorted(set(
+        decl[0] for reflection in reflections.values() for decl in reflection['uniforms']
+    ))
+
+    lines = [
+        "// <auto-generated>",
+        "// This file was generated by tools/shader-preprocessor.py from the shaders in glshaders.",
+        "// Do not edit it by hand.",
+        "// </auto-generated>",
+        "",
+        "namespace Glib;",
+        "",
+        "/// <summary>",
+        "/// Slots of the uniforms declared by the shaders in glshaders. Setting",
+        "/// a uniform through its slot does not need to look it up by name.",
+        "/// </summary>",
+        "public enum ShaderUniform",
+        "{",
+    ]
+    lines.extend(f"    {cs_identifier(name)}," for name in uniform_names)
+    lines.extend([
+        "}",
+        "",
+        "public static partial class ShaderReflection",
+        "{",
+    ])
+
+    class_names = []
+    for src_name, reflection in sorted(reflections.items()):
+        load_name = src_name[:-5]
+        class_name = cs_class_name(load_name)
+        class_names.append(class_name)
+
+        lines.extend([
+            "    /// <summary>",
+            f"    /// The uniforms, inputs and outputs of {load_name}.",
+            "    /// </summary>",
+            f"    public static readonly ShaderDescriptor {class_name} = new(",
+            f"        {cs_string(load_name)},",
+        ])
+        for kind in ('uniforms', 'inputs', 'outputs'):
+            if not reflection[kind]:
+                lines.append(f"        {kind}: [],")
+                continue
+
+            lines.append(f"        {kind}: [")
+            for name, glsl_type, size in reflection[kind]:
+                name = f"ShaderUniform.{cs_identifier(name)}" if kind == 'uniforms' else cs_string(name)
+                lines.append(f"            new({name}, {cs_string(glsl_type)}{f', {size}' if size else ''}),")
+            lines.append("        ],")
+        
+        # no trailing comma after the last argument
+        lines[-1] = lines[-1][:-1]
+        lines.extend([
+            "    );",
+            "",
+        ])
+    
+    lines.extend([
+        "    /// <summary>",
+        "    /// The descriptors of every shader in glshaders.",
+        "    /// </summary>",
+        "    public static readonly ShaderDescriptor[] Shaders = [",
+    ])
+    lines.extend(f"        {class_name}," for class_name in class_names)
+    lines.extend([
+        "    ];",
+        "}",
+    ])
+
+    return '\n'.join(lines) + '\n'
 
-                # include file into source
+CATALOG_FILE_NAME = 'ShaderCatalog.gen.cs'
+
+# splits preprocessed code before and after every #line directive, so that
+# the code of a file included by several sources ends up in the same chunk
+# regardless of the file number it was given
+CATALOG_CHUNK_RE = re.compile(rb'(?m)^(#line[^\n]*\n)')
+
+# escape bytes for a C# string literal. the data is written back as UTF-8,
+# so other characters can stay as they are.
+def cs_utf8_literal(data):
+    text = data.decode('utf-8')
+    text = text.replace('\\', '\\\\').replace('"', '\\"').replace('\t', '\\t').replace('\r', '\\r').replace('\n', '\\n')
+    text = re.sub(r'[\x00-\x1f\x7f]', lambda m: f"\\u{ord(m.group(0)):04x}", text)
+    return '"' + text + '"u8'
+
+# split the output of a target into chunks. the prefix is a chunk of its
+# own, and so is every #line directive.
+def catalog_chunks(data, prefix):
+    chunks = [prefix]
+    for chunk in CATALOG_CHUNK_RE.split(data[len(prefix):]):
+        if chunk:
+            chunks.append(chunk)
+
+    return chunks
+
+# generate the C# catalog of a target, given the data of every output keyed
+# by load name, e.g. prop_fade.frag. every source gets a member in the
+# ShaderSource enum, and its data is stored as the list of its chunks.
+# identical chunks, such as the prefix and the code of included files, are
+# only stored once.
+def generate_catalog_cs(shaderlang, sources):
+    prefix = SHADER_PREFIXES[shaderlang].encode('utf-8')
+    chunk_indices = {}
+    chunk_ranges = []
+    data_lines = []
+    offset = 0
+
+    source_chunks = []
+    chunk_starts = []
+    for load_name, data in sorted(sources.items()):
+        chunk_starts.append(len(source_chunks))
+        for chunk in catalog_chunks(data, prefix):
+            index = chunk_indices.get(chunk)
+            if index is None:
+                index = chunk_indices[chunk] = len(chunk_ranges)
+                chunk_ranges.append((offset, len(chunk)))
+                offset += len(chunk)
+
+                # one C# line per line of code
+                data_lines.extend(cs_utf8_literal(line) for line in chunk.splitlines(keepends=True))
+
+            source_chunks.append(index)
+
+    chunk_starts.append(len(source_chunks))
+
+    def array_items(values, per_line=16):
+        values = [str(v) for v in values]
+        return [
+            "        " + ", ".join(values[i:i + per_line]) + ","
+            for i in range(0, len(values), per_line)
+        ]
+
+    lines = [
+        "// <auto-generated>",
+        "// This file was generated by tools/shader-preprocessor.py from the shaders in glshaders.",
+        "// Do not edit it by hand.",
+        "// </auto-generated>",
+        "",
+        "namespace Glib;",
+        "",
+        "/// <summary>",
+        f"/// The preprocessed shader sources of the {shaderlang} target, by their load name.",
+        "/// </summary>",
+        "public enum ShaderSource",
+        "{",
+    ]
+
+    names = sorted(sources)
+    for load_name in names:
+        lines.append(f"    {cs_identifier(cs_class_name(load_name))},")
+
+    lines.extend([
+        "}",
+        "",
+        "public static partial class ShaderCatalog",
+        "{",
+        "    /// <summary>",
+        "    /// The target language the sources were preprocessed for.",
+        "    /// </summary>",
+        f"    public const string Target = {cs_string(shaderlang)};",
+        "",
+        "    // load names, sorted ordinally",
+        "    private static readonly string[] _names = [",
+    ])
+    lines.extend(f"        {cs_string(load_name)}," for load_name in names)
+    lines.extend([
+        "    ];",
+        "",
+        "    // the first 8 bytes of the SHA-256 hash of each source, big-endian",
+        "    private static ReadOnlySpan<ulong> SourceHashes => [",
+    ])
+    lines.extend(
+        f"        0x{hashlib.sha256(sources[load_name]).hexdigest()[:16].upper()}UL,"
+        for load_name in names
+    )
+    lines.extend([
+        "    ];",
+        "",
+        "    // the chunks of source i are SourceChunks[SourceChunkStarts[i]..SourceChunkStarts[i + 1]]",
+        "    private static ReadOnlySpan<int> SourceChunkStarts => [",
+        *array_items(chunk_starts),
+        "    ];",
+        "",
+        "    private static ReadOnlySpan<int> SourceChunks => [",
+        *array_items(source_chunks),
+        "    ];",
+        "",
+        "    // offset and length in ChunkData of each chunk",
+        "    private static ReadOnlySpan<int> ChunkRanges => [",
+        *array_items((v for r in chunk_ranges for v in r), per_line=8),
+        "    ];",
+        "",
+        "    private static ReadOnlySpan<byte> ChunkData =>",
+    ])
+    lines.extend(f"        {literal} +" for literal in data_lines or ['""u8'])
+
+    # no operator after the last literal
+    lines[-1] = lines[-1][:-2] + ";"
+    lines.append("}")
+
+    return '\n'.join(lines) + '\n'
+
+# write the line map of a minified source file, which maps each line of
+# the output (after line_offset lines of prefix) to the file and line
+# it came from.
+def write_line_map(map_file_path, proc_data, line_map, line_offset):
+    data = {
+        'files': [os.path.relpath(f, start=shader_dir).replace(os.sep, '/') for f in proc_data.processed],
+        'line_offset': line_offset,
+        'lines': line_map
+    }
+
+    with timings.measure('io'):
+        timings.count('writes')
+        with open(map_file_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+# content-addressed cache of validator results, stored in the directory
+# given by the SHADER_VALIDATION_CACHE environment variable. entries are
+# keyed by the hash of the validator version, the shader stage and the
+# exact emitted code, so they stay valid across targets, branches and
+# machines. the raw error lines of the validator are stored rather than
+# the mapped messages, since file ids only have a meaning for the build
+# that produced them.
+class ValidationCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.version = None
+    
+    # output of the validator's version option. determined once, the
+    # first time it is needed. returns None if it could not be run.
+    def validator_version(self):
+        with self.lock:
+            if self.version is None:
                 try:
-                    process_file(include_path[1:-1], out_file, proc_data)
+                    proc = subprocess.run([GLSL_VALIDATOR, '-v'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                    self.version = proc.stdout.decode('utf-8').strip() if proc.returncode == 0 else ''
                 except OSError:
-                    raise CompilationException([
-                        ValidationException(in_file_path, line_num, include_path[1:-1], "could not open file"),
-                        ValidationException(in_file_path, line_num+1, "", "compilation terminated")
-                    ])
+                    self.version = ''
+            
+            return self.version or None
+    
+    def key(self, out_file_path, data):
+        version = self.validator_version()
+        if version is None:
+            return None
+        
+        # the validator infers the shader stage from the file name,
+        # e.g. "frag" for "shader.frag.glsl"
+        stage = os.path.basename(out_file_path).split('.')[-2]
+
+        h = hashlib.sha256()
+        h.update(version.encode('utf-8') + b'\0' + stage.encode('utf-8') + b'\0')
+        h.update(data)
+        return h.hexdigest()
+    
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    # get the stored error lines of the validator for the given key,
+    # or None if there is no entry
+    def get(self, key):
+        try:
+            with timings.measure('io'):
+                with open(self.entry_path(key), 'r') as f:
+                    entry = json.load(f)
+            
+            return entry['errors']
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def put(self, key, errors):
+        entry_path = self.entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            with timings.measure('io'):
+                timings.count('writes')
+                os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump({ 'success': len(errors) == 0, 'errors': errors }, f)
                 
-                line_num += 1
-                out_file.write(f"#line {line_num} {file_id}\n")
+                # other builds may be sharing the cache directory
+                os.replace(tmp_path, entry_path)
+        except OSError:
+            # the cache is only an optimization
+            pass
 
-            else:
-                out_file.write(line + '\n')
+def load_validation_cache():
+    cache_dir = os.environ.get('SHADER_VALIDATION_CACHE')
+    if not cache_dir:
+        return None
+    
+    return ValidationCache(os.path.abspath(cache_dir))
 
-# start preprocessing and validation on a source file
-def validate_source(src_name, out_file_path, prefix):
-    # generate preprocessor output
-    proc_data = ProcessData()
+# run the validator on an emitted source file. since this is run from
+# the worker pool, messages are returned instead of printed so that
+# the output of each shader stays grouped together. if the source was
+# minified, line_map and line_offset are used to find the original
+# location of each error. if a validation cache is given and has an
+# entry for the exact same code, the stored errors are reported instead
+# of running the validator.
+def validate_source(out_file_path, data, proc_data, line_map=None, line_offset=0, cache=None):
+    src_name = os.path.relpath(proc_data.processed[0], start=shader_dir)
+
+    key = cache.key(out_file_path, data) if cache is not None else None
+    if key is not None:
+        errors = cache.get(key)
+        if errors is not None:
+            timings.count('validation_cache_hits')
+            with timings.measure('diagnostics', src_name):
+                return parse_diagnostics('\n'.join(errors), proc_data, line_map, line_offset)
+
+    timings.count('validations')
+
+    with timings.measure('validator_spawn', src_name):
+        glslang = subprocess.Popen([GLSL_VALIDATOR, out_file_path], stdout=subprocess.PIPE)
+    
+    with timings.measure('validator_wait', src_name):
+        stdout, _ = glslang.communicate()
+    
+    output = stdout.decode('utf-8')
 
-    # get last modification date of build file to compare with
-    # its include dependencies. but first, i do need to process
-    # which files the source file includes...
-    has_mtime = False
-    if os.path.exists(out_file_path):
-        has_mtime = True
-        mtime = os.path.getmtime(out_file_path)
+    # don't cache the result if the validator was killed
+    if key is not None and glslang.returncode >= 0:
+        cache.put(key, [line.strip() for line in output.splitlines() if line.strip()[0:7] == 'ERROR: '])
     
+    with timings.measure('diagnostics', src_name):
+        return parse_diagnostics(output, proc_data, line_map, line_offset)
+
+# turn the output of the validator into error messages that refer to
+# the original files. returns whether there were no errors, and the
+# list of messages.
+def parse_diagnostics(output, proc_data, line_map, line_offset):
     success = True
+    messages = []
+
+    for line in output.splitlines():
+        line = line.strip()
+
+        # only print errors
+        if line[0:7] == 'ERROR: ':
+            # replace the file index with the file name the code has
+            # associated with it, before printing the error
+            re_res = re.match(r'(\d+)\:(\d+)', line[7:])
+
+            if re_res == None:
+                messages.append(line)
+            
+            else:
+                file_id = int(re_res.group(1))
+                line_num = int(re_res.group(2))
+
+                if line_map is not None:
+                    map_idx = line_num - line_offset - 1
+                    if map_idx >= 0 and map_idx < len(line_map):
+                        file_id, line_num = line_map[map_idx]
+
+                file_name = os.path.relpath(proc_data.processed[file_id], start=shader_dir)
+                line = f"ERROR: {file_name}:{line_num}" + line[(7 + re_res.end()):]
+                messages.append(line)
+
+                # print include chain
+                while proc_data.includers[file_id] is not None:
+                    file_id = proc_data.includers[file_id]
+                    includer_name = os.path.relpath(proc_data.processed[file_id], start=shader_dir)
+                    messages.append(f"       (included from {includer_name})")
+
+            success = False
+    
+    return success, messages
+
+# get files in glshaders list that has the extension .vert.glsl or .frag.glsl
+# these will be recognized as source files that need to be processed and validated
+def find_sources():
+    sources = []
+    for f in os.listdir(shader_dir):
+        abs_path = os.path.join(shader_dir, f)
+
+        if len(abs_path) >= 10:
+            ext = abs_path[-10:]
+            if ext == '.vert.glsl' or ext == ".frag.glsl":
+                sources.append(f)
+    
+    # sorted so that output order does not depend on the filesystem
+    sources.sort()
+    return sources
+
+# state of shader builds for a set of target languages, which can be kept
+# around between builds so that caches don't need to be reloaded.
+class ShaderBuilder:
+    def __init__(self, shaderlangs, pool, minify=False, reflection_path=None):
+        self.shaderlangs = shaderlangs
+        self.pool = pool
+        self.minify = minify
+        self.reflection_path = reflection_path
+        self.hashes = HashCache()
+        self.source_cache = SourceCache(self.hashes)
+        self.validation_cache = load_validation_cache()
+
+        # the hash and data of the outputs written by this builder, keyed
+        # by absolute path, so that the catalog doesn't read them back
+        self.output_data = {}
+
+        # reverse dependency index. maps the absolute path of every file
+        # that was read while processing to the sources that include it.
+        self.dependents = {}
+        self.source_deps = {}
+
+        # sources which could not be preprocessed, and thus have an
+        # unknown set of dependencies
+        self.failed = set()
 
-    with open(out_file_path, 'w') as out_file:
-        out_file.write(prefix)
+        # (source, target language) pairs whose outputs failed validation
+        self.invalid = set()
+
+        # ensure build directories exist, and load the manifest of each
+        self.build_dirs = {}
+        self.manifests = {}
+        for lang in shaderlangs:
+            self.build_dirs[lang] = os.path.join(shader_dir, 'build', lang)
+            os.makedirs(self.build_dirs[lang], exist_ok=True)
+
+            manifest = BuildManifest(lang, { 'minify': minify })
+            manifest.load(self.hashes)
+            self.manifests[lang] = manifest
+
+            for src_name, entry in manifest.sources.items():
+                deps = [os.path.abspath(os.path.join(shader_dir, dep)) for dep in entry['deps']]
+                self.set_dependencies(src_name, self.source_deps.get(src_name, set()).union(deps))
+    
+    def set_dependencies(self, src_name, deps):
+        for dep in self.source_deps.get(src_name, ()):
+            self.dependents[dep].discard(src_name)
+        
+        self.source_deps[src_name] = set(deps)
+        for dep in deps:
+            self.dependents.setdefault(dep, set()).add(src_name)
+    
+    # get the sources that need to be rebuilt if the given files changed
+    def affected_sources(self, changed_paths):
+        affected = set(self.failed)
+        for abs_path in changed_paths:
+            affected.update(self.dependents.get(abs_path, ()))
+        
+        return affected
+
+    # forget about sources that no longer exist
+    def prune(self, sources):
+        for manifest in self.manifests.values():
+            manifest.prune(sources)
+        
+        for src_name in list(self.source_deps):
+            if not src_name in sources:
+                self.set_dependencies(src_name, ())
+                del self.source_deps[src_name]
+        
+        self.failed.intersection_update(sources)
+        self.invalid = set((src_name, lang) for src_name, lang in self.invalid if src_name in sources)
+
+    # delete the output files of a source file for a target language,
+    # and remove it from the manifest
+    def remove_outputs(self, lang, src_name, out_names=()):
+        out_names = set(out_names)
+        out_names.update(self.manifests[lang].validated_outputs(src_name))
+        out_names.add(src_name)
+
+        for out_name in out_names:
+            out_file_path = os.path.join(self.build_dirs[lang], out_name)
+            for path in (out_file_path, out_file_path + '.map'):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        self.manifests[lang].remove(src_name)
+
+    # preprocess a source file and emit its outputs for every target that
+    # is out of date. validation jobs are added to the pending list.
+    # returns False if the source could not be preprocessed.
+    def build_source(self, src_name, pending):
+        manifests = self.manifests
+        build_dirs = self.build_dirs
+
+        stale_langs = [
+            lang for lang in self.shaderlangs
+            if not manifests[lang].is_up_to_date(src_name, self.hashes)
+        ]
+
+        if not stale_langs:
+            return True
 
         try:
-            process_file(src_name, out_file, proc_data)
+            code, proc_data = preprocess_source(src_name, self.source_cache)
+            variants = expand_variants(src_name, code, proc_data)
         except CompilationException as e:
             for ve in e.errors:
                 print("ERROR: " + str(ve))
             print("ERROR: " + str(e))
-            exit_code = 1
-            success = False
-        
-    if not success:
-        return False
-        
-    # check if any dependencies have been updated
-    if has_mtime:
-        had_updated = any(os.path.getmtime(f) > mtime for f in proc_data.processed)
-    else:
-        had_updated = True
-    
-    # if the file had been updated, validate code
-    if had_updated:
-        print(f"Processing {src_name}...")
-        glslang = subprocess.Popen([GLSL_VALIDATOR, out_file_path], stdout=subprocess.PIPE)
-        for line in io.TextIOWrapper(glslang.stdout, encoding='utf-8'):
-            line = line.strip()
+            self.failed.add(src_name)
+
+            for lang in self.shaderlangs:
+                self.remove_outputs(lang, src_name)
+            
+            return False
+
+        self.failed.discard(src_name)
+        self.set_dependencies(src_name, proc_data.dependencies.keys())
+
+        reflection = None
+        for _, variant_code in variants:
+            reflection = reflect_source(variant_code, reflection)
+
+        # list of (output name, code, line map)
+        if self.minify:
+            variants = [(out_name, *minify_source(variant_code)) for out_name, variant_code in variants]
+        else:
+            variants = [(out_name, variant_code, None) for out_name, variant_code in variants]
+
+        deps = {}
+        for dep_path, digest in proc_data.dependencies.items():
+            deps[os.path.relpath(dep_path, start=shader_dir)] = digest
+
+        for lang in stale_langs:
+            line_offset = SHADER_PREFIXES[lang].count('\n')
+            validated = manifests[lang].validated_outputs(src_name)
+            outputs = {}
+            artifacts = {}
+            jobs = []
+
+            for out_name, variant_code, line_map in variants:
+                out_file_path = os.path.join(build_dirs[lang], out_name)
+                data = (SHADER_PREFIXES[lang] + variant_code).encode('utf-8')
+                output_hash = hashlib.sha256(data).hexdigest()
+
+                # a variant with the exact same output as a previous one is
+                # written as an .alias file containing the other's name
+                if output_hash in artifacts:
+                    alias_name = out_name[:-5] + '.alias'
+                    alias_data = artifacts[output_hash][:-5].encode('utf-8')
+                    alias_path = os.path.join(build_dirs[lang], alias_name)
+                    alias_hash = hashlib.sha256(alias_data).hexdigest()
+                    emit_source(alias_path, alias_data, self.hashes)
+                    outputs[alias_name] = alias_hash
+                    self.output_data[os.path.abspath(alias_path)] = (alias_hash, alias_data)
+                    continue
+
+                artifacts[output_hash] = out_name
+                outputs[out_name] = output_hash
+                wrote = emit_source(out_file_path, data, self.hashes)
+                self.output_data[os.path.abspath(out_file_path)] = (output_hash, data)
+
+                map_file_path = out_file_path + '.map'
+                if line_map is not None:
+                    if wrote or not os.path.exists(map_file_path):
+                        write_line_map(map_file_path, proc_data, line_map, line_offset)
+                elif os.path.exists(map_file_path):
+                    os.remove(map_file_path)
+
+                # outputs identical to the ones that were last validated
+                # don't need to be validated again
+                if validated.get(out_name) != output_hash:
+                    future = self.pool.submit(validate_source, out_file_path, data, proc_data, line_map, line_offset, self.validation_cache)
+                    jobs.append((out_name, future))
+            
+            # delete outputs of variants that no longer exist
+            stale_outputs = [out_name for out_name in validated if not out_name in outputs]
+            for out_name in stale_outputs:
+                out_file_path = os.path.join(build_dirs[lang], out_name)
+                for path in (out_file_path, out_file_path + '.map'):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+            pending.append((src_name, lang, deps, outputs, reflection, jobs))
 
-            # only print errors
-            if line[0:7] == 'ERROR: ':
-                # replace the file index with the file name the code has
-                # associated with it, before printing the error
-                re_res = re.search(r'(\d+)\:\d+', line[7:])
+        return True
 
-                if re_res == None:
+    # preprocess and validate the given sources for each target language.
+    # sources whose outputs were already validated and whose files have not
+    # changed since are skipped. returns True if there were no errors.
+    def build(self, sources):
+        success = True
+        pending = []
+        manifests = self.manifests
+
+        # process each source file once, and emit it for every target
+        # that is out of date
+        for src_name in sources:
+            with timings.measure('emit', src_name):
+                if not self.build_source(src_name, pending):
+                    success = False
+
+        # report validation results in submission order, so that
+        # output is deterministic regardless of which job finished first
+        for src_name, lang, deps, outputs, reflection, jobs in pending:
+            source_ok = True
+            for out_name, future in jobs:
+                print(f"Processing {out_name} ({lang})...")
+                ok, messages = future.result()
+                for line in messages:
                     print(line)
                 
-                else:
-                    file_id = int(re_res.group(1))
-                    file_name = os.path.relpath(proc_data.processed[file_id], start=shader_dir)
-                    line = f"ERROR: {file_name}" + line[(7 + len(re_res.group(1))):]
-                    print(line)
+                if not ok:
+                    source_ok = False
+            
+            if source_ok:
+                manifests[lang].update(src_name, deps, outputs, reflection)
+                self.invalid.discard((src_name, lang))
+            else:
+                self.remove_outputs(lang, src_name, outputs)
+                self.invalid.add((src_name, lang))
+                success = False
+        
+        # a source with errors is missing from the manifests, so the C#
+        # code generated from them would lack its members, breaking code
+        # that uses them. the last generated code is kept until every
+        # source builds again.
+        if self.failed or self.invalid:
+            print("Not updating the generated C# code until every shader builds without errors")
+        else:
+            if self.reflection_path is not None:
+                self.write_reflection()
+            
+            # Glib compiles the catalog rather than the outputs themselves,
+            # so it is kept up to date by every build. it is written before
+            # the manifests are saved, since they record its hash.
+            for lang in self.shaderlangs:
+                self.write_catalog(lang)
+        
+        for manifest in manifests.values():
+            manifest.save(self.hashes)
+        
+        return success
+    
+    # write the C# reflection table of every source that was built
+    # successfully for at least one target
+    def write_reflection(self):
+        reflections = {}
+        for lang in self.shaderlangs:
+            for src_name, entry in self.manifests[lang].sources.items():
+                if not src_name in reflections and entry.get('reflection') is not None:
+                    reflections[src_name] = entry['reflection']
+        
+        data = generate_reflection_cs(reflections).encode('utf-8')
+        emit_source(self.reflection_path, data, self.hashes)
+    
+    # write the C# catalog of every output of a target that was built
+    # successfully, unless the outputs and the catalog are the same as
+    # when it was last written. aliases get the data of the output they
+    # refer to.
+    def write_catalog(self, lang):
+        manifest = self.manifests[lang]
+        key = manifest.catalog_key()
+        if manifest.is_catalog_up_to_date(key, self.hashes):
+            return
+        
+        build_dir = self.build_dirs[lang]
+        outputs = {}
+        aliases = {}
+        with timings.measure('io'):
+            for entry in manifest.sources.values():
+                for out_name, digest in entry['outputs'].items():
+                    out_abs_path = os.path.abspath(os.path.join(build_dir, out_name))
+                    cached = self.output_data.get(out_abs_path)
+                    if cached is not None and cached[0] == digest:
+                        data = cached[1]
+                    else:
+                        try:
+                            with open(out_abs_path, 'rb') as f:
+                                data = f.read()
+                        except OSError:
+                            continue
+
+                    if out_name.endswith('.alias'):
+                        aliases[out_name[:-6]] = data.decode('utf-8').strip()
+                    else:
+                        outputs[out_name[:-5]] = data
+        
+        for load_name, target in aliases.items():
+            outputs[load_name] = outputs[target]
+        
+        data = generate_catalog_cs(lang, outputs).encode('utf-8')
+        emit_source(manifest.catalog_path, data, self.hashes)
+        manifest.update_catalog(key, hashlib.sha256(data).hexdigest())
 
-                    # print include chain
-                    while file_id > 0:
-                        file_id -= 1
-                        includer_name = os.path.relpath(proc_data.processed[file_id], start=shader_dir)
-                        print(f"       (included from {includer_name})")
+# preprocess and validate the given sources for each of the given
+# target languages. returns True if there were no errors.
+def build_shaders(sources, shaderlangs, jobs, minify=False, reflection_path=None):
+    start_time_ns = time.time_ns()
 
-                exit_code = 1
-                success = False
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        builder = ShaderBuilder(shaderlangs, pool, minify, reflection_path)
+        builder.prune(sources)
+        success = builder.build(sources)
+    
+    extra_options = {}
+    extra_outputs = []
+    if reflection_path is not None:
+        extra_options['reflection'] = path.relpath(reflection_path).replace(os.sep, '/')
+        extra_outputs.append(reflection_path)
+    
+    # a target is only up to date if every source built without errors
+    for manifest in builder.manifests.values():
+        if success:
+            target_outputs = extra_outputs + [manifest.catalog_path]
+            manifest.write_stamp(start_time_ns, extra_options, target_outputs)
+        else:
+            manifest.remove_stamp()
     
     return success
 
+# get the size and modification time of every file in the shader
+# directory, excluding the build directory
+def scan_shader_dir():
+    stats = {}
+    for dir_path, dir_names, file_names in os.walk(shader_dir):
+        if os.path.samefile(dir_path, shader_dir) and 'build' in dir_names:
+            dir_names.remove('build')
+        
+        for f in file_names:
+            abs_path = os.path.abspath(os.path.join(dir_path, f))
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+
+            stats[abs_path] = (st.st_size, st.st_mtime_ns)
+    
+    return stats
+
+# build all shaders, then keep polling the shader directory for changes.
+# when a file changes, only the sources that include it are rebuilt.
+def watch_shaders(shaderlangs, jobs, interval, minify=False, reflection_path=None):
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        builder = ShaderBuilder(shaderlangs, pool, minify, reflection_path)
+        sources = find_sources()
+        builder.prune(sources)
+        builder.build(sources)
+
+        stats = scan_shader_dir()
+        print(f"Watching {SHADER_DIR} for changes... (press Ctrl+C to stop)")
+
+        while True:
+            time.sleep(interval)
+
+            new_stats = scan_shader_dir()
+            if new_stats == stats:
+                continue
+
+            changed = set()
+            for abs_path in stats.keys() | new_stats.keys():
+                if stats.get(abs_path) != new_stats.get(abs_path):
+                    changed.add(abs_path)
+            stats = new_stats
+
+            # new sources are built as well as the ones depending
+            # on the changed files
+            new_sources = find_sources()
+            builder.prune(new_sources)
+            affected = builder.affected_sources(changed).union(set(new_sources) - set(sources))
+            sources = new_sources
+
+            # changed sources are their own dependency
+            for src_name in sources:
+                if os.path.abspath(os.path.join(shader_dir, src_name)) in changed:
+                    affected.add(src_name)
+
+            affected = [src_name for src_name in sources if src_name in affected]
+            if not affected:
+                continue
+
+            start_time = time.perf_counter()
+            ok = builder.build(affected)
+            elapsed = (time.perf_counter() - start_time) * 1000.0
+            status = "" if ok else " with errors"
+            print(f"Processed {len(affected)} shader(s){status} in {elapsed:.0f} ms")
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description="GLSL shader validator and #include preprocessor. Requires glslang to function. You need glslang either in your PATH or as the value to an environment variable named GLSL_VALIDATOR."
     )
 
-    parser.add_argument('shaderlang', metavar='L', help="the shader language to use {gl330, gles300}")
+    parser.add_argument('shaderlang', metavar='L', nargs='+', help="the shader languages to build {gl330, gles300}")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="the number of validator processes to run at once. defaults to the number of CPUs.")
+    parser.add_argument('--minify', action='store_true', help="strip comments, whitespace and unused functions from the output, and shorten local identifiers")
+    parser.add_argument('--timings', metavar='FILE', help="write the time spent in each phase of the build, in total and per source file, as JSON to the given file. use - for stdout.")
+    parser.add_argument('--reflection', metavar='FILE', help="write a C# file with the uniforms, inputs and outputs of every shader to the given path")
+    parser.add_argument('--watch', action='store_true', help="keep running and rebuild shaders whenever their files change")
+    parser.add_argument('--interval', type=float, default=0.25, help="the interval in seconds at which files are polled for changes in watch mode. defaults to 0.25.")
     args = parser.parse_args()
 
-    if args.shaderlang == 'gl330':
-        prefix = '#version 330 core\n'
-    elif args.shaderlang == 'gles300':
-        prefix = "#version 300 es\nprecision mediump float;\n"
-    else:
-        print("shader-preprocessor.py: error: the given shader language must be gl330 or gles300")
+    for lang in args.shaderlang:
+        if not lang in SHADER_PREFIXES:
+            print("shader-preprocessor.py: error: the given shader language must be gl330 or gles300")
+            sys.exit(1)
+    
+    if args.jobs < 1:
+        print("shader-preprocessor.py: error: the job count must be at least 1")
         sys.exit(1)
 
-    exit_code = 0
-
-    # get files in glshaders list that has the extension .vert.glsl or .frag.glsl
-    # these will be recognized as source files that need to be processed and validated
-    sources = []
-    for f in os.listdir(shader_dir):
-        abs_path = os.path.join(shader_dir, f)
-
-        if len(abs_path) >= 10:
-            ext = abs_path[-10:]
-            if ext == '.vert.glsl' or ext == ".frag.glsl":
-                sources.append(f)
+    # remove duplicate targets while keeping the given order
+    shaderlangs = list(dict.fromkeys(args.shaderlang))
 
-    # ensure build directory exists
-    shader_build_dir = os.path.join(shader_dir, 'build', args.shaderlang)
-    os.makedirs(shader_build_dir, exist_ok=True)
+    if args.watch:
+        try:
+            watch_shaders(shaderlangs, args.jobs, args.interval, args.minify, args.reflection)
+        except KeyboardInterrupt:
+            pass
+        
+        sys.exit(0)
 
-    # process each source file
-    for src_name in sources:
-        out_file_path = os.path.join(shader_build_dir, src_name)
-        if not validate_source(src_name, out_file_path, prefix):
-            os.remove(out_file_path)
-            exit_code = 1
+    timings.enabled = args.timings is not None
+    success = build_shaders(find_sources(), shaderlangs, args.jobs, args.minify, args.reflection)
 
+    if args.timings is not None:
+        report = json.dumps(timings.report(), indent=2)
+        if args.timings == '-':
+            print(report)
+        else:
+            with open(args.timings, 'w') as f:
+                f.write(report)
 
     # exit with an error code if there were errors
-    if exit_code != 0:
-        sys.exit(exit_code)
\ No newline at end of file
+    if not success:
+        sys.exit(1)
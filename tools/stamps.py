@@ -0,0 +1,95 @@
+# Depfiles and stamp files of the code generators.
+#
+# After a successful run, a generator writes a depfile, which lists every
+# file it read one path per line, and a stamp file, which has the options
+# of the run on its first line followed by every file it wrote. The mtime
+# of the stamp file is set to the time the run started, so files changed
+# during the run are seen as newer. A generator's outputs are up to date if
+# its stamp was written with the same options, no input is newer than the
+# stamp and every output still exists, which only takes a few stat calls
+# to check.
+#
+# tools/codegen.py decides which generators to run from their stamps, and
+# writes a stamp of its own which GeneratedUpToDate in build.cake checks the
+# same way as check_stamp does.
+
+import os
+import json
+
+# format the options of a run for the first line of a stamp file, e.g.
+# "minify=false reflection=\"src/Glib/ShaderReflection.gen.cs\""
+def format_options(options):
+    return ' '.join(f"{k}={json.dumps(v)}" for k, v in sorted(options.items()))
+
+def read_lines(file_path):
+    with open(file_path, 'r') as f:
+        return f.read().splitlines()
+
+# get the inputs listed by a depfile
+def read_depfile(dep_path):
+    return [line for line in read_lines(dep_path) if line]
+
+# get the outputs listed by a stamp file
+def read_stamp_outputs(stamp_path):
+    return [line for line in read_lines(stamp_path)[1:] if line]
+
+# returns the reason the outputs of a stamp are out of date, or None if they
+# are up to date
+def check_stamp(dep_path, stamp_path, options):
+    try:
+        stamp_lines = read_lines(stamp_path)
+        stamp_time = os.stat(stamp_path).st_mtime_ns
+        inputs = read_depfile(dep_path)
+    except OSError:
+        return "no stamp from a previous run"
+
+    if not stamp_lines or stamp_lines[0] != options:
+        return "the options changed"
+
+    for input_path in inputs:
+        try:
+            st = os.stat(input_path)
+        except OSError:
+            return f"{input_path} is missing"
+
+        # also works for directories, whose mtime changes when a file is
+        # added or removed
+        if st.st_mtime_ns > stamp_time:
+            return f"{input_path} changed"
+
+    for output_path in stamp_lines[1:]:
+        if output_path and not os.path.exists(output_path):
+            return f"{output_path} is missing"
+
+    return None
+
+# write the depfile and stamp file of a successful run, given the paths of
+# its inputs and outputs. files whose contents don't change are left alone.
+# returns the number of files that were written.
+def write_stamp(dep_path, stamp_path, options, inputs, outputs, start_time_ns):
+    def path_list(paths):
+        return sorted(set(os.path.relpath(p).replace(os.sep, '/') for p in paths))
+
+    dep_data = '\n'.join(path_list(inputs)) + '\n'
+    stamp_data = '\n'.join([options] + path_list(outputs)) + '\n'
+
+    written = 0
+    for file_path, data in ((dep_path, dep_data), (stamp_path, stamp_data)):
+        try:
+            with open(file_path, 'r') as f:
+                if f.read() == data:
+                    continue
+        except OSError:
+            pass
+
+        written += 1
+        with open(file_path + '.tmp', 'w') as f:
+            f.write(data)
+        os.replace(file_path + '.tmp', file_path)
+
+    os.utime(stamp_path, ns=(start_time_ns, start_time_ns))
+    return written
+
+def remove_stamp(stamp_path):
+    if os.path.exists(stamp_path):
+        os.remove(stamp_path)